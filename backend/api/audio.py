@@ -6,24 +6,35 @@ from typing import Any
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
 
+from backend.api.engines import run_audio_pipeline
+from backend.api.ingest import ingested
 from backend.api.schemas import AudioAnalysisResponse
-from backend.engines.audio_detector import analyze_audio
+from backend.utils.cache import cached_result
+from backend.utils.executor import run_cpu_bound
 from backend.utils.logger import get_logger
-from backend.utils.preprocess import validate_upload
+from backend.utils.spool import SpooledUpload
 
 router = APIRouter(prefix="/analyze_audio", tags=["audio"])
 logger = get_logger(__name__)
 
 
+async def _analyze_audio(payload: SpooledUpload) -> dict[str, Any]:
+    result = await run_cpu_bound(run_audio_pipeline, payload)
+    return {
+        "audio_score": result.audio_score,
+        "anomalies": result.anomalies,
+        "speech_ratio": result.speech_ratio,
+    }
+
+
 @router.post("/", response_model=AudioAnalysisResponse)
 async def analyze_audio_endpoint(file: UploadFile = File(...)) -> dict[str, Any]:  # noqa: B008
     """Analyze audio files for deepfake indicators (simulated)."""
     try:
-        validate_upload(file.filename)
-        content = await file.read()
-        if not content:
-            raise HTTPException(status_code=400, detail="Empty file")
-        result = analyze_audio(content)
+        async with ingested(file, "audio") as payload:
+            return await cached_result(
+                "audio", [payload.sha256], {}, lambda: _analyze_audio(payload)
+            )
     except ValueError as exc:
         logger.warning("Audio analysis validation failed: %s", exc)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -32,5 +43,3 @@ async def analyze_audio_endpoint(file: UploadFile = File(...)) -> dict[str, Any]
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Unexpected error during audio analysis")
         raise HTTPException(status_code=500, detail="Audio analysis failed") from exc
-
-    return {"audio_score": result.audio_score, "anomalies": result.anomalies}
@@ -0,0 +1,68 @@
+"""Engine entry points used by the routers, imported on first call.
+
+Importing a router therefore imports neither the engines nor NumPy and Pillow.
+Executor workers import them in their warm-up, and the application lifespan
+calls ``import_engines`` for the fusion that runs in the serving process, both
+before ``/ready`` reports 200. Type checkers see the real functions and classes.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+from backend.engines.registry import EngineFunction
+
+_FUSION = "backend.engines.fusion_engine"
+_PIPELINES = "backend.engines.pipelines"
+
+if TYPE_CHECKING:
+    from backend.engines.fusion_engine import FusionWeights, settled_classification
+    from backend.engines.pipelines import (
+        branch_components,
+        fuse_branch_results,
+        prepare_image,
+        run_audio_pipeline,
+        run_image_pipeline,
+        run_metadata_pipeline,
+        run_rescore_pipeline,
+        run_video_job,
+        run_video_pipeline,
+        score_prepared_images,
+    )
+else:
+    FusionWeights = EngineFunction(f"{_FUSION}:FusionWeights")
+    settled_classification = EngineFunction(f"{_FUSION}:settled_classification")
+    branch_components = EngineFunction(f"{_PIPELINES}:branch_components")
+    fuse_branch_results = EngineFunction(f"{_PIPELINES}:fuse_branch_results")
+    prepare_image = EngineFunction(f"{_PIPELINES}:prepare_image")
+    run_audio_pipeline = EngineFunction(f"{_PIPELINES}:run_audio_pipeline")
+    run_image_pipeline = EngineFunction(f"{_PIPELINES}:run_image_pipeline")
+    run_metadata_pipeline = EngineFunction(f"{_PIPELINES}:run_metadata_pipeline")
+    run_rescore_pipeline = EngineFunction(f"{_PIPELINES}:run_rescore_pipeline")
+    run_video_job = EngineFunction(f"{_PIPELINES}:run_video_job")
+    run_video_pipeline = EngineFunction(f"{_PIPELINES}:run_video_pipeline")
+    score_prepared_images = EngineFunction(f"{_PIPELINES}:score_prepared_images")
+
+
+def import_engines() -> None:
+    """Import the engine modules referenced here; run by the warm-up phase."""
+    for module in (_FUSION, _PIPELINES):
+        importlib.import_module(module)
+
+
+__all__ = [
+    "FusionWeights",
+    "branch_components",
+    "fuse_branch_results",
+    "import_engines",
+    "prepare_image",
+    "run_audio_pipeline",
+    "run_image_pipeline",
+    "run_metadata_pipeline",
+    "run_rescore_pipeline",
+    "run_video_job",
+    "run_video_pipeline",
+    "score_prepared_images",
+    "settled_classification",
+]
@@ -0,0 +1,90 @@
+"""Fusion re-scoring endpoint over stored component scores."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from fastapi import APIRouter, File, HTTPException, Query, Response, UploadFile
+
+from backend.api.engines import FusionWeights, run_rescore_pipeline
+from backend.api.ingest import ingested
+from backend.api.schemas import RescoreResponse
+from backend.utils.config import get_settings
+from backend.utils.executor import run_cpu_bound
+from backend.utils.logger import get_logger
+
+router = APIRouter(prefix="/fusion", tags=["fusion"])
+logger = get_logger(__name__)
+
+
+@router.post("/rescore", response_model=RescoreResponse)
+async def rescore_endpoint(
+    file: UploadFile = File(...),  # noqa: B008
+    vision_weight: float | None = Query(None, ge=0),  # noqa: B008
+    temporal_weight: float | None = Query(None, ge=0),  # noqa: B008
+    audio_weight: float | None = Query(None, ge=0),  # noqa: B008
+    metadata_weight: float | None = Query(None, ge=0),  # noqa: B008
+    uncertain_from: float | None = Query(None),  # noqa: B008
+    fake_from: float | None = Query(None),  # noqa: B008
+    rows: bool = Query(False),  # noqa: B008
+) -> dict[str, Any] | Response:
+    """Re-fuse stored component scores under new weights or thresholds.
+
+    ``file`` is a ``.npy`` N x 4 matrix with vision, temporal, audio, and
+    metadata scores per row. Unset weights keep their configured values
+    (``DFS_FUSION_WEIGHTS``) and unset thresholds keep the fusion engine's
+    (``CLASSIFICATION_THRESHOLDS``); ``reclassified`` counts rows whose classification
+    differs from the configured fusion. No detector runs. With ``rows=true`` the
+    response is an ``.npz`` archive of per-row outcomes instead of the summary.
+    """
+    configured = FusionWeights(*get_settings().fusion_weights)
+    overrides = {
+        "vision": vision_weight,
+        "temporal": temporal_weight,
+        "audio": audio_weight,
+        "metadata": metadata_weight,
+    }
+    try:
+        weights = FusionWeights(
+            **{
+                name: getattr(configured, name) if value is None else value
+                for name, value in overrides.items()
+            }
+        )
+        # Imported here so that importing the router does not import the engine.
+        from backend.engines.fusion_engine import CLASSIFICATION_THRESHOLDS
+
+        thresholds = (
+            CLASSIFICATION_THRESHOLDS[0] if uncertain_from is None else uncertain_from,
+            CLASSIFICATION_THRESHOLDS[1] if fake_from is None else fake_from,
+        )
+        if thresholds[0] > thresholds[1]:
+            raise ValueError("uncertain_from must not exceed fake_from")
+        async with ingested(file, "scores") as payload:
+            result = await run_cpu_bound(
+                run_rescore_pipeline, payload, weights, thresholds, configured, rows
+            )
+    except ValueError as exc:
+        logger.warning("Re-scoring validation failed: %s", exc)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except HTTPException:
+        raise
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.exception("Unexpected error during re-scoring")
+        raise HTTPException(status_code=500, detail="Re-scoring failed") from exc
+    if result.rows is not None:
+        return Response(
+            result.rows,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="rescored.npz"'},
+        )
+    return {
+        "count": result.count,
+        "weights": asdict(weights),
+        "thresholds": thresholds,
+        "mean_score": result.mean_score,
+        "classifications": result.classifications,
+        "risk_levels": result.risk_levels,
+        "reclassified": result.reclassified,
+    }
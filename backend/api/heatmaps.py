@@ -0,0 +1,81 @@
+"""On-demand artifact heatmap endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+
+from backend.utils.executor import run_cpu_bound
+from backend.utils.heatmap import HEATMAP_MAX_SIDE, HeatmapHandle
+from backend.utils.heatmap_store import HeatmapNotFoundError, get_heatmap_store
+from backend.utils.logger import get_logger
+
+router = APIRouter(prefix="/heatmaps", tags=["heatmaps"])
+logger = get_logger(__name__)
+
+HEATMAP_RENDER_LIMIT = 1024
+"""Largest ``max_side`` a client may request."""
+
+
+def derive_heatmap_id(digest: str, params: dict[str, Any]) -> str:
+    """Return the heatmap ID of the analysis of ``digest`` with ``params``."""
+    return get_heatmap_store().heatmap_id(digest, params)
+
+
+def heatmap_url(heatmap_id: str) -> str:
+    """Return the download path of a heatmap."""
+    return f"/heatmaps/{heatmap_id}"
+
+
+async def register_heatmap(
+    heatmap_id: str, handle: HeatmapHandle, include_png: bool = False
+) -> None:
+    """Store a heatmap handle in the shared heatmap store.
+
+    Only the crop size is stored unless ``include_png`` is set, in which case the
+    default-resolution PNG is rendered (unless already stored) and kept with it.
+    Called for fresh and cached analyses alike, so the URL of a cached result
+    stays valid and its retention is refreshed. Store I/O runs in a thread, and a
+    known entry is only touched, not rewritten.
+    """
+    store = get_heatmap_store()
+    png = None
+    if include_png and not await asyncio.to_thread(store.has_png, heatmap_id):
+        png = await run_cpu_bound(handle.to_png)
+    await asyncio.to_thread(store.register, heatmap_id, handle, png)
+
+
+@router.get("/{heatmap_id}")
+async def get_heatmap(
+    heatmap_id: str,
+    fmt: Literal["png", "raw"] = Query("png", alias="format"),
+    max_side: int = Query(HEATMAP_MAX_SIDE, ge=1, le=HEATMAP_RENDER_LIMIT),
+    dtype: Literal["uint8", "float16"] = Query("uint8"),
+) -> Response:
+    """Render an artifact heatmap as a greyscale PNG or a raw row-major tile.
+
+    Raw tiles carry their layout in ``X-Heatmap-Shape`` (``height,width``) and
+    ``X-Heatmap-Dtype`` headers.
+    """
+    try:
+        handle, stored_png = await asyncio.to_thread(get_heatmap_store().load, heatmap_id)
+    except HeatmapNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Heatmap not found") from exc
+    if fmt == "png":
+        if stored_png is not None and max_side == HEATMAP_MAX_SIDE:
+            png = stored_png
+        else:
+            png = await run_cpu_bound(handle.to_png, max_side)
+        return Response(content=png, media_type="image/png")
+    tile = await run_cpu_bound(handle.render, max_side, dtype)
+    return Response(
+        content=tile.tobytes(),
+        media_type="application/octet-stream",
+        headers={
+            "X-Heatmap-Shape": f"{tile.shape[0]},{tile.shape[1]}",
+            "X-Heatmap-Dtype": dtype,
+        },
+    )
@@ -2,35 +2,103 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Any
+import asyncio
+from typing import TYPE_CHECKING, Any
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Query, UploadFile
 
-from backend.api.schemas import ImageAnalysisResponse
-from backend.engines.metadata_analyzer import analyze_image_metadata
-from backend.engines.vision_detector import analyze_image
+from backend.api.engines import (
+    prepare_image,
+    run_image_pipeline,
+    run_metadata_pipeline,
+    score_prepared_images,
+)
+from backend.api.heatmaps import derive_heatmap_id, heatmap_url, register_heatmap
+from backend.api.ingest import ingested
+from backend.api.reports import schedule_render
+from backend.api.schemas import (
+    ImageAnalysisResponse,
+    ImageBatchResponse,
+    MetadataScreeningResponse,
+)
+from backend.utils.cache import cache_lookup, cache_store, cached_result
+from backend.utils.config import get_settings
+from backend.utils.executor import run_cpu_bound
+from backend.utils.heatmap import HeatmapHandle
 from backend.utils.logger import get_logger
-from backend.utils.pdf_export import export_report
-from backend.utils.preprocess import align_faces, detect_faces, load_image, validate_upload
+from backend.utils.report_store import register_report, report_url
+from backend.utils.spool import SpooledUpload
+
+if TYPE_CHECKING:
+    from backend.engines.pipelines import PreparedImage
 
 router = APIRouter(prefix="/analyze_image", tags=["image"])
 logger = get_logger(__name__)
 
 
+async def _analyze_image(payload: SpooledUpload, params: dict[str, int]) -> dict[str, Any]:
+    analysis = await run_cpu_bound(
+        run_image_pipeline,
+        payload,
+        params["max_side"] or None,
+        params["max_faces"],
+    )
+    metadata_result = analysis.metadata
+    summary = {
+        "vision_score": f"{analysis.vision_score:.2f}",
+        "metadata_score": f"{metadata_result.metadata_score:.2f}",
+    }
+    report_id = await asyncio.to_thread(register_report, summary, metadata_result.anomalies)
+    heatmap_id = derive_heatmap_id(payload.sha256, params)
+    return {
+        "vision_score": analysis.vision_score,
+        "faces": [{"box": face.box, "vision_score": face.vision_score} for face in analysis.faces],
+        "faces_detected": analysis.faces_detected,
+        "artifact_heatmap_shape": analysis.heatmap.shape,
+        "heatmap_id": heatmap_id,
+        "heatmap_url": heatmap_url(heatmap_id),
+        "metadata_score": metadata_result.metadata_score,
+        "metadata_anomalies": metadata_result.anomalies,
+        "report_id": report_id,
+        "report_url": report_url(report_id),
+    }
+
+
 @router.post("/", response_model=ImageAnalysisResponse)
-async def analyze_image_endpoint(file: UploadFile = File(...)) -> dict[str, Any]:  # noqa: B008
-    """Analyze a single image for deepfake indicators."""
+async def analyze_image_endpoint(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),  # noqa: B008
+    render_report: bool = Query(False),  # noqa: B008
+    cache_heatmap: bool = Query(False),  # noqa: B008
+) -> dict[str, Any]:
+    """Analyze a single image for deepfake indicators.
+
+    Every detected face (up to ``DFS_MAX_FACES_PER_IMAGE``) is scored at its
+    native resolution, all of them zero-padded into one vectorized pass;
+    ``vision_score`` is the most suspicious face's score.
+
+    The PDF report is rendered on first download from ``report_url``; pass
+    ``render_report=true`` to render it in the background after responding. The
+    heatmap is rendered on demand from ``heatmap_url``; pass ``cache_heatmap=true``
+    to render its PNG now and store it with the heatmap.
+    """
+    settings = get_settings()
+    params = {
+        "max_side": settings.max_analysis_side,
+        "max_faces": settings.max_faces_per_image,
+    }
     try:
-        validate_upload(file.filename)
-        content = await file.read()
-        if not content:
-            raise HTTPException(status_code=400, detail="Empty file")
-        image = load_image(content)
-        faces = detect_faces(image)
-        aligned = align_faces(image, faces)
-        vision_result = analyze_image(aligned[0])
-        metadata_result = analyze_image_metadata(image)
+        async with ingested(file, "image") as payload:
+            result = await cached_result(
+                "image",
+                [payload.sha256],
+                params,
+                lambda: _analyze_image(payload, params),
+            )
+            height, width = result["artifact_heatmap_shape"]
+            await register_heatmap(
+                result["heatmap_id"], HeatmapHandle(width, height), include_png=cache_heatmap
+            )
     except ValueError as exc:
         logger.warning("Image analysis validation failed: %s", exc)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -39,17 +107,116 @@ async def analyze_image_endpoint(file: UploadFile = File(...)) -> dict[str, Any]
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Unexpected error during image analysis")
         raise HTTPException(status_code=500, detail="Image analysis failed") from exc
+    if render_report:
+        schedule_render(background_tasks, result["report_id"])
+    return result
 
-    summary = {
-        "vision_score": f"{vision_result.vision_score:.2f}",
-        "metadata_score": f"{metadata_result.metadata_score:.2f}",
-    }
-    report_path = export_report(Path("logs/image_report.pdf"), summary, metadata_result.anomalies)
 
+async def _screen_metadata(payload: SpooledUpload) -> dict[str, Any]:
+    result = await run_cpu_bound(run_metadata_pipeline, payload)
     return {
-        "vision_score": vision_result.vision_score,
-        "artifact_heatmap_shape": vision_result.artifact_heatmap.shape,
-        "metadata_score": metadata_result.metadata_score,
-        "metadata_anomalies": metadata_result.anomalies,
-        "report_path": str(report_path),
+        "metadata_score": result.metadata_score,
+        "metadata_anomalies": result.anomalies,
+        "metadata": result.metadata,
     }
+
+
+@router.post("/metadata", response_model=MetadataScreeningResponse)
+async def screen_image_metadata_endpoint(
+    file: UploadFile = File(...),  # noqa: B008
+) -> dict[str, Any]:
+    """Score an image on its EXIF and XMP metadata alone.
+
+    Tags are parsed from the file headers without decoding pixels, so screening
+    costs a small fraction of a full analysis; ``metadata_score`` matches the one
+    the full endpoint reports for the same file.
+    """
+    try:
+        async with ingested(file, "image") as payload:
+            return await cached_result(
+                "image_metadata", [payload.sha256], {}, lambda: _screen_metadata(payload)
+            )
+    except ValueError as exc:
+        logger.warning("Metadata screening validation failed: %s", exc)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except HTTPException:
+        raise
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.exception("Unexpected error during metadata screening")
+        raise HTTPException(status_code=500, detail="Metadata screening failed") from exc
+
+
+async def _prepare_batch_item(
+    file: UploadFile, side: int, max_side: int
+) -> tuple[str, dict[str, Any] | PreparedImage]:
+    async with ingested(file, "image") as payload:
+        key, hit = await cache_lookup(
+            "image_batch", [payload.sha256], {"crop_side": side, "max_side": max_side}
+        )
+        if hit is not None:
+            return key, hit
+        return key, await run_cpu_bound(prepare_image, payload, side, max_side or None)
+
+
+def _batch_error(filename: str | None, exc: BaseException) -> dict[str, Any]:
+    if isinstance(exc, HTTPException):
+        detail = str(exc.detail)
+    elif isinstance(exc, ValueError):
+        detail = str(exc)
+    else:
+        logger.error("Unexpected error for batch item %s", filename, exc_info=exc)
+        detail = "Image analysis failed"
+    return {"filename": filename, "error": detail}
+
+
+@router.post("/batch", response_model=ImageBatchResponse)
+async def analyze_image_batch_endpoint(
+    files: list[UploadFile] = File(...),  # noqa: B008
+) -> dict[str, Any]:
+    """Analyze many images in one request with per-item error isolation.
+
+    Files are decoded concurrently on the executor, their face crops are resized into
+    one stacked array, and vision scoring runs as a single vectorized pass.
+    """
+    settings = get_settings()
+    if len(files) > settings.batch_max_images:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.batch_max_images} images per batch"
+        )
+    prepared = await asyncio.gather(
+        *(
+            _prepare_batch_item(file, settings.batch_crop_side, settings.max_analysis_side)
+            for file in files
+        ),
+        return_exceptions=True,
+    )
+    ready = [
+        item[1]
+        for item in prepared
+        if not isinstance(item, BaseException) and not isinstance(item[1], dict)
+    ]
+    try:
+        analyses = iter(await run_cpu_bound(score_prepared_images, ready))
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.exception("Unexpected error during batch image scoring")
+        raise HTTPException(status_code=500, detail="Image analysis failed") from exc
+
+    results: list[dict[str, Any]] = []
+    for file, outcome in zip(files, prepared, strict=True):
+        if isinstance(outcome, BaseException):
+            results.append(_batch_error(file.filename, outcome))
+            continue
+        key, item = outcome
+        if not isinstance(item, dict):
+            analysis = next(analyses)
+            item = {
+                "vision_score": analysis.vision_score,
+                "artifact_heatmap_shape": analysis.heatmap.shape,
+                "metadata_score": analysis.metadata.metadata_score,
+                "metadata_anomalies": analysis.metadata.anomalies,
+            }
+            await cache_store(key, item)
+        results.append({"filename": file.filename, **item})
+    failed = sum(1 for item in results if item.get("error"))
+    logger.info("Batch image analysis: %d processed, %d failed", len(results) - failed, failed)
+    return {"results": results, "processed": len(results) - failed, "failed": failed}
@@ -0,0 +1,57 @@
+"""Streamed, size-bounded ingestion of multipart uploads."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from backend.utils.config import get_settings
+from backend.utils.logger import get_logger
+from backend.utils.spool import SpooledUpload, UploadTooLargeError, spool_stream
+
+logger = get_logger(__name__)
+
+
+async def ingest_upload(upload: UploadFile, modality: str) -> SpooledUpload:
+    """Validate and spool an upload, enforcing the per-modality size limit.
+
+    Raises:
+        HTTPException: 413 when the upload is too large, 400 when it is empty.
+        ValueError: If the filename fails validation.
+    """
+    # preprocess pulls in NumPy and Pillow, which routers leave to the warm-up phase.
+    from backend.utils.preprocess import validate_upload
+
+    validate_upload(upload.filename)
+    settings = get_settings()
+    limit = settings.max_upload_bytes(modality)
+    if upload.size is not None and upload.size > limit:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds limit of {limit} bytes")
+    try:
+        payload = await run_in_threadpool(
+            spool_stream,
+            upload.file,
+            limit,
+            settings.spool_threshold_bytes,
+            settings.upload_chunk_bytes,
+            settings.spool_dir,
+        )
+    except UploadTooLargeError as exc:
+        logger.warning("Rejected oversized %s upload", modality)
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    if payload.size == 0:
+        raise HTTPException(status_code=400, detail="Empty file")
+    return payload
+
+
+@asynccontextmanager
+async def ingested(upload: UploadFile, modality: str) -> AsyncIterator[SpooledUpload]:
+    """Spool ``upload`` for the duration of the block and remove any spill file after."""
+    payload = await ingest_upload(upload, modality)
+    try:
+        yield payload
+    finally:
+        payload.discard()
@@ -0,0 +1,185 @@
+"""Asynchronous job API for long-running analyses."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from backend.api.engines import run_video_job
+from backend.api.ingest import ingested
+from backend.api.schemas import JobResponse
+from backend.utils.cache import cache_lookup, get_result_cache
+from backend.utils.config import get_settings
+from backend.utils.job_queue import ERROR_INVALID, JOB_FAILED, JobQueue, JobRecord
+from backend.utils.logger import get_logger
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+logger = get_logger(__name__)
+
+JOB_HANDLERS = {"video": run_video_job}
+JOB_MODALITIES = {"video": "video"}
+
+CACHE_KEY_PARAM = "cache_key"
+
+_queue: JobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def _cache_job_result(record: JobRecord) -> None:
+    key = record.params.get(CACHE_KEY_PARAM)
+    if key and record.result is not None and get_settings().cache_enabled:
+        get_result_cache().put(key, record.result)
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, starting its workers on first use.
+
+    The first call opens the database; async callers run it in a thread.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            settings = get_settings()
+            _queue = JobQueue(
+                Path(settings.job_dir),
+                JOB_HANDLERS,
+                workers=settings.job_workers,
+                retention_seconds=settings.job_retention_seconds,
+                on_success=_cache_job_result,
+                lease_seconds=settings.job_lease_seconds,
+            )
+            _queue.start()
+        return _queue
+
+
+def shutdown_job_queue() -> None:
+    """Stop the job queue workers if they were started."""
+    global _queue
+    with _queue_lock:
+        queue, _queue = _queue, None
+    if queue is not None:
+        queue.stop()
+
+
+def job_payload(record: JobRecord) -> dict[str, Any]:
+    """Serialize a job record for API responses."""
+    return {
+        "id": record.id,
+        "kind": record.kind,
+        "status": record.status,
+        "priority": record.priority,
+        "progress": {"done": record.progress_done, "total": record.progress_total},
+        "result": record.result,
+        "error": record.error,
+        "created_at": record.created_at,
+        "updated_at": record.updated_at,
+        "expires_at": record.expires_at,
+    }
+
+
+def _with_engine_settings(kind: str, params: dict[str, Any]) -> dict[str, Any]:
+    """Add deployment settings that change a job's result, so they key the cache."""
+    settings = get_settings()
+    if kind != "video" or not settings.temporal_pyramid_level:
+        return params
+    engine: dict[str, Any] = {"pyramid_level": settings.temporal_pyramid_level}
+    if settings.temporal_refine_margin is not None:
+        engine["refine_margin"] = settings.temporal_refine_margin
+    return {**engine, **params}
+
+
+async def submit_job(
+    file: UploadFile, kind: str, params: dict[str, Any], priority: int = 0
+) -> JobRecord:
+    """Spool an upload and enqueue it as a job of ``kind``.
+
+    When the same bytes were analyzed with the same parameters before, the job is
+    recorded as succeeded straight from the result cache.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    params = _with_engine_settings(kind, params)
+    queue = await run_in_threadpool(get_job_queue)
+    async with ingested(file, JOB_MODALITIES[kind]) as payload:
+        key, hit = await cache_lookup(kind, [payload.sha256], params)
+        if hit is not None:
+            logger.info("Cache hit for %s job", kind)
+            return await run_in_threadpool(queue.record_completed, kind, params, hit, priority)
+        params = {**params, CACHE_KEY_PARAM: key}
+        return await run_in_threadpool(queue.submit, kind, payload, params, priority)
+
+
+async def run_job_to_completion(
+    file: UploadFile, kind: str, params: dict[str, Any], priority: int = 0
+) -> dict[str, Any]:
+    """Submit a job and wait for it, mapping failures to HTTP errors.
+
+    Synchronous endpoints use this so they share the job pipeline.
+    """
+    record = await submit_job(file, kind, params, priority)
+    queue = await run_in_threadpool(get_job_queue)
+    record = await queue.wait(record.id)
+    if record.status == JOB_FAILED:
+        status_code = 400 if record.error_kind == ERROR_INVALID else 500
+        raise HTTPException(status_code=status_code, detail=record.error or "Job failed")
+    if record.result is None:
+        raise HTTPException(status_code=409, detail=f"Job {record.status}")
+    return record.result
+
+
+@router.post("", response_model=JobResponse, status_code=202)
+async def create_job(
+    file: UploadFile = File(...),  # noqa: B008
+    kind: str = Form("video"),
+    priority: int = Form(0),
+    fps: int = Form(6),
+    max_map_points: int = Form(0),
+    frame_budget: int = Form(0),
+) -> dict[str, Any]:
+    """Queue a long-running analysis and return its job handle immediately.
+
+    ``max_map_points`` bounds the video ``anomaly_map`` (``0`` keeps every point) and
+    ``frame_budget`` analyzes only that many adaptively chosen frames out of those
+    at ``fps`` (``0`` analyzes every frame).
+    """
+    if fps <= 0:
+        raise HTTPException(status_code=400, detail="fps must be positive")
+    if max_map_points < 0:
+        raise HTTPException(status_code=400, detail="max_map_points must not be negative")
+    if frame_budget < 0:
+        raise HTTPException(status_code=400, detail="frame_budget must not be negative")
+    params: dict[str, Any] = {"fps": fps}
+    if max_map_points:
+        params["max_map_points"] = max_map_points
+    if frame_budget:
+        params["frame_budget"] = frame_budget
+    try:
+        record = await submit_job(file, kind, params, priority)
+    except ValueError as exc:
+        logger.warning("Job submission rejected: %s", exc)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return job_payload(record)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str) -> dict[str, Any]:
+    """Poll a job's status, progress, and result."""
+    queue = await run_in_threadpool(get_job_queue)
+    record = await run_in_threadpool(queue.get, job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_payload(record)
+
+
+@router.delete("/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str) -> dict[str, Any]:
+    """Cancel a queued job, or ask a running one to stop at its next checkpoint."""
+    queue = await run_in_threadpool(get_job_queue)
+    record = await run_in_threadpool(queue.cancel, job_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_payload(record)
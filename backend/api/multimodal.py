@@ -2,81 +2,315 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from collections.abc import Callable, Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from PIL import Image
+from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 
+from backend.api.engines import (
+    FusionWeights,
+    branch_components,
+    fuse_branch_results,
+    run_audio_pipeline,
+    run_image_pipeline,
+    run_metadata_pipeline,
+    run_video_pipeline,
+    settled_classification,
+)
+from backend.api.ingest import ingested
 from backend.api.schemas import MultimodalResponse
-from backend.engines.audio_detector import analyze_audio
-from backend.engines.fusion_engine import fuse_results
-from backend.engines.metadata_analyzer import analyze_image_metadata
-from backend.engines.temporal_detector import analyze_frames
-from backend.engines.vision_detector import analyze_image
+from backend.utils.cache import cache_lookup, cache_store
+from backend.utils.config import get_settings
+from backend.utils.executor import run_cpu_bound
 from backend.utils.logger import get_logger
-from backend.utils.preprocess import (
-    align_faces,
-    detect_faces,
-    extract_frames,
-    load_image,
-    validate_upload,
-)
+from backend.utils.spool import SpooledUpload
+
+if TYPE_CHECKING:
+    from backend.engines.audio_detector import AudioResult
+    from backend.engines.metadata_analyzer import MetadataResult
+    from backend.engines.pipelines import ImageAnalysis, VideoAnalysis
 
 router = APIRouter(prefix="/analyze_multimodal", tags=["multimodal"])
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+MULTIMODAL_VIDEO_FPS = 5
+
+CASCADE_STAGES = ("metadata", "vision", "audio", "temporal")
+"""Cascade stages from cheapest to most expensive (see ``bench_multimodal_cascade``)."""
+
+CASCADE_PHASES = (("metadata",), ("vision", "audio"), ("temporal",))
+"""Groups of ``CASCADE_STAGES`` run concurrently; the verdict is checked between groups.
+
+Temporal, by far the most expensive stage, is only submitted once the vision and
+audio bounds leave the verdict open.
+"""
+_STAGE_MODALITY = {"metadata": "image", "vision": "image", "audio": "audio", "temporal": "video"}
+
+
+@dataclass(frozen=True)
+class _BranchFailure:
+    """Why one modality branch produced no result."""
+
+    reason: str
+    timed_out: bool = False
+    internal: bool = False
+
+
+async def _ingest_all(
+    stack: AsyncExitStack, uploads: dict[str, UploadFile | None]
+) -> list[SpooledUpload | None]:
+    """Spool every supplied upload concurrently, cleaning all of them up on failure."""
+
+    async def ingest(modality: str, upload: UploadFile | None) -> SpooledUpload | None:
+        if not upload:
+            return None
+        return await stack.enter_async_context(ingested(upload, modality))
+
+    # Let every read finish before raising so no spill file escapes the exit stack.
+    outcomes = await asyncio.gather(
+        *(ingest(modality, upload) for modality, upload in uploads.items()),
+        return_exceptions=True,
+    )
+    payloads: list[SpooledUpload | None] = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+        payloads.append(outcome)
+    return payloads
+
+
+async def _run_branch(
+    modality: str,
+    pipeline: Callable[[SpooledUpload], T],
+    payload: SpooledUpload | None,
+    failures: dict[str, _BranchFailure],
+) -> T | None:
+    """Run one modality pipeline under its own deadline, recording any failure."""
+    if payload is None:
+        return None
+    timeout = get_settings().branch_timeout(modality)
+    try:
+        return await asyncio.wait_for(run_cpu_bound(pipeline, payload), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Multimodal %s branch exceeded its %.1fs deadline", modality, timeout)
+        failures[modality] = _BranchFailure(f"timed out after {timeout:g}s", timed_out=True)
+    except ValueError as exc:
+        logger.warning("Multimodal %s branch rejected input: %s", modality, exc)
+        failures[modality] = _BranchFailure(str(exc))
+    except Exception:
+        logger.exception("Multimodal %s branch failed", modality)
+        failures[modality] = _BranchFailure("analysis failed", internal=True)
+    return None
+
+
+@dataclass
+class _CascadeState:
+    """Results the cascade has gathered so far."""
+
+    metadata: MetadataResult | None = None
+    image: ImageAnalysis | None = None
+    video: VideoAnalysis | None = None
+    audio: AudioResult | None = None
+
+    def pending(self, remaining: Sequence[str]) -> set[str]:
+        """Components whose final score still depends on a stage in ``remaining``."""
+        pending = {stage for stage in remaining if stage in ("audio", "temporal")}
+        if "vision" in remaining or (self.image is None and "temporal" in remaining):
+            pending.add("vision")  # the video's still stands in when the image fails
+        if self.image is None and self.metadata is None and "vision" in remaining:
+            pending.add("metadata")
+        return pending
+
+    def settled(self, remaining: Sequence[str], weights: FusionWeights) -> bool:
+        """Whether no outcome of the ``remaining`` stages can change the classification.
+
+        Pending components, vision included, may still take any score in [0, 100].
+        """
+        pending = self.pending(remaining)
+        if "vision" not in pending and self.image is None and self.video is None:
+            return False  # no vision source is left; the request fails instead
+        components = branch_components(
+            self.image, self.video, self.audio, self.metadata, vision_required=False
+        )
+        bounds = {name: None if name in pending else score for name, score in components.items()}
+        return settled_classification(bounds, weights) is not None
+
+
+async def _run_stage(
+    stage: str,
+    payload: SpooledUpload | None,
+    state: _CascadeState,
+    image_pipeline: Callable[[SpooledUpload], ImageAnalysis],
+    video_pipeline: Callable[[SpooledUpload], VideoAnalysis],
+    failures: dict[str, _BranchFailure],
+) -> None:
+    """Run one cascade stage and record its result in ``state``."""
+    if stage == "metadata":
+        # Header-only screening; a failure here is retried by the vision stage.
+        state.metadata = await _run_branch("image", run_metadata_pipeline, payload, {})
+    elif stage == "vision":
+        state.image = await _run_branch("image", image_pipeline, payload, failures)
+    elif stage == "audio":
+        state.audio = await _run_branch("audio", run_audio_pipeline, payload, failures)
+    else:
+        state.video = await _run_branch("video", video_pipeline, payload, failures)
+
+
+async def _run_cascade(
+    payloads: dict[str, SpooledUpload | None],
+    image_pipeline: Callable[[SpooledUpload], ImageAnalysis],
+    video_pipeline: Callable[[SpooledUpload], VideoAnalysis],
+    failures: dict[str, _BranchFailure],
+) -> tuple[_CascadeState, list[str]]:
+    """Run the stages phase by phase until the verdict is settled.
+
+    The stages of each of the ``CASCADE_PHASES`` run concurrently and all finish
+    before the verdict is checked again, so a stage is either run to completion
+    or never submitted. Returns the gathered results and the stages skipped
+    because none of their outcomes could change the classification.
+    """
+    stages = [stage for stage in CASCADE_STAGES if payloads[_STAGE_MODALITY[stage]] is not None]
+    weights = FusionWeights(*get_settings().fusion_weights)
+    state = _CascadeState()
+    remaining = list(stages)
+    for phase in CASCADE_PHASES:
+        batch = [stage for stage in phase if stage in remaining]
+        if not batch:
+            continue
+        if state.settled(remaining, weights):
+            logger.info("Multimodal verdict settled; skipping %s", ", ".join(remaining))
+            return state, remaining
+        await asyncio.gather(
+            *(
+                _run_stage(
+                    stage,
+                    payloads[_STAGE_MODALITY[stage]],
+                    state,
+                    image_pipeline,
+                    video_pipeline,
+                    failures,
+                )
+                for stage in batch
+            )
+        )
+        remaining = [stage for stage in remaining if stage not in batch]
+    return state, []
+
+
+async def _analyze_multimodal(
+    image: SpooledUpload | None,
+    video: SpooledUpload | None,
+    audio: SpooledUpload | None,
+    image_params: dict[str, int],
+    cascade: bool = True,
+) -> tuple[dict[str, Any], dict[str, _BranchFailure]]:
+    """Analyze the modalities and fuse whatever finished in time.
+
+    With ``cascade``, stages run in ``CASCADE_PHASES`` and stop once the
+    classification is settled; otherwise every modality runs concurrently.
+    """
+    failures: dict[str, _BranchFailure] = {}
+    image_pipeline = partial(
+        run_image_pipeline,
+        max_side=image_params["max_side"] or None,
+        max_faces=image_params["max_faces"],
+    )
+    video_pipeline = partial(run_video_pipeline, fps=MULTIMODAL_VIDEO_FPS)
+    metadata_result = None
+    skipped: list[str] = []
+    if cascade:
+        state, skipped = await _run_cascade(
+            {"image": image, "video": video, "audio": audio},
+            image_pipeline,
+            video_pipeline,
+            failures,
+        )
+        image_result, video_result, audio_result = state.image, state.video, state.audio
+        metadata_result = state.metadata
+    else:
+        image_result, video_result, audio_result = await asyncio.gather(
+            _run_branch("image", image_pipeline, image, failures),
+            _run_branch("video", video_pipeline, video, failures),
+            _run_branch("audio", run_audio_pipeline, audio, failures),
+        )
+    if image_result is None and video_result is None:
+        vision_failures = [failures[m] for m in ("image", "video") if m in failures]
+        if any(failure.timed_out for failure in vision_failures):
+            raise HTTPException(status_code=504, detail="Vision analysis timed out")
+        invalid = [failure for failure in vision_failures if not failure.internal]
+        if invalid:
+            raise ValueError(invalid[0].reason)
+        if vision_failures:
+            raise HTTPException(status_code=500, detail="Multimodal analysis failed")
+    fusion = fuse_branch_results(
+        image_result, video_result, audio_result, metadata_result, "vision" not in skipped
+    )
+    result = {
+        "deepfake_score": fusion.deepfake_score,
+        "classification": fusion.classification,
+        "confidence": fusion.confidence,
+        "risk_level": fusion.risk_level,
+        "components": fusion.components,
+        "degraded_modalities": {m: failure.reason for m, failure in failures.items()},
+        "skipped_stages": skipped,
+    }
+    return result, failures
+
 
 @router.post("/", response_model=MultimodalResponse)
 async def analyze_multimodal_endpoint(
     image: UploadFile | None = File(None),  # noqa: B008
     video: UploadFile | None = File(None),  # noqa: B008
     audio: UploadFile | None = File(None),  # noqa: B008
+    full_evaluation: bool = Query(False),  # noqa: B008
 ) -> dict[str, Any]:
-    """Combine available modalities into a single decision."""
+    """Combine available modalities into a single decision.
+
+    Uploads are read concurrently. Detectors then run as a cascade: header-only
+    metadata, then vision and audio concurrently, then temporal, stopping once no
+    remaining stage can change the classification. Skipped stages are listed in
+    ``skipped_stages`` and fused with neutral placeholders, so the score and risk
+    level may differ from a full evaluation but the classification does not. Pass
+    ``full_evaluation=true`` to run every modality to completion instead.
+
+    Each stage runs in its own executor task with its own deadline. A branch that
+    times out or fails is replaced by a neutral placeholder and listed in
+    ``degraded_modalities``; only the vision source (image, or video when no image
+    is usable) is mandatory.
+    """
     if not any([image, video, audio]):
         raise HTTPException(status_code=400, detail="At least one modality required")
 
+    settings = get_settings()
+    image_params = {
+        "max_side": settings.max_analysis_side,
+        "max_faces": settings.max_faces_per_image,
+    }
     try:
-        vision_result = None
-        metadata_result = None
-        if image:
-            validate_upload(image.filename)
-            image_bytes = await image.read()
-            img = load_image(image_bytes)
-            faces = detect_faces(img)
-            aligned = align_faces(img, faces)
-            vision_result = analyze_image(aligned[0])
-            metadata_result = analyze_image_metadata(img)
-
-        temporal_result = None
-        if video:
-            validate_upload(video.filename)
-            video_bytes = await video.read()
-            frames = extract_frames(video_bytes)
-            temporal_result = analyze_frames(frames)
-            if not vision_result and frames:
-                try:
-                    pseudo_img = load_image(video_bytes[: min(1024, len(video_bytes))])
-                except ValueError:
-                    pseudo_img = Image.new("RGB", (64, 64), color=(128, 128, 128))
-                vision_result = analyze_image(align_faces(pseudo_img, detect_faces(pseudo_img))[0])
-
-        audio_result = None
-        if audio:
-            validate_upload(audio.filename)
-            audio_bytes = await audio.read()
-            audio_result = analyze_audio(audio_bytes)
-
-        if vision_result is None:
-            raise HTTPException(status_code=400, detail="Vision modality required for fusion")
-        if temporal_result is None:
-            temporal_result = analyze_frames([])
-        if audio_result is None:
-            audio_result = analyze_audio(b"0")
-        if metadata_result is None:
-            placeholder = Image.new("RGB", (32, 32), color=(128, 128, 128))
-            metadata_result = analyze_image_metadata(placeholder)
-
+        async with AsyncExitStack() as stack:
+            payloads = await _ingest_all(stack, {"image": image, "video": video, "audio": audio})
+            key, hit = await cache_lookup(
+                "multimodal",
+                [payload.sha256 if payload else None for payload in payloads],
+                {
+                    **image_params,
+                    "fusion_weights": settings.fusion_weights,
+                    "cascade": not full_evaluation,
+                },
+            )
+            if hit is not None:
+                logger.info("Cache hit for multimodal analysis")
+                return hit
+            image_payload, video_payload, audio_payload = payloads
+            result, failures = await _analyze_multimodal(
+                image_payload, video_payload, audio_payload, image_params, not full_evaluation
+            )
     except ValueError as exc:
         logger.warning("Multimodal validation failed: %s", exc)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -85,12 +319,7 @@ async def analyze_multimodal_endpoint(
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Unexpected error during multimodal analysis")
         raise HTTPException(status_code=500, detail="Multimodal analysis failed") from exc
-
-    fusion = fuse_results(vision_result, temporal_result, audio_result, metadata_result)
-    return {
-        "deepfake_score": fusion.deepfake_score,
-        "classification": fusion.classification,
-        "confidence": fusion.confidence,
-        "risk_level": fusion.risk_level,
-        "components": fusion.components,
-    }
+    # Degraded verdicts reflect transient deadlines, so only complete ones are reused.
+    if not failures:
+        await cache_store(key, result)
+    return result
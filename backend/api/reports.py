@@ -0,0 +1,106 @@
+"""Download endpoint for deferred PDF reports."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from backend.utils.executor import run_cpu_bound
+from backend.utils.logger import get_logger
+from backend.utils.report_store import ReportNotFoundError, render_report
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+logger = get_logger(__name__)
+
+PDF_MEDIA_TYPE = "application/pdf"
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+async def _render_quietly(report_id: str) -> None:
+    try:
+        await run_cpu_bound(render_report, report_id)
+    except Exception:
+        logger.exception("Background render of report %s failed", report_id)
+
+
+def schedule_render(background_tasks: BackgroundTasks, report_id: str) -> None:
+    """Render a report after the response has been sent."""
+    background_tasks.add_task(_render_quietly, report_id)
+
+
+def parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive ``(start, end)`` offsets.
+
+    Returns ``None`` for forms this endpoint does not serve partially (other units,
+    multiple ranges, malformed values), in which case the whole file is sent.
+
+    Raises:
+        HTTPException: 416 if the range lies entirely beyond the end of the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_file_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.get("/{report_id}")
+async def download_report(
+    report_id: str, range_header: str | None = Header(None, alias="Range")
+) -> Response:
+    """Serve a report PDF, rendering it on first request; supports single byte ranges."""
+    try:
+        path = await run_cpu_bound(render_report, report_id)
+    except ReportNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="Report not found") from exc
+    size = path.stat().st_size
+    byte_range = parse_byte_range(range_header, size) if range_header else None
+    if byte_range is None:
+        return FileResponse(
+            path,
+            media_type=PDF_MEDIA_TYPE,
+            filename=f"report-{report_id[:12]}.pdf",
+            headers={"Accept-Ranges": "bytes"},
+        )
+    start, end = byte_range
+    return StreamingResponse(
+        _iter_file_range(path, start, end),
+        status_code=206,
+        media_type=PDF_MEDIA_TYPE,
+        headers={
+            "Accept-Ranges": "bytes",
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1),
+        },
+    )
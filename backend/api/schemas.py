@@ -2,17 +2,58 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
+class FaceScoreResponse(BaseModel):
+    """Vision score of one detected face; ``box`` is ``(left, top, right, bottom)``."""
+
+    box: tuple[int, int, int, int]
+    vision_score: float = Field(..., ge=0, le=100)
+
+
 class ImageAnalysisResponse(BaseModel):
-    """Schema for image analysis outputs."""
+    """Schema for image analysis outputs; ``vision_score`` is the worst face's score."""
 
     vision_score: float = Field(..., ge=0, le=100)
+    faces: list[FaceScoreResponse]
+    faces_detected: int = Field(..., ge=0)
     artifact_heatmap_shape: tuple[int, ...]
+    heatmap_id: str
+    heatmap_url: str
     metadata_score: float = Field(..., ge=0, le=100)
     metadata_anomalies: list[str]
-    report_path: str
+    report_id: str
+    report_url: str
+
+
+class MetadataScreeningResponse(BaseModel):
+    """Schema for header-only metadata screening; ``metadata`` holds the parsed tags."""
+
+    metadata_score: float = Field(..., ge=0, le=100)
+    metadata_anomalies: list[str]
+    metadata: dict[str, str]
+
+
+class ImageBatchItem(BaseModel):
+    """Per-file outcome of a batch image analysis; ``error`` is set on failure."""
+
+    filename: str | None
+    vision_score: float | None = Field(None, ge=0, le=100)
+    artifact_heatmap_shape: tuple[int, ...] | None = None
+    metadata_score: float | None = Field(None, ge=0, le=100)
+    metadata_anomalies: list[str] = Field(default_factory=list)
+    error: str | None = None
+
+
+class ImageBatchResponse(BaseModel):
+    """Schema for batch image analysis outputs."""
+
+    results: list[ImageBatchItem]
+    processed: int
+    failed: int
 
 
 class VideoAnalysisResponse(BaseModel):
@@ -22,7 +63,9 @@ class VideoAnalysisResponse(BaseModel):
     temporal_score: float = Field(..., ge=0, le=100)
     flagged_frames: list[int]
     anomaly_map: list[float]
-    report_path: str
+    sampled_frames: list[int] | None = None
+    report_id: str
+    report_url: str
 
 
 class AudioAnalysisResponse(BaseModel):
@@ -30,6 +73,7 @@ class AudioAnalysisResponse(BaseModel):
 
     audio_score: float = Field(..., ge=0, le=100)
     anomalies: list[str]
+    speech_ratio: float = Field(1.0, ge=0, le=1)
 
 
 class MultimodalResponse(BaseModel):
@@ -40,3 +84,39 @@ class MultimodalResponse(BaseModel):
     confidence: float = Field(..., ge=0, le=1)
     risk_level: str
     components: dict[str, float]
+    degraded_modalities: dict[str, str] = Field(default_factory=dict)
+    skipped_stages: list[str] = Field(default_factory=list)
+
+
+class RescoreResponse(BaseModel):
+    """Summary of re-fusing stored component scores under the given weights."""
+
+    count: int = Field(..., ge=0)
+    weights: dict[str, float]
+    thresholds: tuple[float, float]
+    mean_score: float = Field(..., ge=0, le=100)
+    classifications: dict[str, int]
+    risk_levels: dict[str, int]
+    reclassified: int = Field(..., ge=0)
+
+
+class JobProgressModel(BaseModel):
+    """Units of work completed (frames for video jobs)."""
+
+    done: int
+    total: int
+
+
+class JobResponse(BaseModel):
+    """Schema for job status responses."""
+
+    id: str
+    kind: str
+    status: str
+    priority: int
+    progress: JobProgressModel
+    result: dict[str, Any] | None
+    error: str | None
+    created_at: float
+    updated_at: float
+    expires_at: float | None
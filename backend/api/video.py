@@ -2,53 +2,58 @@
 
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from PIL import Image
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Query, UploadFile
 
+from backend.api.jobs import run_job_to_completion
+from backend.api.reports import schedule_render
 from backend.api.schemas import VideoAnalysisResponse
-from backend.engines.temporal_detector import analyze_frames
-from backend.engines.vision_detector import analyze_image
+from backend.utils.config import get_settings
 from backend.utils.logger import get_logger
-from backend.utils.pdf_export import export_report
-from backend.utils.preprocess import (
-    align_faces,
-    detect_faces,
-    extract_frames,
-    load_image,
-    validate_upload,
-)
 
 router = APIRouter(prefix="/analyze_video", tags=["video"])
 logger = get_logger(__name__)
 
+SYNC_JOB_PRIORITY = 100
+"""Interactive requests hold a connection open, so they jump ahead of queued jobs."""
+
+VIDEO_FPS = 6
+"""Default candidate frame rate.
+
+Frame extraction yields about ``fps`` frames per upload, so at this rate the
+default ``DFS_VIDEO_FRAME_BUDGET`` of 16 never binds: adaptive sampling is
+opt-in, by requesting an ``fps`` above the budget.
+"""
+
 
 @router.post("/", response_model=VideoAnalysisResponse)
-async def analyze_video_endpoint(file: UploadFile = File(...)) -> dict[str, Any]:  # noqa: B008
-    """Analyze video bytes by sampling frames and checking temporal consistency."""
-    try:
-        validate_upload(file.filename)
-        content = await file.read()
-        if not content:
-            raise HTTPException(status_code=400, detail="Empty file")
-        frames = extract_frames(content, fps=6)
-        temporal_result = analyze_frames(frames)
+async def analyze_video_endpoint(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),  # noqa: B008
+    render_report: bool = Query(False),  # noqa: B008
+    max_map_points: int | None = Query(None, ge=1),  # noqa: B008
+    fps: int = Query(VIDEO_FPS, ge=1),  # noqa: B008
+    frame_budget: int | None = Query(None, ge=1),  # noqa: B008
+) -> dict[str, Any]:
+    """Analyze video bytes by sampling frames and checking temporal consistency.
 
-        if not frames:
-            raise HTTPException(status_code=400, detail="Unable to extract frames")
-        try:
-            pseudo_image = (
-                load_image(content[: min(1024, len(content))])
-                if len(content) >= 3
-                else load_image(content)
-            )
-        except ValueError:
-            pseudo_image = Image.new("RGB", (64, 64), color=(128, 128, 128))
-        faces = detect_faces(pseudo_image)
-        aligned = align_faces(pseudo_image, faces)
-        vision_result = analyze_image(aligned[0])
+    Thin synchronous wrapper over the ``video`` job; use ``POST /jobs`` for long videos.
+    Every frame at ``fps`` is analyzed unless there are more than ``frame_budget``
+    (default ``DFS_VIDEO_FRAME_BUDGET``); then that many are chosen, densely around
+    scene changes. At the default ``fps`` every frame is analyzed; raise ``fps``
+    above the budget to sample adaptively. Pass ``render_report=true`` to render
+    the PDF in the background after responding, and ``max_map_points`` to bound
+    the length of ``anomaly_map``.
+    """
+    params: dict[str, Any] = {
+        "fps": fps,
+        "frame_budget": frame_budget or get_settings().video_frame_budget,
+    }
+    if max_map_points is not None:
+        params["max_map_points"] = max_map_points
+    try:
+        result = await run_job_to_completion(file, "video", params, SYNC_JOB_PRIORITY)
     except ValueError as exc:
         logger.warning("Video analysis validation failed: %s", exc)
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -57,21 +62,6 @@ async def analyze_video_endpoint(file: UploadFile = File(...)) -> dict[str, Any]
     except Exception as exc:  # pragma: no cover - defensive
         logger.exception("Unexpected error during video analysis")
         raise HTTPException(status_code=500, detail="Video analysis failed") from exc
-
-    summary = {
-        "vision_score": f"{vision_result.vision_score:.2f}",
-        "temporal_score": f"{temporal_result.temporal_score:.2f}",
-    }
-    report_path = export_report(
-        Path("logs/video_report.pdf"),
-        summary,
-        [f"Frame {f} anomaly" for f in temporal_result.flagged_frames],
-    )
-
-    return {
-        "vision_score": vision_result.vision_score,
-        "temporal_score": temporal_result.temporal_score,
-        "flagged_frames": temporal_result.flagged_frames,
-        "anomaly_map": temporal_result.anomaly_map,
-        "report_path": str(report_path),
-    }
+    if render_report:
+        schedule_render(background_tasks, result["report_id"])
+    return result
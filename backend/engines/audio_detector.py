@@ -2,15 +2,31 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
+from typing import Any
 
 import numpy as np
+from numpy.typing import NDArray
 
 from backend.utils.logger import get_logger
-from backend.utils.preprocess import extract_mfcc
+from backend.utils.media import MediaContext
+from backend.utils.preprocess import (
+    MFCC_COEFFICIENTS,
+    ByteSource,
+    VoiceActivity,
+    iter_audio_blocks,
+    iter_mfcc,
+)
 
 logger = get_logger(__name__)
 
+FLAT_VARIANCE = 1.0
+"""Mean per-coefficient MFCC variance below which speech is suspiciously static."""
+
+DRIFT_LIMIT = 100.0
+"""Largest per-coefficient MFCC range (log units) before drift is reported."""
+
 
 @dataclass
 class AudioResult:
@@ -18,18 +34,90 @@ class AudioResult:
 
     audio_score: float
     anomalies: list[str]
+    speech_ratio: float = 1.0
+    """Share of STFT frames kept by voice activity gating (1.0 when ungated)."""
+
+
+def analyze_audio(audio_bytes: ByteSource, gate_silence: bool = True) -> AudioResult:
+    """Analyze a WAV or raw 16-bit PCM payload by its frame-level MFCC statistics.
 
+    With ``gate_silence``, a ``VoiceActivity`` gate drops silent frames before the
+    FFT, so only speech segments are featurized and scored. Empty or all-silent
+    audio scores 0.0 and reports "No speech detected".
+    """
+    return _analyze_audio_blocks(iter_audio_blocks(audio_bytes), gate_silence)
 
-def analyze_audio(audio_bytes: bytes) -> AudioResult:
-    """Analyze audio by inspecting MFCC distribution and synthetic cues."""
-    mfcc = extract_mfcc(audio_bytes)
-    variance = float(np.var(mfcc))
-    drift = float(np.max(mfcc) - np.min(mfcc)) if mfcc.size else 0.0
-    score = float(max(0.0, 100.0 - (variance * 10 + drift * 0.001)))
+
+def analyze_media_audio(media: MediaContext, gate_silence: bool = True) -> AudioResult:
+    """Analyze audio streamed from a media context's upload."""
+    return _analyze_audio_blocks(media.audio_blocks(), gate_silence)
+
+
+def _analyze_audio_blocks(blocks: Iterable[NDArray[Any]], gate_silence: bool) -> AudioResult:
+    activity = VoiceActivity() if gate_silence else None
+    summary = _MfccSummary()
+    for mfcc in iter_mfcc(blocks, activity=activity):
+        summary.add(mfcc)
+    variance, drift = summary.variance, summary.drift
+    # Without a featurized frame there is no evidence either way, as for missing audio.
+    score = float(max(0.0, 100.0 - (variance * 0.5 + drift * 0.1))) if summary.frames else 0.0
     anomalies: list[str] = []
-    if variance < 1.0:
+    if not summary.frames:
+        anomalies.append("No speech detected")
+    elif variance < FLAT_VARIANCE:
         anomalies.append("Flat MFCC distribution suggests synthetic speech")
-    if drift > 5000:
+    if drift > DRIFT_LIMIT:
         anomalies.append("High spectral drift may indicate voice cloning artifacts")
-    logger.info("Audio analysis complete with score %.2f", score)
-    return AudioResult(audio_score=score, anomalies=anomalies)
+    speech_ratio = activity.speech_ratio if activity is not None else 1.0
+    logger.info(
+        "Audio analysis complete with score %.2f over %d frames (%.0f%% speech)",
+        score,
+        summary.frames,
+        speech_ratio * 100,
+    )
+    return AudioResult(audio_score=score, anomalies=anomalies, speech_ratio=speech_ratio)
+
+
+class _MfccSummary:
+    """Running per-coefficient mean, variance, and range over MFCC frames.
+
+    Blocks are merged with the pairwise update of Chan et al., so only one block
+    of frames is held at a time.
+    """
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.mean = np.zeros(MFCC_COEFFICIENTS)
+        self.sq_dev = np.zeros(MFCC_COEFFICIENTS)
+        self.low = np.full(MFCC_COEFFICIENTS, np.inf)
+        self.high = np.full(MFCC_COEFFICIENTS, -np.inf)
+
+    def add(self, block: NDArray[np.float32]) -> None:
+        """Merge a (frames, coefficients) block into the running statistics."""
+        count = len(block)
+        if not count:
+            return
+        block_mean = block.mean(axis=0, dtype=np.float64)
+        block_sq_dev = ((block - block_mean) ** 2).sum(axis=0)
+        total = self.frames + count
+        delta = block_mean - self.mean
+        self.mean += delta * count / total
+        self.sq_dev += block_sq_dev + delta**2 * self.frames * count / total
+        self.frames = total
+        self.low = np.minimum(self.low, block.min(axis=0))
+        self.high = np.maximum(self.high, block.max(axis=0))
+
+    @property
+    def variance(self) -> float:
+        """Per-coefficient variance across frames, averaged over coefficients."""
+        return float((self.sq_dev / self.frames).mean()) if self.frames else 0.0
+
+    @property
+    def drift(self) -> float:
+        """Largest range of any coefficient across frames."""
+        return float((self.high - self.low).max()) if self.frames else 0.0
+
+
+def warm_up() -> None:
+    """Run the STFT and MFCC path once on a short synthetic signal."""
+    analyze_audio(np.arange(1024, dtype=np.int16).tobytes())
@@ -2,17 +2,41 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
 
 from backend.engines.audio_detector import AudioResult
 from backend.engines.metadata_analyzer import MetadataResult
 from backend.engines.temporal_detector import TemporalResult
 from backend.engines.vision_detector import VisionResult
+from backend.utils.config import DEFAULT_FUSION_WEIGHTS
 from backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+COMPONENTS = ("vision", "temporal", "audio", "metadata")
+"""Column order of component matrices passed to ``fuse_score_matrix``."""
+
+RISK_BUCKETS = [
+    (0, 25, "Low"),
+    (25, 50, "Medium"),
+    (50, 75, "High"),
+    (75, 101, "Critical"),
+]
+RISK_LEVELS = tuple(level for _, _, level in RISK_BUCKETS)
+_RISK_EDGES = np.array([low for low, _, _ in RISK_BUCKETS[1:]], dtype=np.float64)
+"""Lower bounds of every bucket but the first, for ``searchsorted``."""
+
+CLASSIFICATIONS = ("REAL", "UNCERTAIN", "FAKE")
+CLASSIFICATION_THRESHOLDS = (40.0, 65.0)
+"""Scores from which ``UNCERTAIN`` and ``FAKE`` start."""
+
+
 @dataclass
 class FusionResult:
     """Aggregated fusion outcome."""
@@ -24,39 +48,113 @@ class FusionResult:
     components: dict[str, float]
 
 
-RISK_BUCKETS = [
-    (0, 25, "Low"),
-    (25, 50, "Medium"),
-    (50, 75, "High"),
-    (75, 101, "Critical"),
-]
+@dataclass(frozen=True)
+class FusionWeights:
+    """Weight of each component score in the fused ``deepfake_score``.
 
+    The fused score is the weighted sum clipped to ``[0, 100]``; weights are not
+    normalized, so the defaults (``DEFAULT_FUSION_WEIGHTS``, which the
+    ``DFS_FUSION_WEIGHTS`` setting also defaults to) sum to one.
+    """
 
-def fuse_results(
-    vision: VisionResult,
-    temporal: TemporalResult,
-    audio: AudioResult,
-    metadata: MetadataResult,
-) -> FusionResult:
-    """Blend component scores into a final deepfake score."""
-    weights = {
-        "vision": 0.4,
-        "temporal": 0.2,
-        "audio": 0.2,
-        "metadata": 0.2,
-    }
-    composite = (
-        vision.vision_score * weights["vision"]
-        + temporal.temporal_score * weights["temporal"]
-        + audio.audio_score * weights["audio"]
-        + metadata.metadata_score * weights["metadata"]
+    vision: float = DEFAULT_FUSION_WEIGHTS[0]
+    temporal: float = DEFAULT_FUSION_WEIGHTS[1]
+    audio: float = DEFAULT_FUSION_WEIGHTS[2]
+    metadata: float = DEFAULT_FUSION_WEIGHTS[3]
+
+    def __post_init__(self) -> None:
+        values = self.as_array()
+        if not np.all(np.isfinite(values)) or np.any(values < 0):
+            raise ValueError("Fusion weights must be finite and non-negative")
+        if values.sum() <= 0:
+            raise ValueError("At least one fusion weight must be positive")
+
+    def as_array(self) -> NDArray[np.float64]:
+        """Weights as a vector in ``COMPONENTS`` order."""
+        return np.array([getattr(self, name) for name in COMPONENTS], dtype=np.float64)
+
+
+@dataclass
+class FusionBatch:
+    """Fusion outcomes of N component vectors, one array entry per row.
+
+    ``classifications`` and ``risk_levels`` hold indices into
+    ``CLASSIFICATIONS`` and ``RISK_LEVELS``.
+    """
+
+    scores: NDArray[np.float64]
+    classifications: NDArray[np.intp]
+    confidences: NDArray[np.float64]
+    risk_levels: NDArray[np.intp]
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def classification_labels(self) -> list[str]:
+        """Classification names, one per row."""
+        return [CLASSIFICATIONS[code] for code in self.classifications.tolist()]
+
+    def risk_labels(self) -> list[str]:
+        """Risk-level names, one per row."""
+        return [RISK_LEVELS[code] for code in self.risk_levels.tolist()]
+
+
+DEFAULT_WEIGHTS = FusionWeights()
+
+
+def fuse_score_matrix(
+    components: NDArray[np.floating[Any]],
+    weights: FusionWeights = DEFAULT_WEIGHTS,
+    thresholds: tuple[float, float] = CLASSIFICATION_THRESHOLDS,
+) -> FusionBatch:
+    """Fuse an N x 4 matrix of component scores in ``COMPONENTS`` order.
+
+    Scores, classifications, confidences, and risk levels are computed for all
+    rows at once; buckets are found with ``searchsorted``, so one matrix of
+    stored component vectors can be re-scored under new weights or thresholds
+    without re-running any detector.
+
+    Raises:
+        ValueError: If ``components`` is not N x 4 or ``thresholds`` is not ascending.
+    """
+    matrix = np.asarray(components, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[1] != len(COMPONENTS):
+        raise ValueError(f"Component matrix must be N x {len(COMPONENTS)}, got {matrix.shape}")
+    if not thresholds[0] <= thresholds[1]:
+        raise ValueError("Classification thresholds must be ascending")
+    # Accumulate column by column in the scalar formula's order; a BLAS matmul could
+    # round differently per batch size and flip verdicts that sit on a threshold.
+    weight_vector = weights.as_array()
+    scores = matrix[:, 0] * weight_vector[0]
+    for column in range(1, len(COMPONENTS)):
+        scores += matrix[:, column] * weight_vector[column]
+    np.clip(scores, 0.0, 100.0, out=scores)
+    return FusionBatch(
+        scores=scores,
+        classifications=np.searchsorted(np.asarray(thresholds), scores, side="right"),
+        confidences=np.minimum(1.0, np.abs(scores - 50) / 50 + 0.2),
+        risk_levels=np.searchsorted(_RISK_EDGES, scores, side="right"),
     )
-    deepfake_score = float(max(0.0, min(100.0, composite)))
-    classification = (
-        "REAL" if deepfake_score < 40 else "UNCERTAIN" if deepfake_score < 65 else "FAKE"
+
+
+def fuse_scores(
+    vision_score: float,
+    temporal_score: float,
+    audio_score: float,
+    metadata_score: float,
+    weights: FusionWeights = DEFAULT_WEIGHTS,
+) -> FusionResult:
+    """Blend raw component scores into a final deepfake score.
+
+    This is ``fuse_score_matrix`` on a single row, so live and re-scored
+    verdicts agree exactly.
+    """
+    batch = fuse_score_matrix(
+        np.array([[vision_score, temporal_score, audio_score, metadata_score]]), weights
     )
-    confidence = float(min(1.0, abs(deepfake_score - 50) / 50 + 0.2))
-    risk_level = next(level for low, high, level in RISK_BUCKETS if low <= deepfake_score < high)
+    deepfake_score = float(batch.scores[0])
+    classification = CLASSIFICATIONS[batch.classifications[0]]
+    risk_level = RISK_LEVELS[batch.risk_levels[0]]
     logger.info(
         "Fusion produced score %.2f with classification %s and risk %s",
         deepfake_score,
@@ -66,12 +164,50 @@ def fuse_results(
     return FusionResult(
         deepfake_score=deepfake_score,
         classification=classification,
-        confidence=confidence,
+        confidence=float(batch.confidences[0]),
         risk_level=risk_level,
         components={
-            "vision_score": vision.vision_score,
-            "temporal_score": temporal.temporal_score,
-            "audio_score": audio.audio_score,
-            "metadata_score": metadata.metadata_score,
+            "vision_score": vision_score,
+            "temporal_score": temporal_score,
+            "audio_score": audio_score,
+            "metadata_score": metadata_score,
         },
     )
+
+
+def settled_classification(
+    components: Mapping[str, float | None],
+    weights: FusionWeights = DEFAULT_WEIGHTS,
+    thresholds: tuple[float, float] = CLASSIFICATION_THRESHOLDS,
+) -> str | None:
+    """Return the classification no pending component can change, if there is one.
+
+    ``components`` maps every name in ``COMPONENTS`` to its score, or to ``None``
+    while that detector has not run. The fused score only grows with each
+    component, so every reachable score lies between the fusions with all pending
+    components at 0 and at 100; the verdict is settled when both ends classify
+    alike.
+    """
+    known = [components[name] for name in COMPONENTS]
+    lowest = [0.0 if score is None else score for score in known]
+    highest = [100.0 if score is None else score for score in known]
+    bounds = fuse_score_matrix(np.array([lowest, highest]), weights, thresholds)
+    low, high = bounds.classifications.tolist()
+    return CLASSIFICATIONS[low] if low == high else None
+
+
+def fuse_results(
+    vision: VisionResult,
+    temporal: TemporalResult,
+    audio: AudioResult,
+    metadata: MetadataResult,
+    weights: FusionWeights = DEFAULT_WEIGHTS,
+) -> FusionResult:
+    """Blend detector results into a final deepfake score."""
+    return fuse_scores(
+        vision.vision_score,
+        temporal.temporal_score,
+        audio.audio_score,
+        metadata.metadata_score,
+        weights,
+    )
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass
 
 from PIL import Image
 
-from backend.utils.exif import extract_exif
+from backend.utils.exif import extract_exif, read_metadata
 from backend.utils.logger import get_logger
+from backend.utils.media import MediaContext
 
 logger = get_logger(__name__)
 
@@ -24,7 +26,7 @@ class MetadataResult:
 def analyze_metadata(image_metadata: dict[str, str]) -> MetadataResult:
     """Inspect metadata for inconsistencies and editing traces."""
     anomalies: list[str] = []
-    camera_model = image_metadata.get("Model")
+    camera_model = image_metadata.get("Model") or image_metadata.get("tiff:Model")
     timestamp = image_metadata.get("DateTime")
 
     if not image_metadata:
@@ -43,3 +45,17 @@ def analyze_image_metadata(image: Image.Image) -> MetadataResult:
     """Convenience wrapper to extract and analyze EXIF metadata."""
     metadata = extract_exif(image)
     return analyze_metadata(metadata)
+
+
+def analyze_media_metadata(media: MediaContext) -> MetadataResult:
+    """Analyze the EXIF and XMP tags in the upload's headers without decoding pixels."""
+    return analyze_metadata(media.exif)
+
+
+def warm_up() -> None:
+    """Run header parsing and metadata scoring once on a tiny JPEG."""
+    exif = Image.Exif()  # type: ignore[no-untyped-call]
+    exif[0x0110] = "WarmUp"
+    buffer = io.BytesIO()
+    Image.new("RGB", (1, 1)).save(buffer, "JPEG", exif=exif.tobytes())
+    analyze_metadata(read_metadata(buffer.getvalue()))
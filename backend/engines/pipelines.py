@@ -0,0 +1,373 @@
+"""Per-modality analysis pipelines executed inside executor workers.
+
+Each pipeline takes a spooled upload, maps it into a zero-copy buffer, wraps it in
+a ``MediaContext`` so every representation is decoded once and shared by the
+engines, and returns a compact result. Large intermediates (decoded images,
+frames) stay inside the worker and heatmaps are deferred handles, so only scores
+cross the process boundary.
+"""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from backend.engines.audio_detector import AudioResult, analyze_media_audio
+from backend.engines.fusion_engine import (
+    CLASSIFICATIONS,
+    COMPONENTS,
+    RISK_LEVELS,
+    FusionResult,
+    FusionWeights,
+    fuse_score_matrix,
+    fuse_scores,
+)
+from backend.engines.metadata_analyzer import (
+    MetadataResult,
+    analyze_media_metadata,
+)
+from backend.engines.temporal_detector import (
+    ProgressCallback,
+    PyramidConfig,
+    TemporalResult,
+    analyze_media_frames,
+)
+from backend.engines.vision_detector import (
+    MAX_FACES_PER_IMAGE,
+    FaceScore,
+    analyze_image_batch,
+    analyze_media_vision,
+)
+from backend.utils.config import get_settings
+from backend.utils.exif import detect_container
+from backend.utils.heatmap import HeatmapHandle
+from backend.utils.logger import get_logger
+from backend.utils.media import MediaContext
+from backend.utils.preprocess import load_score_matrix, stack_face_crops
+from backend.utils.report_store import register_report, report_url
+from backend.utils.spool import SpooledUpload
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ImageAnalysis:
+    """Compact outcome of the image pipeline."""
+
+    vision_score: float
+    vision_details: dict[str, float]
+    heatmap: HeatmapHandle
+    metadata: MetadataResult
+    faces: list[FaceScore] = field(default_factory=list)
+    faces_detected: int = 0
+
+
+@dataclass
+class PreparedImage:
+    """Decoded image reduced to a fixed-size face crop plus its metadata verdict."""
+
+    crop: NDArray[np.uint8]
+    crop_size: tuple[int, int]
+    metadata: MetadataResult
+
+
+@dataclass
+class RescoreResult:
+    """Summary of re-fusing a matrix of stored component scores.
+
+    ``reclassified`` counts rows whose classification differs from the one the
+    baseline weights give; ``rows`` is an ``.npz`` archive of per-row outcomes
+    when requested.
+    """
+
+    count: int
+    mean_score: float
+    classifications: dict[str, int]
+    risk_levels: dict[str, int]
+    reclassified: int
+    rows: bytes | None = None
+
+
+@dataclass
+class VideoAnalysis:
+    """Compact outcome of the video pipeline."""
+
+    vision_score: float
+    temporal: TemporalResult
+
+
+def run_image_pipeline(
+    upload: SpooledUpload,
+    max_side: int | None = None,
+    max_faces: int = MAX_FACES_PER_IMAGE,
+) -> ImageAnalysis:
+    """Decode an image upload once and run the metadata and vision engines on it.
+
+    Metadata is read from the file headers before any pixels are decoded.
+    ``max_side`` caps the decoded resolution; see ``load_image``. Up to
+    ``max_faces`` faces are scored; see ``analyze_media_vision``.
+    """
+    with MediaContext.open(upload, max_side=max_side) as media:
+        metadata_result = analyze_media_metadata(media)
+        vision_result = analyze_media_vision(media, max_faces)
+    return ImageAnalysis(
+        vision_score=vision_result.vision_score,
+        vision_details=vision_result.details,
+        heatmap=vision_result.artifact_heatmap,
+        metadata=metadata_result,
+        faces=vision_result.faces,
+        faces_detected=vision_result.faces_detected,
+    )
+
+
+def run_metadata_pipeline(upload: SpooledUpload) -> MetadataResult:
+    """Screen an image upload on its EXIF and XMP headers alone, decoding no pixels.
+
+    Raises:
+        ValueError: If the upload is not a JPEG, PNG, TIFF, or WebP file.
+    """
+    with MediaContext.open(upload) as media:
+        if detect_container(media.content) is None:
+            raise ValueError("Invalid image file")
+        return analyze_media_metadata(media)
+
+
+def prepare_image(upload: SpooledUpload, side: int, max_side: int | None = None) -> PreparedImage:
+    """Decode an upload and resize its primary face crop for batch scoring."""
+    with MediaContext.open(upload, max_side=max_side) as media:
+        crop = media.crops[0]
+        return PreparedImage(
+            crop=stack_face_crops([crop], side)[0],
+            crop_size=crop.size,
+            metadata=analyze_media_metadata(media),
+        )
+
+
+def score_prepared_images(prepared: list[PreparedImage]) -> list[ImageAnalysis]:
+    """Score prepared crops together in one vectorized vision pass."""
+    if not prepared:
+        return []
+    batch = np.stack([item.crop for item in prepared])
+    vision_results = analyze_image_batch(batch, [item.crop_size for item in prepared])
+    return [
+        ImageAnalysis(
+            vision_score=vision.vision_score,
+            vision_details=vision.details,
+            heatmap=vision.artifact_heatmap,
+            metadata=item.metadata,
+        )
+        for item, vision in zip(prepared, vision_results, strict=True)
+    ]
+
+
+def run_video_pipeline(
+    upload: SpooledUpload,
+    fps: int = 6,
+    progress: ProgressCallback | None = None,
+    max_map_points: int | None = None,
+    temporal_workers: int = 1,
+    frame_budget: int | None = None,
+    pyramid: PyramidConfig | None = None,
+) -> VideoAnalysis:
+    """Stream frames from a video upload through the temporal engine and score its still.
+
+    Frames are decoded one at a time from the mapped upload, so memory does not grow
+    with the number of frames; ``max_map_points`` bounds the returned anomaly map and
+    ``temporal_workers`` spreads the frame differences over that many processes.
+    ``frame_budget`` caps how many of the frames at ``fps`` are analyzed, chosen
+    adaptively around scene changes, and ``pyramid`` enables coarse-to-fine
+    differencing; see ``analyze_media_frames``.
+    """
+    with MediaContext.open(upload, "video") as media:
+        if not media.frame_count(fps):
+            raise ValueError("Unable to extract frames")
+        temporal_result = analyze_media_frames(
+            media,
+            fps=fps,
+            progress=progress,
+            max_map_points=max_map_points,
+            workers=temporal_workers,
+            frame_budget=frame_budget,
+            pyramid=pyramid,
+        )
+        vision_result = analyze_media_vision(media)
+    return VideoAnalysis(vision_score=vision_result.vision_score, temporal=temporal_result)
+
+
+def run_video_job(
+    upload: SpooledUpload, params: dict[str, Any], progress: ProgressCallback
+) -> dict[str, Any]:
+    """Job handler running the video pipeline and registering its report."""
+    max_map_points = params.get("max_map_points")
+    frame_budget = params.get("frame_budget")
+    pyramid_level = params.get("pyramid_level")
+    refine_margin = params.get("refine_margin")
+    pyramid = (
+        PyramidConfig(
+            int(pyramid_level), float(refine_margin) if refine_margin is not None else None
+        )
+        if pyramid_level
+        else None
+    )
+    analysis = run_video_pipeline(
+        upload,
+        fps=int(params.get("fps", 6)),
+        progress=progress,
+        max_map_points=int(max_map_points) if max_map_points else None,
+        # Results do not depend on the worker count, so it stays out of ``params``.
+        temporal_workers=get_settings().temporal_workers,
+        frame_budget=int(frame_budget) if frame_budget else None,
+        pyramid=pyramid,
+    )
+    temporal_result = analysis.temporal
+    summary = {
+        "vision_score": f"{analysis.vision_score:.2f}",
+        "temporal_score": f"{temporal_result.temporal_score:.2f}",
+    }
+    report_id = register_report(
+        summary, [f"Frame {f} anomaly" for f in temporal_result.flagged_frames]
+    )
+    return {
+        "vision_score": analysis.vision_score,
+        "temporal_score": temporal_result.temporal_score,
+        "flagged_frames": temporal_result.flagged_frames,
+        "anomaly_map": temporal_result.anomaly_map,
+        "sampled_frames": temporal_result.sampled_frames,
+        "report_id": report_id,
+        "report_url": report_url(report_id),
+    }
+
+
+def run_audio_pipeline(upload: SpooledUpload) -> AudioResult:
+    """Run the audio engine over a spooled upload."""
+    with MediaContext.open(upload, "audio") as media:
+        return analyze_media_audio(media)
+
+
+MISSING_VISION_SCORE = 50.0
+"""Vision score fused when the multimodal cascade settled the verdict without vision."""
+
+MISSING_TEMPORAL_SCORE = 0.0
+"""Temporal score fused when no video result is available."""
+
+MISSING_AUDIO_SCORE = 0.0
+"""Audio score fused when no audio result is available."""
+
+MISSING_METADATA_SCORE = 80.0
+"""Metadata score fused when no metadata result is available (that of a bare image)."""
+
+
+def branch_components(
+    image: ImageAnalysis | None,
+    video: VideoAnalysis | None,
+    audio: AudioResult | None,
+    metadata: MetadataResult | None = None,
+    vision_required: bool = True,
+) -> dict[str, float]:
+    """Component scores, keyed like ``COMPONENTS``, from whichever results are available.
+
+    Vision comes from the image branch, falling back to the video's pseudo still.
+    Metadata comes from the image analysis, falling back to a header-only
+    ``metadata`` result. Missing temporal, audio, and metadata components use the
+    ``MISSING_*_SCORE`` placeholders, as does a missing vision component unless
+    ``vision_required``.
+
+    Raises:
+        ValueError: If ``vision_required`` and neither an image nor a video result
+            supplies a vision score.
+    """
+    if image is not None:
+        vision_score = image.vision_score
+        metadata = image.metadata
+    elif video is not None:
+        vision_score = video.vision_score
+    elif not vision_required:
+        vision_score = MISSING_VISION_SCORE
+    else:
+        raise ValueError("Vision modality required for fusion")
+    return {
+        "vision": vision_score,
+        "temporal": (
+            video.temporal.temporal_score if video is not None else MISSING_TEMPORAL_SCORE
+        ),
+        "audio": audio.audio_score if audio is not None else MISSING_AUDIO_SCORE,
+        "metadata": metadata.metadata_score if metadata is not None else MISSING_METADATA_SCORE,
+    }
+
+
+def fuse_branch_results(
+    image: ImageAnalysis | None,
+    video: VideoAnalysis | None,
+    audio: AudioResult | None,
+    metadata: MetadataResult | None = None,
+    vision_required: bool = True,
+) -> FusionResult:
+    """Fuse whichever per-modality results are available; see ``branch_components``.
+
+    Raises:
+        ValueError: If ``vision_required`` and neither an image nor a video result
+            supplies a vision score.
+    """
+    components = branch_components(image, video, audio, metadata, vision_required)
+    return fuse_scores(
+        components["vision"],
+        components["temporal"],
+        components["audio"],
+        components["metadata"],
+        FusionWeights(*get_settings().fusion_weights),
+    )
+
+
+def _counts(codes: NDArray[np.intp], names: tuple[str, ...]) -> dict[str, int]:
+    return dict(zip(names, np.bincount(codes, minlength=len(names)).tolist(), strict=True))
+
+
+def run_rescore_pipeline(
+    upload: SpooledUpload,
+    weights: FusionWeights,
+    thresholds: tuple[float, float],
+    baseline: FusionWeights,
+    include_rows: bool = False,
+) -> RescoreResult:
+    """Re-fuse an uploaded ``.npy`` N x 4 component matrix without running any detector.
+
+    Columns follow ``COMPONENTS``. The matrix is viewed in place in the mapped
+    upload and fused in one vectorized pass, then again under ``baseline`` to
+    count reclassified rows. With ``include_rows``, per-row scores, confidences,
+    and classification and risk-level indices are returned as an ``.npz``
+    archive together with their label tables.
+
+    Raises:
+        ValueError: If the upload is not a numeric N x 4 ``.npy`` matrix.
+    """
+    with upload.open_buffer() as content:
+        matrix = load_score_matrix(content, len(COMPONENTS))
+        batch = fuse_score_matrix(matrix, weights, thresholds)
+        previous = fuse_score_matrix(matrix, baseline).classifications
+        del matrix
+    rows = None
+    if include_rows:
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            deepfake_score=batch.scores.astype(np.float32),
+            confidence=batch.confidences.astype(np.float32),
+            classification=batch.classifications.astype(np.uint8),
+            risk_level=batch.risk_levels.astype(np.uint8),
+            classification_labels=np.array(CLASSIFICATIONS),
+            risk_level_labels=np.array(RISK_LEVELS),
+        )
+        rows = buffer.getvalue()
+    logger.info("Re-scored %d component vectors", len(batch))
+    return RescoreResult(
+        count=len(batch),
+        mean_score=float(batch.scores.mean()) if len(batch) else 0.0,
+        classifications=_counts(batch.classifications, CLASSIFICATIONS),
+        risk_levels=_counts(batch.risk_levels, RISK_LEVELS),
+        reclassified=int(np.count_nonzero(batch.classifications != previous)),
+        rows=rows,
+    )
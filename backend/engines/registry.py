@@ -0,0 +1,86 @@
+"""Lightweight registry of analysis engines and their warm-up hooks.
+
+Engines are registered by ``"module:function"`` path rather than by object, so
+importing the registry imports no engine code. ``warm_up_engines`` resolves and
+runs the hooks, typically inside each executor worker during application startup,
+so the first request does not pay for imports, lookup tables, and first calls of
+NumPy paths. ``EngineFunction`` extends the same idea to the entry points routers
+call, so importing a router imports no engine code either.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_engines: dict[str, str] = {}
+_warmed: set[str] = set()
+_lock = threading.Lock()
+
+
+def register_engine(name: str, warm_up: str) -> None:
+    """Register an engine warm-up hook given as ``"package.module:function"``."""
+    module, _, function = warm_up.partition(":")
+    if not module or not function:
+        raise ValueError("warm_up must look like 'package.module:function'")
+    _engines[name] = warm_up
+
+
+def registered_engines() -> list[str]:
+    """Return registered engine names in registration order."""
+    return list(_engines)
+
+
+def _resolve(path: str) -> Callable[..., object]:
+    module, _, function = path.partition(":")
+    hook: Callable[..., object] = getattr(importlib.import_module(module), function)
+    return hook
+
+
+@dataclass(frozen=True)
+class EngineFunction:
+    """Callable reference to an engine function given as ``"package.module:function"``.
+
+    The module is imported on the first call, in whichever process makes it. The
+    reference pickles as its path, so it can be submitted to a process executor
+    without importing the engine in the submitting process.
+    """
+
+    path: str
+
+    def __call__(self, *args: object, **kwargs: object) -> object:
+        return _resolve(self.path)(*args, **kwargs)
+
+
+def warm_up_engines() -> dict[str, float]:
+    """Run every hook not yet run in this process; returns milliseconds per engine.
+
+    Safe to call repeatedly and from several threads; hooks already run are
+    skipped and reported as ``0.0``.
+    """
+    timings: dict[str, float] = {}
+    with _lock:
+        for name, path in _engines.items():
+            if name in _warmed:
+                timings[name] = 0.0
+                continue
+            started = time.perf_counter()
+            _resolve(path)()
+            timings[name] = (time.perf_counter() - started) * 1000
+            _warmed.add(name)
+    logger.info("Engine warm-up (ms): %s", {k: round(v, 1) for k, v in timings.items()})
+    return timings
+
+
+register_engine("vision", "backend.engines.vision_detector:warm_up")
+register_engine("temporal", "backend.engines.temporal_detector:warm_up")
+register_engine("audio", "backend.engines.audio_detector:warm_up")
+register_engine("metadata", "backend.engines.metadata_analyzer:warm_up")
+register_engine("reports", "backend.utils.pdf_export:warm_up")
@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Iterator, Sized
 from dataclasses import dataclass
+from multiprocessing import shared_memory
 
 import numpy as np
 from numpy.typing import NDArray
 
+from backend.utils.executor import get_shard_executor
 from backend.utils.logger import get_logger
+from backend.utils.media import MediaContext
+from backend.utils.preprocess import (
+    batch_frames,
+    block_average,
+    block_spread,
+    plan_frame_samples,
+    select_frames,
+)
 
 logger = get_logger(__name__)
 
@@ -19,29 +30,530 @@ class TemporalResult:
     temporal_score: float
     flagged_frames: list[int]
     anomaly_map: list[float]
+    sampled_frames: list[int] | None = None
+    """Candidate positions analyzed under a frame budget; ``None`` when all were."""
 
 
-def analyze_frames(frames: list[NDArray[np.float32]]) -> TemporalResult:
-    """Analyze temporal consistency using frame-to-frame differences."""
-    if not frames:
-        return TemporalResult(temporal_score=0.0, flagged_frames=[], anomaly_map=[])
-
-    anomalies: list[float] = []
-    flagged: list[int] = []
-    for idx in range(1, len(frames)):
-        prev, curr = frames[idx - 1], frames[idx]
-        min_shape = tuple(min(p, c) for p, c in zip(prev.shape, curr.shape, strict=False))
-        prev = prev[: min_shape[0], : min_shape[1]]
-        curr = curr[: min_shape[0], : min_shape[1]]
-        diff = float(np.mean(np.abs(prev - curr)))
-        anomalies.append(diff)
-        if diff > 25:
-            flagged.append(idx)
-    avg_anomaly = float(np.mean(anomalies)) if anomalies else 0.0
-    temporal_score = float(max(0.0, 100.0 - avg_anomaly))
-    logger.info("Temporal analysis complete with score %.2f", temporal_score)
-    return TemporalResult(
-        temporal_score=temporal_score,
-        flagged_frames=flagged,
-        anomaly_map=anomalies,
+ProgressCallback = Callable[[int, int], None]
+"""Called with ``(frames_processed, frames_total)`` as analysis advances."""
+
+
+TEMPORAL_BATCH_FRAMES = 64
+"""Frames stacked per vectorized difference pass."""
+
+TEMPORAL_BATCH_BYTES = 256 * 1024
+"""Cache-sized bound on a stacked batch; larger frames are differenced one at a time."""
+
+TEMPORAL_SHARD_BYTES = 8 * 1024 * 1024
+"""Frame bytes handed to one worker at a time by ``analyze_frames_parallel``."""
+
+FLAG_THRESHOLD = 25.0
+
+PYRAMID_BOUND_SLACK = 1e-6
+"""Tolerance for floating-point rounding when coarse bounds are compared to ``FLAG_THRESHOLD``."""
+
+CUT_PROBE_MARGIN = 0.5
+"""Fraction of ``FLAG_THRESHOLD`` above which a thumbnail difference reserves both frames.
+
+Thumbnails estimate the frame difference from a sample of pixels; the margin keeps
+pairs that would be flagged from being skipped because of sampling error.
+"""
+
+
+@dataclass(frozen=True)
+class PyramidConfig:
+    """Coarse-to-fine temporal analysis settings.
+
+    Frames are first differenced after ``block_average`` over ``2 ** level`` pixel
+    blocks. Within a block, the full-resolution difference is at least the
+    difference of the block averages (averaging only cancels differences) and at
+    most that plus half the value range of each frame's block (``block_spread``);
+    pixels left outside whole blocks may differ by anything. A pair keeps its
+    coarse difference only when these bounds put the full-resolution one on the
+    same side of ``FLAG_THRESHOLD``, and is refined otherwise, so flags always
+    match the full-resolution path. Noisy frames, such as raw bytes viewed as
+    frames, have wide blocks and are refined throughout.
+
+    Setting ``refine_margin`` trades that guarantee for a cheaper pass: block
+    spreads are not computed, and only pairs whose coarse difference lies within
+    ``refine_margin`` below the threshold are refined. Averaging only cancels
+    differences, so flagged pairs stay flagged, but a pair whose difference
+    averaging cancels by more than the margin (pixel noise) is missed.
+    """
+
+    level: int
+    refine_margin: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.level <= 0:
+            raise ValueError("level must be positive")
+        if self.refine_margin is not None and self.refine_margin < 0:
+            raise ValueError("refine_margin must not be negative")
+
+
+def analyze_frames(
+    frames: Iterable[NDArray[np.uint8]],
+    progress: ProgressCallback | None = None,
+    total: int | None = None,
+    max_map_points: int | None = None,
+    pyramid: PyramidConfig | None = None,
+) -> TemporalResult:
+    """Analyze temporal consistency using frame-to-frame differences.
+
+    ``frames`` is consumed incrementally and stacked by ``batch_frames`` into
+    equal-shaped batches; all consecutive differences within a batch come from one
+    vectorized int16 pass into a reused buffer, and the last frame is carried over
+    to difference against the next batch. Memory is bounded by one batch, so a
+    generator such as ``iter_frames`` analyzes a video of any length.
+
+    Args:
+        frames: uint8 frames in playback order; any iterable.
+        progress: Called with ``(frames_processed, total)`` after each batch.
+        total: Frame count reported to ``progress``; defaults to ``len(frames)``
+            for sized inputs, otherwise to the count seen so far.
+        max_map_points: Bound on ``anomaly_map`` length. When more differences
+            are produced, adjacent buckets are merged pairwise (keeping the
+            maximum), so each point covers a power-of-two run of differences.
+            ``None`` keeps every difference.
+        pyramid: Difference block-averaged frames first and refine only pairs the
+            block statistics leave undecided; see ``PyramidConfig``. Unrefined pairs contribute
+            their coarse difference to the score and ``anomaly_map``. ``None``
+            differences every pair at full resolution.
+
+    Returns:
+        The temporal score, flagged frame indices, and the anomaly map.
+    """
+    summary = _Summary(max_map_points)
+    if total is None and isinstance(frames, Sized):
+        total = len(frames)
+    for count, diffs in _frame_differences(frames, pyramid):
+        summary.add(count, diffs)
+        if progress is not None and summary.frames > 1:
+            progress(summary.frames, max(total or 0, summary.frames))
+    return summary.result()
+
+
+def analyze_frames_parallel(
+    frames: Iterable[NDArray[np.uint8]],
+    workers: int,
+    progress: ProgressCallback | None = None,
+    total: int | None = None,
+    max_map_points: int | None = None,
+    shard_bytes: int = TEMPORAL_SHARD_BYTES,
+    pyramid: PyramidConfig | None = None,
+) -> TemporalResult:
+    """Analyze temporal consistency with frame differences spread over worker processes.
+
+    Frames are read in rounds of up to ``workers`` shards of about ``shard_bytes``
+    each. A round is copied once into a ``multiprocessing.shared_memory`` block and
+    every worker attaches to it and differences its shard, so no pixel data is
+    pickled. Consecutive shards overlap by one frame, so the pair spanning a shard
+    boundary is differenced too, and the workers' differences are merged in
+    playback order through the same accumulator as ``analyze_frames``: the result
+    is identical to the serial path. Memory is bounded by one round.
+
+    Args:
+        frames: uint8 frames in playback order; any iterable.
+        workers: Worker processes; ``1`` runs ``analyze_frames`` in-process.
+        progress: Called with ``(frames_processed, total)`` after each shard.
+        total: See ``analyze_frames``.
+        max_map_points: See ``analyze_frames``.
+        shard_bytes: Approximate frame bytes per shard (at least two frames).
+        pyramid: See ``analyze_frames``.
+
+    Returns:
+        The temporal score, flagged frame indices, and the anomaly map.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if workers == 1:
+        return analyze_frames(frames, progress, total, max_map_points, pyramid)
+    summary = _Summary(max_map_points)
+    if total is None and isinstance(frames, Sized):
+        total = len(frames)
+    executor = get_shard_executor(workers)
+    iterator = iter(frames)
+    carry: NDArray[np.uint8] | None = None
+    block: shared_memory.SharedMemory | None = None
+    try:
+        while shards := _read_round(iterator, carry, workers, shard_bytes):
+            needed = sum(frame.nbytes for shard in shards for frame in shard)
+            if block is None or block.size < needed:
+                _release_block(block)
+                block = shared_memory.SharedMemory(create=True, size=max(1, needed))
+            futures = [
+                executor.submit(_shard_differences, block.name, layout, pyramid)
+                for layout in _pack_round(block, shards)
+            ]
+            for index, (shard, future) in enumerate(zip(shards, futures, strict=True)):
+                overlap = 1 if carry is not None or index > 0 else 0
+                summary.add(len(shard) - overlap, future.result())
+                if progress is not None and summary.frames > 1:
+                    progress(summary.frames, max(total or 0, summary.frames))
+            carry = shards[-1][-1]
+    finally:
+        _release_block(block)
+    return summary.result()
+
+
+def _frame_differences(
+    frames: Iterable[NDArray[np.uint8]], pyramid: PyramidConfig | None = None
+) -> Iterator[tuple[int, list[float]]]:
+    """Yield ``(frames_in_batch, differences)`` for each batch of ``frames``.
+
+    The first batch yields one difference fewer than it has frames; every later
+    batch also includes the difference against the previous batch's last frame.
+    With ``pyramid``, differences come from ``_coarse_differences`` and only pairs
+    that ``_coarse_decides`` leaves open are recomputed at full resolution.
+    """
+    carry: NDArray[np.uint8] | None = None
+    carry_coarse: _Coarse | None = None
+    scratch: NDArray[np.int16] | None = None
+    refined = pairs = 0
+    for batch in batch_frames(frames, TEMPORAL_BATCH_FRAMES, TEMPORAL_BATCH_BYTES):
+        if pyramid is None:
+            if scratch is None or scratch.shape[1:] != batch.shape[1:] or len(scratch) < len(batch):
+                scratch = np.empty(batch.shape, dtype=np.int16)
+            diffs = _batch_differences(carry, batch, scratch).tolist()
+        else:
+            factor = 2**pyramid.level
+            exact = pyramid.refine_margin is None
+            coarse = (
+                block_average(batch, factor),
+                block_spread(batch, factor) if exact else None,
+            )
+            coarse_diffs, bounds = _coarse_differences(carry_coarse, coarse)
+            diffs = coarse_diffs.tolist()
+            offset = 0 if carry is None else 1
+            for index, (diff, bound) in enumerate(zip(diffs, bounds.tolist(), strict=True)):
+                later = index + 1 - offset
+                earlier = batch[later - 1] if later > 0 else carry
+                assert earlier is not None  # noqa: S101 - index 0 has a carry when offset is 1
+                if not _coarse_decides(
+                    earlier, batch[later], factor, diff, bound, pyramid.refine_margin
+                ):
+                    diffs[index] = _pair_difference(earlier, batch[later])
+                    refined += 1
+            pairs += len(diffs)
+            carry_coarse = (coarse[0][-1], None if coarse[1] is None else coarse[1][-1])
+        yield len(batch), diffs
+        # Single-frame batches are views of the frame itself; a view into a stacked
+        # batch would keep the whole batch alive until the next one.
+        carry = batch[-1].copy() if len(batch) > 1 else batch[-1]
+    if pyramid is not None:
+        logger.debug("Refined %d of %d frame pairs at full resolution", refined, pairs)
+
+
+def _batch_differences(
+    carry: NDArray[np.uint8] | None, batch: NDArray[np.uint8], scratch: NDArray[np.int16]
+) -> NDArray[np.float64]:
+    """Mean absolute differences of consecutive frames, starting from ``carry``.
+
+    Differences are widened to int16 in ``scratch`` and reduced with exact integer
+    sums; the one against the carried frame is cropped to the common shape, as
+    frames of different sizes may meet at a batch boundary.
+    """
+    offset = 0 if carry is None else 1
+    count = len(batch) - 1
+    diffs = np.empty(count + offset, dtype=np.float64)
+    if carry is not None:
+        rows = min(carry.shape[0], batch.shape[1])
+        cols = min(carry.shape[1], batch.shape[2])
+        boundary = scratch[0, :rows, :cols]
+        np.subtract(carry[:rows, :cols], batch[0, :rows, :cols], out=boundary, dtype=np.int16)
+        np.abs(boundary, out=boundary)
+        diffs[0] = boundary.sum(dtype=np.int64) / max(1, boundary.size)
+    if count:
+        inner = scratch[:count]
+        np.subtract(batch[1:], batch[:-1], out=inner, dtype=np.int16)
+        np.abs(inner, out=inner)
+        pixels = max(1, inner[0].size)
+        diffs[offset:] = inner.reshape(count, -1).sum(axis=1, dtype=np.int64) / pixels
+    return diffs
+
+
+_Coarse = tuple[NDArray[np.float32], NDArray[np.float32] | None]
+"""Block averages and ``block_spread`` (``None`` with a refine margin) of one frame or a stack."""
+
+
+def _coarse_differences(
+    carry: _Coarse | None, coarse: _Coarse
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Coarse differences of consecutive frames and upper bounds on the full ones.
+
+    Laid out like ``_batch_differences``. The first array holds the mean absolute
+    differences of block averages; the second adds each pair's mean block spread,
+    which bounds the full-resolution difference over the same blocks, and is NaN
+    when spreads were not computed. Frames too
+    small to hold one block yield NaN, which ``_coarse_decides`` never accepts.
+    Block averages and spreads are exact multiples of a power of two, so these
+    sums are exact and do not depend on how frames were batched.
+    """
+    means, spreads = coarse
+    offset = 0 if carry is None else 1
+    count = len(means) - 1
+    diffs = np.full(count + offset, np.nan, dtype=np.float64)
+    bounds = np.full(count + offset, np.nan, dtype=np.float64)
+    if carry is not None:
+        carry_means, carry_spreads = carry
+        rows = min(carry_means.shape[0], means.shape[1])
+        cols = min(carry_means.shape[1], means.shape[2])
+        if rows and cols:
+            boundary = np.abs(carry_means[:rows, :cols] - means[0, :rows, :cols])
+            diffs[0] = boundary.mean(dtype=np.float64)
+            if carry_spreads is not None and spreads is not None:
+                spread = carry_spreads[:rows, :cols] + spreads[0, :rows, :cols]
+                bounds[0] = diffs[0] + spread.mean(dtype=np.float64)
+    if count and means[0].size:
+        inner = np.abs(np.diff(means, axis=0)).reshape(count, -1)
+        diffs[offset:] = inner.mean(axis=1, dtype=np.float64)
+        if spreads is not None:
+            spread = (spreads[1:] + spreads[:-1]).reshape(count, -1)
+            bounds[offset:] = diffs[offset:] + spread.mean(axis=1, dtype=np.float64)
+    return diffs, bounds
+
+
+def _coarse_decides(
+    earlier: NDArray[np.uint8],
+    later: NDArray[np.uint8],
+    factor: int,
+    diff: float,
+    bound: float,
+    refine_margin: float | None = None,
+) -> bool:
+    """Whether a pair's coarse ``diff`` flags it exactly as its full difference would.
+
+    The full difference averages the share of common pixels covered by whole
+    blocks, where it lies between ``diff`` and ``bound``, with the rest, where it
+    lies between 0 and 255. With ``refine_margin``, ``bound`` is ignored and only
+    differences within the margin below ``FLAG_THRESHOLD`` are left open.
+    """
+    if refine_margin is not None:
+        # NaN (no whole block) fails both comparisons.
+        return diff > FLAG_THRESHOLD or diff < FLAG_THRESHOLD - refine_margin
+    rows = min(earlier.shape[0], later.shape[0])
+    cols = min(earlier.shape[1], later.shape[1])
+    covered = (rows - rows % factor) * (cols - cols % factor) / max(1, rows * cols)
+    lowest = diff * covered
+    highest = bound * covered + 255.0 * (1.0 - covered)
+    # NaN (no whole block) fails both comparisons.
+    return (
+        lowest > FLAG_THRESHOLD + PYRAMID_BOUND_SLACK
+        or highest < FLAG_THRESHOLD - PYRAMID_BOUND_SLACK
     )
+
+
+def _pair_difference(earlier: NDArray[np.uint8], later: NDArray[np.uint8]) -> float:
+    """Full-resolution mean absolute difference of two frames over their common shape."""
+    rows = min(earlier.shape[0], later.shape[0])
+    cols = min(earlier.shape[1], later.shape[1])
+    diff = np.subtract(earlier[:rows, :cols], later[:rows, :cols], dtype=np.int16)
+    return float(np.abs(diff, out=diff).sum(dtype=np.int64) / max(1, diff.size))
+
+
+FrameLayout = list[tuple[int, int, int]]
+"""``(offset, rows, cols)`` of each frame of a shard inside a shared memory block."""
+
+
+def _read_round(
+    frames: Iterator[NDArray[np.uint8]],
+    carry: NDArray[np.uint8] | None,
+    workers: int,
+    shard_bytes: int,
+) -> list[list[NDArray[np.uint8]]]:
+    """Read up to ``workers`` shards, each starting with the previous shard's last frame."""
+    shards: list[list[NDArray[np.uint8]]] = []
+    while len(shards) < workers:
+        shard = [] if carry is None else [carry]
+        size = sum(frame.nbytes for frame in shard)
+        for frame in frames:
+            shard.append(frame)
+            size += frame.nbytes
+            if len(shard) > 1 and size >= shard_bytes:
+                break
+        if len(shard) <= (0 if carry is None else 1):
+            break
+        shards.append(shard)
+        carry = shard[-1]
+    return shards
+
+
+def _pack_round(
+    block: shared_memory.SharedMemory, shards: list[list[NDArray[np.uint8]]]
+) -> list[FrameLayout]:
+    """Copy the frames of a round into ``block`` and return each shard's layout."""
+    layouts: list[FrameLayout] = []
+    target = np.frombuffer(block.buf, dtype=np.uint8)
+    offset = 0
+    for shard in shards:
+        layout: FrameLayout = []
+        for frame in shard:
+            rows, cols = frame.shape
+            target[offset : offset + frame.size] = frame.reshape(-1)
+            layout.append((offset, rows, cols))
+            offset += frame.size
+        layouts.append(layout)
+    return layouts
+
+
+def _shard_differences(
+    name: str, layout: FrameLayout, pyramid: PyramidConfig | None = None
+) -> list[float]:
+    """Worker entry point: difference the frames of one shard in shared memory."""
+    pixels = np.frombuffer(_attach_block(name).buf, dtype=np.uint8)
+    frames = [
+        pixels[offset : offset + rows * cols].reshape(rows, cols) for offset, rows, cols in layout
+    ]
+    return [diff for _, batch in _frame_differences(frames, pyramid) for diff in batch]
+
+
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """Map the block ``name`` in this worker, keeping only the latest mapping.
+
+    Every round of one analysis reuses the same block, so keeping it mapped means
+    its pages are faulted in once per worker rather than once per shard. An idle
+    worker holds the last block until the next analysis replaces it.
+    """
+    if name not in _attached:
+        for stale in _attached.values():
+            stale.close()
+        _attached.clear()
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return _attached[name]
+
+
+def _release_block(block: shared_memory.SharedMemory | None) -> None:
+    if block is not None:
+        block.close()
+        block.unlink()
+
+
+class _Summary:
+    """Running score inputs, flags, and anomaly map over differences in playback order.
+
+    Differences are accumulated one at a time, so the result does not depend on how
+    they were grouped into batches or shards.
+    """
+
+    def __init__(self, max_map_points: int | None) -> None:
+        if max_map_points is not None and max_map_points <= 0:
+            raise ValueError("max_map_points must be positive")
+        self.anomaly_map = _AnomalyMap(max_map_points)
+        self.flagged: list[int] = []
+        self.diff_sum = 0.0
+        self.pairs = 0
+        self.frames = 0
+
+    def add(self, frames: int, diffs: list[float]) -> None:
+        """Account for ``frames`` more frames and their differences."""
+        for diff in diffs:
+            self.pairs += 1
+            self.diff_sum += diff
+            if diff > FLAG_THRESHOLD:
+                self.flagged.append(self.pairs)
+        self.anomaly_map.extend(diffs)
+        self.frames += frames
+
+    def result(self) -> TemporalResult:
+        if not self.frames:
+            return TemporalResult(temporal_score=0.0, flagged_frames=[], anomaly_map=[])
+        avg_anomaly = self.diff_sum / self.pairs if self.pairs else 0.0
+        temporal_score = float(max(0.0, 100.0 - avg_anomaly))
+        logger.info("Temporal analysis complete with score %.2f", temporal_score)
+        return TemporalResult(
+            temporal_score=temporal_score,
+            flagged_frames=self.flagged,
+            anomaly_map=self.anomaly_map.points,
+        )
+
+
+class _AnomalyMap:
+    """Frame differences, decimated by pairwise max-merging beyond ``max_points``."""
+
+    def __init__(self, max_points: int | None) -> None:
+        self.max_points = max_points
+        self._points: list[float] = []
+        self._bucket = 1
+        self._pending_max = 0.0
+        self._pending_count = 0
+
+    def extend(self, diffs: list[float]) -> None:
+        if self.max_points is None:
+            self._points.extend(diffs)
+            return
+        for diff in diffs:
+            self.add(diff)
+
+    def add(self, diff: float) -> None:
+        self._pending_max = diff if self._pending_count == 0 else max(self._pending_max, diff)
+        self._pending_count += 1
+        if self._pending_count < self._bucket:
+            return
+        self._points.append(self._pending_max)
+        self._pending_count = 0
+        if self.max_points is not None and len(self._points) >= self.max_points:
+            merged = self._points
+            if len(merged) % 2:
+                # The odd bucket becomes the start of the first wider bucket.
+                self._pending_max, self._pending_count = merged.pop(), self._bucket
+            self._points = [max(merged[i], merged[i + 1]) for i in range(0, len(merged), 2)]
+            self._bucket *= 2
+
+    @property
+    def points(self) -> list[float]:
+        if self._pending_count:
+            return [*self._points, self._pending_max]
+        return list(self._points)
+
+
+def analyze_media_frames(
+    media: MediaContext,
+    fps: int = 5,
+    progress: ProgressCallback | None = None,
+    max_map_points: int | None = None,
+    workers: int = 1,
+    frame_budget: int | None = None,
+    pyramid: PyramidConfig | None = None,
+) -> TemporalResult:
+    """Stream the frames of a media context sampled at ``fps`` through the temporal engine.
+
+    With ``workers`` above one, frames are differenced by ``analyze_frames_parallel``;
+    ``pyramid`` enables coarse-to-fine differencing (see ``PyramidConfig``).
+    When there are more than ``frame_budget`` frames, only the positions chosen by
+    ``plan_frame_samples`` are analyzed, reserving pairs whose thumbnails differ by
+    more than ``CUT_PROBE_MARGIN`` of the flag threshold; ``flagged_frames`` still refers to
+    positions among all frames at ``fps`` and ``sampled_frames`` lists the analyzed
+    ones, each ``anomaly_map`` point being the difference between neighbours there.
+    """
+    total = media.frame_count(fps)
+    if frame_budget is None or total <= frame_budget:
+        return analyze_frames_parallel(
+            media.iter_frames(fps),
+            workers,
+            progress=progress,
+            total=total,
+            max_map_points=max_map_points,
+            pyramid=pyramid,
+        )
+    positions = plan_frame_samples(
+        media.iter_frames(fps), frame_budget, keep_above=FLAG_THRESHOLD * CUT_PROBE_MARGIN
+    )
+    result = analyze_frames_parallel(
+        select_frames(media.iter_frames(fps), positions),
+        workers,
+        progress=progress,
+        total=len(positions),
+        max_map_points=max_map_points,
+        pyramid=pyramid,
+    )
+    result.flagged_frames = [positions[index] for index in result.flagged_frames]
+    result.sampled_frames = positions
+    return result
+
+
+def warm_up() -> None:
+    """Run the frame-difference path once on tiny frames."""
+    analyze_frames([np.zeros((8, 8), dtype=np.uint8), np.ones((8, 8), dtype=np.uint8)])
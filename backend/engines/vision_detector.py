@@ -2,57 +2,254 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from io import BytesIO
 
 import numpy as np
 from numpy.typing import NDArray
 from PIL import Image
 
-from backend.utils.heatmap import generate_mock_heatmap
+from backend.utils.heatmap import HeatmapHandle
 from backend.utils.logger import get_logger
-from backend.utils.preprocess import normalize_image
+from backend.utils.media import Box, MediaContext
 
 logger = get_logger(__name__)
 
+MAX_FACES_PER_IMAGE = 8
+
+
+@dataclass
+class FaceScore:
+    """Vision score of one detected face."""
+
+    box: Box
+    vision_score: float
+    details: dict[str, float]
+
 
 @dataclass
 class VisionResult:
-    """Result of vision detector."""
+    """Result of vision detector.
+
+    For multi-face analysis ``vision_score``, ``details`` and ``artifact_heatmap``
+    describe the most suspicious face and ``faces`` lists every face scored.
+    """
 
     vision_score: float
-    artifact_heatmap: NDArray[np.float_]
+    artifact_heatmap: HeatmapHandle
     details: dict[str, float]
+    faces: list[FaceScore] = field(default_factory=list)
+    faces_detected: int = 0
 
 
-def _compute_texture_score(image_array: NDArray[np.float32]) -> float:
-    """Compute a mock skin texture anomaly score based on local variance."""
-    variance = float(np.var(image_array))
-    score = min(100.0, variance * 1000)
-    logger.debug("Texture variance %.4f -> score %.2f", variance, score)
-    return score
+STATS_BLOCK_ELEMENTS = 1 << 16
+"""uint8 elements histogrammed per block; keeps the index buffer cache-resident."""
 
+_HISTOGRAM_BINS = 1 << 16
+_VALUES = np.arange(256, dtype=np.int64)
+_SQUARES = _VALUES**2
 
-def _compute_lighting_score(image_array: NDArray[np.float32]) -> float:
-    """Compute simple lighting consistency score using channel balance."""
-    channel_means = np.mean(image_array, axis=(0, 1))
-    balance = float(np.std(channel_means))
-    score = max(0.0, 100.0 - balance * 300)
-    logger.debug("Lighting balance %.4f -> score %.2f", balance, score)
-    return score
 
+@dataclass
+class PixelStats:
+    """Per-image statistics of a uint8 stack, expressed on the [0, 1] scale."""
 
-def analyze_image(image: Image.Image) -> VisionResult:
-    """Analyze an image for deepfake artifacts using lightweight heuristics."""
-    array = normalize_image(image)
-    texture_score = _compute_texture_score(array)
-    lighting_score = _compute_lighting_score(array)
-    vision_score = float(np.clip((texture_score * 0.6 + lighting_score * 0.4), 0, 100))
-    heatmap = generate_mock_heatmap(*image.size)
-    details = {
+    variances: NDArray[np.float64]
+    means: NDArray[np.float64]
+    channel_means: NDArray[np.float64]
+
+
+def compute_pixel_stats(
+    batch: NDArray[np.uint8], pixel_counts: NDArray[np.int64] | None = None
+) -> PixelStats:
+    """Compute variance, mean, and per-channel means of each image in one pass.
+
+    Blocks of the uint8 buffer are histogrammed jointly over (image, channel, value)
+    with a single ``bincount`` each. Channel sums and sums of squares then follow
+    exactly from the integer counts (squares via a 256-entry table), so no float
+    copy of the pixels is ever made.
+
+    Args:
+        batch: Images shaped (N, H, W, C) or (N, H, W).
+        pixel_counts: Real pixels of each image when the rest of its slot is zero
+            padding (see ``pad_face_crops``). The padding is taken back out of the
+            zero bin, so the statistics are exactly those of the unpadded images.
+
+    Returns:
+        Statistics with one row per image; empty images yield zeros.
+    """
+    if batch.ndim not in (3, 4):
+        raise ValueError("batch must have shape (N, H, W[, C])")
+    channels = batch.shape[3] if batch.ndim == 4 else 1
+    count = batch.shape[0]
+    flat = batch.reshape(count, -1)
+    elements = flat.shape[1]
+    span = channels * 256
+    if span > _HISTOGRAM_BINS:
+        raise ValueError("too many channels")
+    histogram = np.zeros(count * span, dtype=np.int64)
+    if elements:
+        # Small images are grouped per block, large ones split along their pixels;
+        # blocks hold whole pixels so an element's channel is its index mod C.
+        items_step = max(1, min(_HISTOGRAM_BINS // span, STATS_BLOCK_ELEMENTS // elements))
+        element_step = min(elements, max(channels, STATS_BLOCK_ELEMENTS // channels * channels))
+        index = np.arange(items_step * element_step)
+        offsets = ((index // element_step * channels + index % channels) * 256).astype(np.uint16)
+        buffer = np.empty_like(offsets)
+        for first in range(0, count, items_step):
+            rows = flat[first : first + items_step]
+            bins = len(rows) * span
+            for start in range(0, elements, element_step):
+                values = rows[:, start : start + element_step].reshape(-1)
+                indices = np.add(values, offsets[: values.size], out=buffer[: values.size])
+                histogram[first * span : first * span + bins] += np.bincount(
+                    indices, minlength=bins
+                )
+    counts = histogram.reshape(count, channels, 256)
+    pixels = np.full(count, elements // channels, dtype=np.int64)
+    if pixel_counts is not None:
+        counts[:, :, 0] -= (pixels - pixel_counts)[:, np.newaxis]
+        pixels = pixel_counts
+    channel_sums = counts @ _VALUES
+    square_sums = (counts @ _SQUARES).sum(axis=1)
+    size = np.maximum(1, pixels * channels)
+    means = channel_sums.sum(axis=1) / size
+    variances = np.maximum(square_sums / size - means**2, 0.0)
+    return PixelStats(
+        variances=variances / 255.0**2,
+        means=means / 255.0,
+        channel_means=channel_sums / (np.maximum(1, pixels)[:, np.newaxis] * 255.0),
+    )
+
+
+def _compute_texture_scores(stats: PixelStats) -> NDArray[np.float64]:
+    """Texture anomaly scores from the global variance of each crop."""
+    scores: NDArray[np.float64] = np.minimum(100.0, stats.variances * 1000)
+    return scores
+
+
+def _compute_lighting_scores(stats: PixelStats) -> NDArray[np.float64]:
+    """Lighting consistency scores from per-crop channel balance."""
+    balance = np.std(stats.channel_means, axis=1)
+    scores: NDArray[np.float64] = np.maximum(0.0, 100.0 - balance * 300)
+    return scores
+
+
+def _vision_score(texture_score: float, lighting_score: float) -> float:
+    return float(np.clip((texture_score * 0.6 + lighting_score * 0.4), 0, 100))
+
+
+def _details(texture_score: float, lighting_score: float, mean: float) -> dict[str, float]:
+    return {
         "texture_anomaly": texture_score,
         "lighting_consistency": lighting_score,
         "skin_texture_anomaly": max(0.0, 100 - texture_score / 2),
-        "gan_fingerprint": float(np.mean(array) * 50),
+        "gan_fingerprint": mean * 50,
     }
+
+
+def _analyze_pixels(pixels: NDArray[np.uint8], size: tuple[int, int]) -> VisionResult:
+    stats = compute_pixel_stats(pixels[np.newaxis])
+    texture_score = float(_compute_texture_scores(stats)[0])
+    lighting_score = float(_compute_lighting_scores(stats)[0])
+    logger.debug("Texture score %.2f, lighting score %.2f", texture_score, lighting_score)
+    vision_score = _vision_score(texture_score, lighting_score)
+    heatmap = HeatmapHandle(*size)
+    details = _details(texture_score, lighting_score, float(stats.means[0]))
     logger.info("Vision analysis complete with score %.2f", vision_score)
     return VisionResult(vision_score=vision_score, artifact_heatmap=heatmap, details=details)
+
+
+def analyze_image(image: Image.Image) -> VisionResult:
+    """Analyze an image for deepfake artifacts using lightweight heuristics."""
+    return _analyze_pixels(np.asarray(image), image.size)
+
+
+def analyze_media_vision(media: MediaContext, max_faces: int = MAX_FACES_PER_IMAGE) -> VisionResult:
+    """Score every detected face of a media context at its native resolution.
+
+    Up to ``max_faces`` crops are zero-padded into one stack and scored in a
+    single vectorized pass; the padding is excluded from the statistics, so each
+    face scores exactly as ``analyze_image`` would score its crop. The image score
+    is the maximum over faces, so one manipulated face in a group photo is enough
+    to raise it.
+    """
+    batch = media.face_batch(max_faces)
+    results = analyze_image_batch(batch.pixels, batch.sizes, padded=True)
+    faces = [
+        FaceScore(box=box, vision_score=result.vision_score, details=result.details)
+        for box, result in zip(batch.boxes, results, strict=True)
+    ]
+    worst = max(results, key=lambda result: result.vision_score)
+    logger.info(
+        "Scored %d of %d faces; aggregate vision score %.2f",
+        len(faces),
+        batch.detected,
+        worst.vision_score,
+    )
+    return VisionResult(
+        vision_score=worst.vision_score,
+        artifact_heatmap=worst.artifact_heatmap,
+        details=worst.details,
+        faces=faces,
+        faces_detected=batch.detected,
+    )
+
+
+def analyze_image_batch(
+    batch: NDArray[np.uint8], sizes: list[tuple[int, int]] | None = None, padded: bool = False
+) -> list[VisionResult]:
+    """Score a stack of uint8 crops (N, H, W, 3) in one vectorized pass.
+
+    Args:
+        batch: Stacked crops, e.g. from ``stack_face_crops`` or ``pad_face_crops``.
+        sizes: Original ``(width, height)`` of each crop, used for the heatmaps.
+            Defaults to the batch resolution.
+        padded: Each crop fills only the top-left ``sizes`` corner of its slot
+            and the rest is zeros, as from ``pad_face_crops``; crops are then
+            scored on their own pixels.
+
+    Returns:
+        One ``VisionResult`` per crop, in input order.
+    """
+    if batch.ndim != 4:
+        raise ValueError("batch must have shape (N, H, W, C)")
+    if sizes is not None and len(sizes) != len(batch):
+        raise ValueError("sizes must match the batch length")
+    if padded and sizes is None:
+        raise ValueError("padded batches need their crop sizes")
+    pixel_counts = (
+        np.array([width * height for width, height in sizes], dtype=np.int64)
+        if padded and sizes is not None
+        else None
+    )
+    stats = compute_pixel_stats(batch, pixel_counts)
+    texture_scores = _compute_texture_scores(stats)
+    lighting_scores = _compute_lighting_scores(stats)
+    means = stats.means
+    default_size = (batch.shape[2], batch.shape[1])
+    results = []
+    for idx in range(len(batch)):
+        texture_score = float(texture_scores[idx])
+        lighting_score = float(lighting_scores[idx])
+        size = sizes[idx] if sizes is not None else default_size
+        results.append(
+            VisionResult(
+                vision_score=_vision_score(texture_score, lighting_score),
+                artifact_heatmap=HeatmapHandle(*size),
+                details=_details(texture_score, lighting_score, float(means[idx])),
+            )
+        )
+    logger.info("Batch vision analysis complete for %d crops", len(results))
+    return results
+
+
+def warm_up() -> None:
+    """Exercise image decoding and the stacked scoring path once."""
+    buffer = BytesIO()
+    Image.new("RGB", (32, 32)).save(buffer, format="JPEG")
+    media = MediaContext(buffer.getvalue())
+    try:
+        analyze_media_vision(media, max_faces=2)
+    finally:
+        media.release()
@@ -2,24 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
-from backend.api import audio, image, multimodal, video
+from backend.api import audio, fusion, heatmaps, image, jobs, multimodal, reports, video
+from backend.api.engines import import_engines
+from backend.utils.cache import get_result_cache
+from backend.utils.config import get_settings
+from backend.utils.executor import shutdown_executor, warm_up_workers
+from backend.utils.heatmap_store import get_heatmap_store
 from backend.utils.logger import configure_logging, get_logger
+from backend.utils.report_store import get_report_store
 
 configure_logging()
 logger = get_logger(__name__)
 
-app = FastAPI(title="Deepfake Detection System", version="1.0.0")
+
+async def _warm_up(app: FastAPI) -> None:
+    """Spawn and warm up every executor worker, then import the engines locally too."""
+    started = time.perf_counter()
+    try:
+        get_result_cache()
+        get_report_store()
+        get_heatmap_store()
+        per_worker = list((await warm_up_workers()).values())
+        await asyncio.to_thread(import_engines)
+    except Exception:
+        logger.exception("Engine warm-up failed")
+        app.state.readiness = {"status": "failed"}
+        return
+    engines = {name: max(timings[name] for timings in per_worker) for name in per_worker[0]}
+    elapsed = (time.perf_counter() - started) * 1000
+    app.state.readiness = {"status": "ready", "warmup_ms": elapsed, "engines_ms": engines}
+    logger.info("Service ready after %.1f ms of warm-up", elapsed)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up engines in the background on startup; release workers on shutdown."""
+    warm_up: asyncio.Task[None] | None = None
+    if get_settings().warmup_enabled:
+        app.state.readiness = {"status": "warming_up"}
+        warm_up = asyncio.create_task(_warm_up(app))
+    else:
+        app.state.readiness = {"status": "ready", "warmup_ms": 0.0, "engines_ms": {}}
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warm_up
+    jobs.shutdown_job_queue()
+    shutdown_executor()
+
+
+app = FastAPI(title="Deepfake Detection System", version="1.0.0", lifespan=lifespan)
+app.state.readiness = {"status": "starting"}
 
 app.include_router(image.router)
 app.include_router(video.router)
 app.include_router(audio.router)
 app.include_router(multimodal.router)
+app.include_router(fusion.router)
+app.include_router(jobs.router)
+app.include_router(reports.router)
+app.include_router(heatmaps.router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -38,3 +94,17 @@ async def health() -> dict[str, str]:
     """Health check endpoint."""
     logger.info("Health check pinged")
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready() -> JSONResponse:
+    """Readiness probe: 200 once engine warm-up has finished, 503 before or if it failed."""
+    readiness: dict[str, Any] = app.state.readiness
+    status_code = 200 if readiness["status"] == "ready" else 503
+    return JSONResponse(readiness, status_code=status_code)
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict[str, int]:
+    """Result cache hit/miss counters for this worker process."""
+    return get_result_cache().snapshot()
@@ -0,0 +1,263 @@
+"""Content-addressed, two-tier cache for analysis results.
+
+Keys combine the SHA-256 of the upload bytes with the engine version and the
+analysis parameters. Values are JSON documents held in a per-process LRU with a
+memory budget and mirrored to an on-disk ``FileStore`` shared by every Uvicorn
+worker. Both tiers expire entries after a TTL. The async helpers only touch the
+memory tier on the event loop and run disk reads, writes, and sweeps in a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .config import get_settings
+from .file_store import FileStore, write_atomic
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+ENGINE_VERSION = "16"
+"""Bump whenever engine output changes so stale cached results stop matching."""
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one process."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class _CacheFiles(FileStore):
+    """Disk tier of ``ResultCache``: one JSON document per key."""
+
+    entry_noun = "cache entries"
+
+
+class ResultCache:
+    """In-process LRU in front of a shared on-disk JSON store.
+
+    The disk tier is off when ``directory`` is ``None``; otherwise the directory is
+    created on the first write, so a cache that never stores touches no files.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None,
+        memory_budget_bytes: int,
+        ttl_seconds: float,
+        sweep_every: int = 256,
+    ) -> None:
+        self.directory = directory
+        self.memory_budget_bytes = memory_budget_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_every = sweep_every
+        self._disk = (
+            _CacheFiles(directory, ttl_seconds, sweep_every) if directory is not None else None
+        )
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(namespace: str, digests: Sequence[str | None], params: dict[str, Any]) -> str:
+        """Derive a cache key from upload digests, engine version, and parameters."""
+        material = json.dumps(
+            [namespace, ENGINE_VERSION, list(digests), params], sort_keys=True, default=str
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get_memory(self, key: str) -> dict[str, Any] | None:
+        """Return the value if the memory tier holds it; a miss is not counted."""
+        with self._lock:
+            document = self._memory_document(key, time.time())
+        return self._decode(document) if document is not None else None
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached value, promoting disk hits into memory."""
+        now = time.time()
+        with self._lock:
+            document = self._memory_document(key, now)
+        if document is not None:
+            return self._decode(document)
+        stored = self._read_disk(key, now)
+        with self._lock:
+            if stored is None:
+                self.stats.misses += 1
+                return None
+            document, expires_at = stored
+            self.stats.disk_hits += 1
+            self._remember(key, document, expires_at)
+        return self._decode(document)
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        """Store ``value`` (JSON-serializable) in both tiers."""
+        document = json.dumps(value)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, document, expires_at)
+            self.stats.stores += 1
+        if self._disk is not None:
+            self._write_disk(key, document)
+            self._disk.count_write()
+
+    def snapshot(self) -> dict[str, int]:
+        """Return counters plus current memory-tier occupancy."""
+        with self._lock:
+            return {
+                **asdict(self.stats),
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+                "memory_budget_bytes": self.memory_budget_bytes,
+            }
+
+    def sweep(self) -> int:
+        """Delete expired disk entries; returns how many were removed."""
+        return self._disk.sweep() if self._disk is not None else 0
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def _memory_document(self, key: str, now: float) -> str | None:
+        """Return the live memory-tier document for ``key``; the caller holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, document = entry
+        if expires_at > now:
+            self._entries.move_to_end(key)
+            self.stats.memory_hits += 1
+            return document
+        self._drop(key)
+        self.stats.expirations += 1
+        return None
+
+    def _remember(self, key: str, document: str, expires_at: float) -> None:
+        if len(document) > self.memory_budget_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (expires_at, document)
+        self._memory_bytes += len(document)
+        while self._memory_bytes > self.memory_budget_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[1])
+
+    def _path(self, key: str) -> Path | None:
+        return self.directory / f"{key}.json" if self.directory is not None else None
+
+    def _read_disk(self, key: str, now: float) -> tuple[str, float] | None:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            expires_at = path.stat().st_mtime + self.ttl_seconds
+            if expires_at <= now:
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self.stats.expirations += 1
+                return None
+            return path.read_text(), expires_at
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, document: str) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            write_atomic(path, document.encode())
+        except OSError:
+            logger.warning("Unable to persist cache entry %s", key)
+
+    @staticmethod
+    def _decode(document: str) -> dict[str, Any]:
+        value: dict[str, Any] = json.loads(document)
+        return value
+
+
+_cache: ResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide cache configured from settings."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            settings = get_settings()
+            directory = settings.cache_dir if settings.cache_enabled else None
+            _cache = ResultCache(
+                Path(directory) if directory else None,
+                memory_budget_bytes=settings.cache_memory_bytes,
+                ttl_seconds=settings.cache_ttl_seconds,
+            )
+        return _cache
+
+
+async def cache_lookup(
+    namespace: str, digests: Sequence[str | None], params: dict[str, Any]
+) -> tuple[str, dict[str, Any] | None]:
+    """Return the cache key for the uploads and the cached value, if any.
+
+    Memory hits return on the event loop; the disk tier is read in a thread.
+    """
+    cache = get_result_cache()
+    key = cache.key(namespace, digests, params)
+    if not get_settings().cache_enabled:
+        return key, None
+    hit = cache.get_memory(key)
+    if hit is None:
+        hit = await asyncio.to_thread(cache.get, key)
+    return key, hit
+
+
+async def cache_store(key: str, value: dict[str, Any]) -> None:
+    """Store a computed result, in a thread, unless caching is disabled."""
+    if get_settings().cache_enabled:
+        await asyncio.to_thread(get_result_cache().put, key, value)
+
+
+async def cached_result(
+    namespace: str,
+    digests: Sequence[str | None],
+    params: dict[str, Any],
+    compute: Callable[[], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Return a cached result for the uploads, or compute and store it.
+
+    A hit returns before ``compute`` runs, so nothing is decoded.
+    """
+    key, hit = await cache_lookup(namespace, digests, params)
+    if hit is not None:
+        logger.info("Cache hit for %s analysis", namespace)
+        return hit
+    result = await compute()
+    await cache_store(key, result)
+    return result
@@ -0,0 +1,245 @@
+"""Runtime configuration loaded from ``DFS_*`` environment variables."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+ENV_PREFIX = "DFS_"
+EXECUTOR_KINDS = {"process", "thread"}
+MIB = 1024 * 1024
+
+DEFAULT_FUSION_WEIGHTS = (0.4, 0.2, 0.2, 0.2)
+"""Vision, temporal, audio, and metadata weights; ``FusionWeights`` defaults to them too."""
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(f"{ENV_PREFIX}{name}", default)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(f"{ENV_PREFIX}{name}")
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(f"{ENV_PREFIX}{name}")
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise ValueError(f"{ENV_PREFIX}{name} must be a number, got {raw!r}") from exc
+
+
+def _env_optional_float(name: str, default: float | None) -> float | None:
+    raw = os.environ.get(f"{ENV_PREFIX}{name}")
+    if raw is None or not raw.strip():
+        return default
+    return _env_float(name, 0.0)
+
+
+def _env_floats(name: str, default: tuple[float, ...]) -> tuple[float, ...]:
+    raw = os.environ.get(f"{ENV_PREFIX}{name}")
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return tuple(float(part) for part in raw.split(","))
+    except ValueError as exc:
+        raise ValueError(
+            f"{ENV_PREFIX}{name} must be comma-separated numbers, got {raw!r}"
+        ) from exc
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(f"{ENV_PREFIX}{name}")
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{ENV_PREFIX}{name} must be an integer, got {raw!r}") from exc
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Tunable knobs for the analysis service."""
+
+    executor_kind: str = "process"
+    executor_workers: int = 2
+    max_image_bytes: int = 50 * MIB
+    max_video_bytes: int = 2048 * MIB
+    max_audio_bytes: int = 512 * MIB
+    max_scores_bytes: int = 512 * MIB
+    upload_chunk_bytes: int = MIB
+    spool_threshold_bytes: int = 4 * MIB
+    spool_dir: str | None = None
+    max_analysis_side: int = 2048
+    batch_max_images: int = 64
+    batch_crop_side: int = 128
+    max_faces_per_image: int = 8
+    job_workers: int = 2
+    job_retention_seconds: int = 3600
+    job_lease_seconds: float = 60.0
+    job_dir: str = "logs/jobs"
+    cache_enabled: bool = True
+    cache_memory_bytes: int = 64 * MIB
+    cache_ttl_seconds: int = 3600
+    cache_dir: str | None = "logs/cache"
+    report_dir: str = "logs/reports"
+    report_retention_seconds: int = 86400
+    heatmap_dir: str = "logs/heatmaps"
+    heatmap_retention_seconds: int = 86400
+    image_branch_timeout_seconds: float = 30.0
+    video_branch_timeout_seconds: float = 120.0
+    audio_branch_timeout_seconds: float = 60.0
+    warmup_enabled: bool = True
+    temporal_workers: int = 1
+    video_frame_budget: int = 16
+    temporal_pyramid_level: int = 0
+    temporal_refine_margin: float | None = None
+    fusion_weights: tuple[float, ...] = DEFAULT_FUSION_WEIGHTS
+
+    def __post_init__(self) -> None:
+        if self.executor_kind not in EXECUTOR_KINDS:
+            raise ValueError(f"executor_kind must be one of {sorted(EXECUTOR_KINDS)}")
+        for name in (
+            "executor_workers",
+            "max_image_bytes",
+            "max_video_bytes",
+            "max_audio_bytes",
+            "max_scores_bytes",
+            "upload_chunk_bytes",
+            "batch_max_images",
+            "batch_crop_side",
+            "max_faces_per_image",
+            "job_workers",
+            "job_retention_seconds",
+            "job_lease_seconds",
+            "cache_ttl_seconds",
+            "report_retention_seconds",
+            "heatmap_retention_seconds",
+            "image_branch_timeout_seconds",
+            "video_branch_timeout_seconds",
+            "audio_branch_timeout_seconds",
+            "temporal_workers",
+            "video_frame_budget",
+        ):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be positive")
+        if self.spool_threshold_bytes < 0:
+            raise ValueError("spool_threshold_bytes must not be negative")
+        if self.cache_memory_bytes < 0:
+            raise ValueError("cache_memory_bytes must not be negative")
+        if self.max_analysis_side < 0:
+            raise ValueError("max_analysis_side must not be negative")
+        if self.temporal_pyramid_level < 0:
+            raise ValueError("temporal_pyramid_level must not be negative")
+        if self.temporal_refine_margin is not None and self.temporal_refine_margin < 0:
+            raise ValueError("temporal_refine_margin must not be negative")
+        if len(self.fusion_weights) != 4 or min(self.fusion_weights) < 0:
+            raise ValueError("fusion_weights must be four non-negative numbers")
+        if sum(self.fusion_weights) <= 0:
+            raise ValueError("fusion_weights must not all be zero")
+
+    def max_upload_bytes(self, modality: str) -> int:
+        """Return the upload size limit for ``image``, ``video``, ``audio``, or ``scores``."""
+        limits = {
+            "image": self.max_image_bytes,
+            "video": self.max_video_bytes,
+            "audio": self.max_audio_bytes,
+            "scores": self.max_scores_bytes,
+        }
+        if modality not in limits:
+            raise ValueError(f"Unknown modality: {modality}")
+        return limits[modality]
+
+    def branch_timeout(self, modality: str) -> float:
+        """Return the multimodal analysis deadline in seconds for one modality."""
+        timeouts = {
+            "image": self.image_branch_timeout_seconds,
+            "video": self.video_branch_timeout_seconds,
+            "audio": self.audio_branch_timeout_seconds,
+        }
+        if modality not in timeouts:
+            raise ValueError(f"Unknown modality: {modality}")
+        return timeouts[modality]
+
+    @classmethod
+    def from_env(cls) -> Settings:
+        """Build settings from the environment, falling back to defaults.
+
+        Returns:
+            Validated settings instance.
+        """
+        defaults = cls()
+        return cls(
+            executor_kind=_env_str("EXECUTOR_KIND", defaults.executor_kind).lower(),
+            executor_workers=_env_int(
+                "EXECUTOR_WORKERS", min(4, os.cpu_count() or defaults.executor_workers)
+            ),
+            max_image_bytes=_env_int("MAX_IMAGE_BYTES", defaults.max_image_bytes),
+            max_video_bytes=_env_int("MAX_VIDEO_BYTES", defaults.max_video_bytes),
+            max_audio_bytes=_env_int("MAX_AUDIO_BYTES", defaults.max_audio_bytes),
+            max_scores_bytes=_env_int("MAX_SCORES_BYTES", defaults.max_scores_bytes),
+            upload_chunk_bytes=_env_int("UPLOAD_CHUNK_BYTES", defaults.upload_chunk_bytes),
+            spool_threshold_bytes=_env_int("SPOOL_THRESHOLD_BYTES", defaults.spool_threshold_bytes),
+            spool_dir=_env_str("SPOOL_DIR", "") or None,
+            max_analysis_side=_env_int("MAX_ANALYSIS_SIDE", defaults.max_analysis_side),
+            batch_max_images=_env_int("BATCH_MAX_IMAGES", defaults.batch_max_images),
+            batch_crop_side=_env_int("BATCH_CROP_SIDE", defaults.batch_crop_side),
+            max_faces_per_image=_env_int("MAX_FACES_PER_IMAGE", defaults.max_faces_per_image),
+            job_workers=_env_int("JOB_WORKERS", defaults.job_workers),
+            job_retention_seconds=_env_int("JOB_RETENTION_SECONDS", defaults.job_retention_seconds),
+            job_lease_seconds=_env_float("JOB_LEASE_SECONDS", defaults.job_lease_seconds),
+            job_dir=_env_str("JOB_DIR", defaults.job_dir),
+            cache_enabled=_env_bool("CACHE_ENABLED", defaults.cache_enabled),
+            cache_memory_bytes=_env_int("CACHE_MEMORY_BYTES", defaults.cache_memory_bytes),
+            cache_ttl_seconds=_env_int("CACHE_TTL_SECONDS", defaults.cache_ttl_seconds),
+            cache_dir=_env_str("CACHE_DIR", defaults.cache_dir or "") or None,
+            report_dir=_env_str("REPORT_DIR", defaults.report_dir),
+            report_retention_seconds=_env_int(
+                "REPORT_RETENTION_SECONDS", defaults.report_retention_seconds
+            ),
+            heatmap_dir=_env_str("HEATMAP_DIR", defaults.heatmap_dir),
+            heatmap_retention_seconds=_env_int(
+                "HEATMAP_RETENTION_SECONDS", defaults.heatmap_retention_seconds
+            ),
+            image_branch_timeout_seconds=_env_float(
+                "IMAGE_BRANCH_TIMEOUT_SECONDS", defaults.image_branch_timeout_seconds
+            ),
+            video_branch_timeout_seconds=_env_float(
+                "VIDEO_BRANCH_TIMEOUT_SECONDS", defaults.video_branch_timeout_seconds
+            ),
+            audio_branch_timeout_seconds=_env_float(
+                "AUDIO_BRANCH_TIMEOUT_SECONDS", defaults.audio_branch_timeout_seconds
+            ),
+            warmup_enabled=_env_bool("WARMUP_ENABLED", defaults.warmup_enabled),
+            temporal_workers=_env_int("TEMPORAL_WORKERS", defaults.temporal_workers),
+            video_frame_budget=_env_int("VIDEO_FRAME_BUDGET", defaults.video_frame_budget),
+            temporal_pyramid_level=_env_int(
+                "TEMPORAL_PYRAMID_LEVEL", defaults.temporal_pyramid_level
+            ),
+            temporal_refine_margin=_env_optional_float(
+                "TEMPORAL_REFINE_MARGIN", defaults.temporal_refine_margin
+            ),
+            fusion_weights=_env_floats("FUSION_WEIGHTS", defaults.fusion_weights),
+        )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use.
+
+    Call ``get_settings.cache_clear()`` after changing the environment to reload.
+    """
+    settings = Settings.from_env()
+    logger.info("Loaded settings: %s", settings)
+    return settings
@@ -0,0 +1,167 @@
+"""Executor layer that keeps CPU-bound analysis off the asyncio event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import multiprocessing.synchronize
+import multiprocessing.util
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from .config import Settings, get_settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
+WorkerBarrier = threading.Barrier | multiprocessing.synchronize.Barrier
+
+WORKER_START_TIMEOUT_SECONDS = 300.0
+"""How long ``warm_up_workers`` waits for every worker to start and warm up."""
+
+_executor: Executor | None = None
+_worker_barrier: WorkerBarrier | None = None
+_shard_executors: dict[int, ProcessPoolExecutor] = {}
+_lock = threading.Lock()
+_worker = threading.local()
+"""State of the executor worker running in this thread, set by its initializer."""
+
+
+def _initialize_worker(barrier: WorkerBarrier, warm_up: bool) -> None:
+    """Run the engine warm-up hooks in a new worker before it accepts any task."""
+    _worker.barrier = barrier
+    _worker.warm_up_ms = {}
+    if warm_up:
+        from backend.engines.registry import warm_up_engines
+
+        _worker.warm_up_ms = warm_up_engines()
+
+
+def _create_executor(settings: Settings) -> tuple[Executor, WorkerBarrier]:
+    workers = settings.executor_workers
+    if settings.executor_kind == "thread":
+        barrier: WorkerBarrier = threading.Barrier(workers)
+        executor: Executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="dfs-worker",
+            initializer=_initialize_worker,
+            initargs=(barrier, settings.warmup_enabled),
+        )
+        return executor, barrier
+    # "spawn" avoids forking a process that already runs uvicorn/anyio threads.
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_initialize_worker,
+        initargs=(barrier, settings.warmup_enabled),
+    )
+    return executor, barrier
+
+
+def get_executor() -> Executor:
+    """Return the shared executor, creating it from settings on first use."""
+    global _executor, _worker_barrier
+    with _lock:
+        if _executor is None:
+            settings = get_settings()
+            _executor, _worker_barrier = _create_executor(settings)
+            logger.info(
+                "Started %s executor with %d workers",
+                settings.executor_kind,
+                settings.executor_workers,
+            )
+        return _executor
+
+
+def get_shard_executor(workers: int) -> ProcessPoolExecutor:
+    """Return a process pool of ``workers`` for data-parallel shards of one analysis.
+
+    Unlike ``get_executor``, which runs whole requests, these pools split a single
+    request across cores. They are always process-based, created on first use and
+    reused per worker count.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    with _lock:
+        if workers not in _shard_executors:
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            # Inside an executor worker, multiprocessing joins child processes at exit
+            # before any atexit hook runs, so shut the pool down first. The priority
+            # must beat the pool's own queue finalizers (10), which would otherwise
+            # close the queue before the workers' stop sentinels are sent.
+            multiprocessing.util.Finalize(pool, pool.shutdown, exitpriority=100)
+            _shard_executors[workers] = pool
+            logger.info("Started shard executor with %d workers", workers)
+        return _shard_executors[workers]
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut down the shared and shard executors; later calls recreate them."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        barrier = _worker_barrier
+        shard_executors = list(_shard_executors.values())
+        _shard_executors.clear()
+    for pool in shard_executors:
+        pool.shutdown(wait=wait, cancel_futures=True)
+    if executor is not None:
+        if barrier is not None:
+            # Release workers still held by an interrupted ``warm_up_workers``.
+            barrier.abort()
+        executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Executor shut down")
+
+
+async def run_cpu_bound(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run ``func`` on the shared executor and await its result.
+
+    With the process executor, ``func`` and its arguments must be picklable, so pass
+    module-level functions and keep return values compact (scores, not arrays).
+
+    Args:
+        func: Callable to execute off the event loop.
+        *args: Positional arguments for ``func``.
+        **kwargs: Keyword arguments for ``func``.
+
+    Returns:
+        Whatever ``func`` returns.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def _report_worker() -> tuple[str, dict[str, float]]:
+    """Hold this worker until every worker runs one, then report its warm-up timings."""
+    _worker.barrier.wait(WORKER_START_TIMEOUT_SECONDS)
+    return f"{os.getpid()}/{threading.get_ident()}", _worker.warm_up_ms
+
+
+async def warm_up_workers() -> dict[str, dict[str, float]]:
+    """Start every executor worker and return each one's warm-up timings by worker ID.
+
+    Workers warm the engines up in their initializer, before their first task.
+    One barrier task per worker is then submitted; each blocks until all of them
+    run at once, which is only possible with one task per worker, so every worker
+    has been spawned and warmed up when this returns.
+
+    Raises:
+        threading.BrokenBarrierError: If not every worker started in time.
+    """
+    workers = get_settings().executor_workers
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    reports = await asyncio.gather(
+        *(loop.run_in_executor(executor, _report_worker) for _ in range(workers))
+    )
+    return dict(reports)
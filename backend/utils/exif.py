@@ -1,7 +1,16 @@
-"""Utilities to extract EXIF metadata from images."""
+"""Utilities to extract EXIF and XMP metadata from images.
+
+``read_metadata`` parses tags straight from the upload bytes: it walks JPEG
+segments, PNG and WebP chunks, or TIFF IFDs and reads only the metadata they
+point at, so no pixel data is decoded. ``extract_exif`` reads the tags of an
+already opened Pillow image.
+"""
 
 from __future__ import annotations
 
+import re
+import struct
+import zlib
 from collections.abc import Callable, Mapping
 from typing import Any
 
@@ -11,6 +20,50 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+_IFD_TAG_NAMES: dict[int, str] = dict(ExifTags.TAGS)
+"""Tag id to name for IFD0 and the Exif sub-IFD, built once at import."""
+_GPS_TAG_NAMES: dict[int, str] = dict(ExifTags.GPSTAGS)
+_EXIF_IFD_TAG = 0x8769
+_GPS_IFD_TAG = 0x8825
+_INTEROP_IFD_TAG = 0xA005
+_XMP_TAG = 0x02BC
+_SPECIAL_TAGS = frozenset({_EXIF_IFD_TAG, _GPS_IFD_TAG, _INTEROP_IFD_TAG, _XMP_TAG})
+"""Sub-IFD pointers and the embedded XMP packet, kept raw instead of formatted."""
+_TYPE_FORMATS: dict[int, tuple[str, int]] = {
+    1: ("B", 1),
+    2: ("s", 1),
+    3: ("H", 2),
+    4: ("L", 4),
+    5: ("L", 8),
+    6: ("b", 1),
+    7: ("s", 1),
+    8: ("h", 2),
+    9: ("l", 4),
+    10: ("l", 8),
+    11: ("f", 4),
+    12: ("d", 8),
+    13: ("L", 4),
+}
+"""TIFF field type to (struct code, bytes per value); rationals are two codes each."""
+_RATIONAL_TYPES = frozenset({5, 10})
+MAX_IFD_ENTRIES = 512
+"""Entries read per IFD; larger counts indicate a corrupt or hostile file."""
+MAX_BINARY_VALUE = 64
+"""Opaque (UNDEFINED) values longer than this, such as maker notes, are summarized."""
+MAX_XMP_BYTES = 1 << 20
+
+_JPEG_EXIF_HEADER = b"Exif\x00\x00"
+_JPEG_XMP_HEADER = b"http://ns.adobe.com/xap/1.0/\x00"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_TIFF_HEADERS = (b"II*\x00", b"MM\x00*")
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD8)})
+_JPEG_END_MARKERS = frozenset({0xD9, 0xDA})
+"""End of image and start of scan: no metadata segments follow either."""
+
+_XMP_ATTRIBUTE = re.compile(rb'([A-Za-z][\w.-]*):([A-Za-z][\w.-]*)="([^"]*)"')
+_XMP_ELEMENT = re.compile(rb"<([A-Za-z][\w.-]*):([A-Za-z][\w.-]*)>([^<]+)</\1:\2>")
+_XMP_SKIPPED_PREFIXES = frozenset({b"xmlns", b"rdf", b"x", b"xml"})
+
 
 def _safe_getexif(image: Image.Image) -> Mapping[int, Any]:
     getter: Callable[[], Mapping[int, Any] | None] | None = getattr(image, "_getexif", None)
@@ -27,9 +80,223 @@ def extract_exif(image: Image.Image) -> dict[str, str]:
     try:
         raw_exif = _safe_getexif(image)
         for key, value in raw_exif.items():
-            name = ExifTags.TAGS.get(key, str(key))
+            name = _IFD_TAG_NAMES.get(key, str(key))
             exif_data[name] = str(value)
     except Exception as exc:  # pragma: no cover - depends on Pillow internals
         logger.warning("Unable to read EXIF: %s", exc)
     logger.info("Found %d EXIF fields", len(exif_data))
     return exif_data
+
+
+def detect_container(data: bytes | memoryview) -> str | None:
+    """Name the image container from its signature, or ``None`` when unrecognized."""
+    head = bytes(data[:12])
+    if head.startswith(b"\xff\xd8"):
+        return "JPEG"
+    if head.startswith(_PNG_SIGNATURE):
+        return "PNG"
+    if head[:4] in _TIFF_HEADERS:
+        return "TIFF"
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def _format_value(field_type: int, count: int, raw: memoryview, order: str) -> str:
+    if field_type == 2:
+        return bytes(raw).split(b"\x00", 1)[0].decode("utf-8", "replace").strip()
+    if field_type == 7:
+        if count > MAX_BINARY_VALUE:
+            return f"<{count} bytes>"
+        return str(bytes(raw))
+    code, _ = _TYPE_FORMATS[field_type]
+    if field_type in _RATIONAL_TYPES:
+        pairs = struct.unpack_from(f"{order}{2 * count}{code}", raw)
+        values: tuple[Any, ...] = tuple(
+            num / den if den else float("nan") for num, den in zip(pairs[::2], pairs[1::2])
+        )
+    else:
+        values = struct.unpack_from(f"{order}{count}{code}", raw)
+    return str(values[0]) if count == 1 else str(values)
+
+
+def _read_ifd(
+    tiff: memoryview,
+    order: str,
+    offset: int,
+    names: Mapping[int, str],
+    tags: dict[str, str],
+    visited: set[int],
+) -> dict[int, memoryview]:
+    """Add one IFD's tags to ``tags``; return the raw values of pointer and XMP tags."""
+    special: dict[int, memoryview] = {}
+    if offset in visited or not 8 <= offset <= len(tiff) - 2:
+        return special
+    visited.add(offset)
+    (count,) = struct.unpack_from(f"{order}H", tiff, offset)
+    count = min(count, MAX_IFD_ENTRIES, (len(tiff) - offset - 2) // 12)
+    for entry in range(offset + 2, offset + 2 + 12 * count, 12):
+        tag, field_type, values = struct.unpack_from(f"{order}HHL", tiff, entry)
+        if field_type not in _TYPE_FORMATS or values == 0:
+            continue
+        size = values * _TYPE_FORMATS[field_type][1]
+        start = entry + 8
+        if size > 4:
+            (start,) = struct.unpack_from(f"{order}L", tiff, entry + 8)
+        if start + size > len(tiff):
+            continue
+        value = tiff[start : start + size]
+        if tag in _SPECIAL_TAGS:
+            special[tag] = value
+            continue
+        tags[names.get(tag, str(tag))] = _format_value(field_type, values, value, order)
+    return special
+
+
+def parse_tiff_tags(tiff: memoryview) -> tuple[dict[str, str], memoryview | None]:
+    """Read IFD0, Exif, and GPS tags from a TIFF structure and return any XMP packet.
+
+    Only the directories and the values they reference are read; strip and tile
+    data are never touched. Offsets outside ``tiff`` and directory cycles are
+    skipped, so truncated or malformed files yield whatever tags were reachable.
+    """
+    tags: dict[str, str] = {}
+    if bytes(tiff[:4]) not in _TIFF_HEADERS:
+        return tags, None
+    order = "<" if tiff[0] == 0x49 else ">"
+    (first,) = struct.unpack_from(f"{order}L", tiff, 4)
+    visited: set[int] = set()
+    special = _read_ifd(tiff, order, first, _IFD_TAG_NAMES, tags, visited)
+    for tag, names in ((_EXIF_IFD_TAG, _IFD_TAG_NAMES), (_GPS_IFD_TAG, _GPS_TAG_NAMES)):
+        pointer = special.get(tag)
+        if pointer is not None and len(pointer) == 4:
+            (offset,) = struct.unpack_from(f"{order}L", pointer)
+            _read_ifd(tiff, order, offset, names, tags, visited)
+    return tags, special.get(_XMP_TAG)
+
+
+def parse_xmp(packet: bytes | memoryview) -> dict[str, str]:
+    """Read simple XMP properties as ``prefix:name`` keys (``xmp:CreatorTool``)."""
+    text = bytes(packet[:MAX_XMP_BYTES])
+    tags: dict[str, str] = {}
+    for pattern in (_XMP_ATTRIBUTE, _XMP_ELEMENT):
+        for prefix, name, value in pattern.findall(text):
+            if prefix in _XMP_SKIPPED_PREFIXES:
+                continue
+            key = f"{prefix.decode()}:{name.decode()}"
+            tags.setdefault(key, value.decode("utf-8", "replace").strip())
+    return tags
+
+
+def _jpeg_segments(data: memoryview) -> tuple[memoryview | None, memoryview | None]:
+    exif = xmp = None
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            break
+        marker = data[position + 1]
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in _JPEG_END_MARKERS:
+            break
+        if marker in _JPEG_STANDALONE_MARKERS:
+            position += 2
+            continue
+        (length,) = struct.unpack_from(">H", data, position + 2)
+        body = data[position + 4 : position + 2 + length]
+        if marker == 0xE1:
+            if exif is None and bytes(body[:6]) == _JPEG_EXIF_HEADER:
+                exif = body[6:]
+            elif xmp is None and bytes(body[: len(_JPEG_XMP_HEADER)]) == _JPEG_XMP_HEADER:
+                xmp = body[len(_JPEG_XMP_HEADER) :]
+        position += 2 + length
+    return exif, xmp
+
+
+def _png_itxt(body: memoryview) -> memoryview | None:
+    keyword, _, rest = bytes(body[:80]).partition(b"\x00")
+    if keyword != b"XML:com.adobe.xmp" or len(rest) < 2:
+        return None
+    compressed = rest[0] == 1
+    start = len(keyword) + 3
+    for _ in range(2):  # language tag and translated keyword
+        end = bytes(body[start:]).find(b"\x00")
+        if end < 0:
+            return None
+        start += end + 1
+    text = body[start:]
+    if compressed:
+        return memoryview(zlib.decompressobj().decompress(text, MAX_XMP_BYTES))
+    return text
+
+
+def _png_chunks(data: memoryview) -> tuple[memoryview | None, memoryview | None]:
+    exif = xmp = None
+    position = len(_PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, kind = struct.unpack_from(">L4s", data, position)
+        body = data[position + 8 : position + 8 + length]
+        if kind == b"eXIf":
+            exif = body
+        elif kind == b"iTXt" and xmp is None:
+            xmp = _png_itxt(body)
+        elif kind == b"IEND":
+            break
+        position += 12 + length
+    return exif, xmp
+
+
+def _webp_chunks(data: memoryview) -> tuple[memoryview | None, memoryview | None]:
+    exif = xmp = None
+    position = 12
+    while position + 8 <= len(data):
+        kind, length = struct.unpack_from("<4sL", data, position)
+        body = data[position + 8 : position + 8 + length]
+        if kind == b"EXIF":
+            exif = body[6:] if bytes(body[:6]) == _JPEG_EXIF_HEADER else body
+        elif kind == b"XMP ":
+            xmp = body
+        position += 8 + length + (length & 1)
+    return exif, xmp
+
+
+_CONTAINER_READERS: dict[
+    str, Callable[[memoryview], tuple[memoryview | None, memoryview | None]]
+] = {
+    "JPEG": _jpeg_segments,
+    "PNG": _png_chunks,
+    "WEBP": _webp_chunks,
+    "TIFF": lambda data: (data, None),
+}
+
+
+def read_metadata(data: bytes | memoryview) -> dict[str, str]:
+    """Parse EXIF and XMP tags from encoded image bytes without decoding pixels.
+
+    JPEG APP1 segments, PNG ``eXIf``/``iTXt`` chunks, WebP ``EXIF``/``XMP``
+    chunks, and TIFF IFDs are located by walking headers; pixel data is skipped
+    by length. EXIF tags use Pillow's names (``Model``, ``DateTime``); XMP
+    properties are prefixed (``tiff:Model``, ``xmp:CreatorTool``) and never
+    override an EXIF tag. Unrecognized or malformed input yields the tags that
+    could be read, possibly none.
+    """
+    view = memoryview(data)
+    container = detect_container(view)
+    tags: dict[str, str] = {}
+    if container is None:
+        logger.info("No recognized image container; no metadata read")
+        return tags
+    try:
+        exif, xmp = _CONTAINER_READERS[container](view)
+        if exif is not None:
+            exif_tags, tiff_xmp = parse_tiff_tags(exif)
+            tags.update(exif_tags)
+            xmp = xmp if xmp is not None else tiff_xmp
+        if xmp is not None:
+            for key, value in parse_xmp(xmp).items():
+                tags.setdefault(key, value)
+    except (struct.error, ValueError, zlib.error) as exc:
+        logger.warning("Malformed %s metadata: %s", container, exc)
+    logger.info("Found %d metadata fields in %s headers", len(tags), container)
+    return tags
@@ -0,0 +1,109 @@
+"""Content-addressed on-disk store shared by every Uvicorn worker.
+
+Entries are ``<id>.json`` files, optionally with sidecar files that share the
+stem (a rendered PDF or PNG). Files are written via a private temporary file and
+a rename, so concurrent readers never see a partial file, and expire once their
+modification time falls outside the retention period; registering an entry
+again refreshes it. The report and heatmap stores and the result cache's disk
+tier are built on this class. Its methods block on the filesystem, so async
+callers run them in a thread.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Write ``content`` to ``path`` via a temporary file and a rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class FileStore:
+    """Entries keyed by a SHA-256 hex ID, expired by modification time.
+
+    Subclasses name the error raised for unknown IDs and the sidecar suffixes
+    deleted along with an entry. The directory is created on the first write.
+    """
+
+    not_found: type[LookupError] = LookupError
+    sidecar_suffixes: tuple[str, ...] = ()
+    entry_noun = "entries"
+
+    def __init__(self, directory: Path, retention_seconds: float, sweep_every: int = 256) -> None:
+        self.directory = directory
+        self.retention_seconds = retention_seconds
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def count_write(self) -> None:
+        """Count one registration and sweep after every ``sweep_every`` of them."""
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % self.sweep_every == 0
+        if sweep:
+            self.sweep()
+
+    def sweep(self) -> int:
+        """Delete entries that outlived the retention period; returns how many."""
+        cutoff = self._cutoff()
+        removed = 0
+        for spec_path in self.directory.glob("*.json"):
+            try:
+                if not self._expired(spec_path, cutoff):
+                    continue
+            except FileNotFoundError:
+                continue
+            self._delete(spec_path)
+            removed += 1
+        if removed:
+            logger.info("Swept %d expired %s", removed, self.entry_noun)
+        return removed
+
+    def _refresh_or_write(self, path: Path, content: bytes) -> None:
+        """Refresh the retention of an existing file, or write it when missing.
+
+        Only valid for content-addressed files, whose content never changes.
+        """
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            write_atomic(path, content)
+
+    def _cutoff(self) -> float:
+        return time.time() - self.retention_seconds
+
+    @staticmethod
+    def _expired(path: Path, cutoff: float) -> bool:
+        """Whether ``path`` was last written or refreshed before ``cutoff``."""
+        return path.stat().st_mtime < cutoff
+
+    def _delete(self, spec_path: Path) -> None:
+        spec_path.unlink(missing_ok=True)
+        for suffix in self.sidecar_suffixes:
+            spec_path.with_suffix(suffix).unlink(missing_ok=True)
+
+    def _spec_path(self, entry_id: str) -> Path:
+        if not CONTENT_ID_PATTERN.match(entry_id):
+            raise self.not_found(entry_id)
+        return self.directory / f"{entry_id}.json"
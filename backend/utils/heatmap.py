@@ -2,13 +2,71 @@
 
 from __future__ import annotations
 
-import numpy as np
-from numpy.typing import NDArray
+from dataclasses import dataclass
+from io import BytesIO
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+HEATMAP_MAX_SIDE = 256
+"""Default longest side of a rendered heatmap."""
+
+HEATMAP_DTYPES = {"uint8", "float16"}
 
 
 def generate_mock_heatmap(width: int, height: int) -> NDArray[np.float_]:
     """Generate a simple gradient heatmap to represent artifact intensity."""
+    import numpy as np
+
     x = np.linspace(0, 1, width)
     y = np.linspace(0, 1, height)
     heatmap: NDArray[np.float_] = np.outer(y, x)
     return heatmap
+
+
+@dataclass(frozen=True)
+class HeatmapHandle:
+    """Deferred artifact heatmap for a crop of ``width`` x ``height`` pixels.
+
+    Nothing is allocated, or even imported, until ``render`` is called, and
+    rendering is bounded to ``max_side`` pixels regardless of the crop size.
+    """
+
+    width: int
+    height: int
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Full-resolution ``(height, width)`` the heatmap describes."""
+        return (self.height, self.width)
+
+    def render(self, max_side: int = HEATMAP_MAX_SIDE, dtype: str = "uint8") -> NDArray[Any]:
+        """Build the heatmap scaled to fit ``max_side`` as ``uint8`` (0-255) or ``float16``."""
+        import numpy as np
+
+        if max_side <= 0:
+            raise ValueError("max_side must be positive")
+        if dtype not in HEATMAP_DTYPES:
+            raise ValueError(f"dtype must be one of {sorted(HEATMAP_DTYPES)}")
+        scale = min(1.0, max_side / max(self.width, self.height, 1))
+        width = max(1, round(self.width * scale))
+        height = max(1, round(self.height * scale))
+        heatmap = np.outer(
+            np.linspace(0, 1, height, dtype=np.float32), np.linspace(0, 1, width, dtype=np.float32)
+        )
+        if dtype == "float16":
+            tile: NDArray[Any] = heatmap.astype(np.float16)
+        else:
+            tile = np.rint(heatmap * 255).astype(np.uint8)
+        return tile
+
+    def to_png(self, max_side: int = HEATMAP_MAX_SIDE) -> bytes:
+        """Render as an 8-bit greyscale PNG."""
+        from PIL import Image
+
+        buffer = BytesIO()
+        image = Image.fromarray(self.render(max_side, "uint8"), mode="L")  # type: ignore[no-untyped-call]
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
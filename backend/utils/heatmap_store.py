@@ -0,0 +1,113 @@
+"""Shared on-disk store for deferred artifact heatmaps.
+
+Image analyses register the heatmap handle (the crop size) under an ID derived
+from the upload digest and the analysis parameters, optionally with its
+pre-rendered PNG. Entries live in a directory every Uvicorn worker can read, so
+a heatmap URL resolves on any worker, and they do not depend on the result
+cache being enabled. Entries expire after a retention period that is refreshed
+each time the analysis registers them again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from .cache import ENGINE_VERSION
+from .config import get_settings
+from .file_store import CONTENT_ID_PATTERN, FileStore, write_atomic
+from .heatmap import HeatmapHandle
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+HEATMAP_ID_PATTERN = CONTENT_ID_PATTERN
+
+
+class HeatmapNotFoundError(LookupError):
+    """Raised when a heatmap ID is malformed, unknown, or expired."""
+
+
+class HeatmapStore(FileStore):
+    """Heatmap handles and default-resolution PNGs keyed by analysis."""
+
+    not_found = HeatmapNotFoundError
+    sidecar_suffixes = (".png",)
+    entry_noun = "heatmaps"
+
+    @staticmethod
+    def heatmap_id(digest: str, params: dict[str, Any]) -> str:
+        """Derive the heatmap ID of an analysis from its upload digest and parameters."""
+        material = json.dumps([digest, ENGINE_VERSION, params], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def register(self, heatmap_id: str, handle: HeatmapHandle, png: bytes | None = None) -> None:
+        """Record ``handle`` (and ``png``, when given) and refresh their retention.
+
+        The ID fixes the handle, so a known entry is only touched, not rewritten.
+        """
+        spec_path = self._spec_path(heatmap_id)
+        self._refresh_or_write(
+            spec_path, json.dumps({"width": handle.width, "height": handle.height}).encode()
+        )
+        png_path = spec_path.with_suffix(".png")
+        if png is not None:
+            write_atomic(png_path, png)
+        else:
+            try:
+                os.utime(png_path)
+            except FileNotFoundError:
+                pass
+        self.count_write()
+
+    def has_png(self, heatmap_id: str) -> bool:
+        """Whether a live pre-rendered PNG is stored for ``heatmap_id``."""
+        png_path = self._spec_path(heatmap_id).with_suffix(".png")
+        try:
+            return not self._expired(png_path, self._cutoff())
+        except FileNotFoundError:
+            return False
+
+    def load(self, heatmap_id: str) -> tuple[HeatmapHandle, bytes | None]:
+        """Return the handle of ``heatmap_id`` and its pre-rendered PNG, if stored.
+
+        Raises:
+            HeatmapNotFoundError: If the ID is malformed, unknown, or expired.
+        """
+        spec_path = self._spec_path(heatmap_id)
+        cutoff = self._cutoff()
+        try:
+            if self._expired(spec_path, cutoff):
+                self._delete(spec_path)
+                raise HeatmapNotFoundError(heatmap_id)
+            spec: dict[str, int] = json.loads(spec_path.read_text())
+        except FileNotFoundError as exc:
+            raise HeatmapNotFoundError(heatmap_id) from exc
+        handle = HeatmapHandle(width=spec["width"], height=spec["height"])
+        png_path = spec_path.with_suffix(".png")
+        try:
+            if not self._expired(png_path, cutoff):
+                return handle, png_path.read_bytes()
+        except FileNotFoundError:
+            pass
+        return handle, None
+
+
+_store: HeatmapStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_heatmap_store() -> HeatmapStore:
+    """Return the process-wide heatmap store configured from settings."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            settings = get_settings()
+            _store = HeatmapStore(
+                Path(settings.heatmap_dir), retention_seconds=settings.heatmap_retention_seconds
+            )
+        return _store
@@ -0,0 +1,518 @@
+"""SQLite-backed job queue with a bounded pool of worker threads.
+
+Job state lives in a SQLite database so queued work survives restarts and progress
+written by executor processes is visible to every reader. Worker threads claim jobs
+by priority, hand them to the shared executor, and record the outcome. A claimed
+job carries its queue's owner ID and a lease the worker renews while it runs, so
+several processes can share one database: only jobs whose lease lapsed, because
+their process died, are queued again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import CancelledError, Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .executor import get_executor
+from .logger import get_logger
+from .spool import SpooledUpload
+
+logger = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_CANCELLING = "cancelling"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+TERMINAL_STATUSES = frozenset({JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED})
+
+ERROR_INVALID = "invalid"
+ERROR_INTERNAL = "internal"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    payload_path TEXT,
+    payload_size INTEGER NOT NULL,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    error_kind TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    expires_at REAL,
+    owner TEXT,
+    lease_expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_priority ON jobs (status, priority DESC, created_at);
+"""
+
+_LEASE_COLUMNS = {"owner": "TEXT", "lease_expires_at": "REAL"}
+"""Columns added after the first schema; databases created before them gain them."""
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job handler once its job has been cancelled."""
+
+
+@contextmanager
+def _connect(db_path: str) -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@dataclass
+class JobRecord:
+    """Snapshot of a job row."""
+
+    id: str
+    kind: str
+    status: str
+    priority: int
+    params: dict[str, Any]
+    progress_done: int
+    progress_total: int
+    result: dict[str, Any] | None
+    error: str | None
+    error_kind: str | None
+    created_at: float
+    updated_at: float
+    expires_at: float | None
+    payload_path: str | None = field(default=None, repr=False)
+    payload_size: int = field(default=0, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a terminal status."""
+        return self.status in TERMINAL_STATUSES
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> JobRecord:
+        """Build a record from a ``jobs`` row."""
+        return cls(
+            id=row["id"],
+            kind=row["kind"],
+            status=row["status"],
+            priority=row["priority"],
+            params=json.loads(row["params"]),
+            progress_done=row["progress_done"],
+            progress_total=row["progress_total"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            error_kind=row["error_kind"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            expires_at=row["expires_at"],
+            payload_path=row["payload_path"],
+            payload_size=row["payload_size"],
+        )
+
+
+@dataclass
+class JobProgress:
+    """Picklable progress reporter that writes straight to the job database.
+
+    It doubles as the cancellation checkpoint: once the job leaves the running state,
+    the next call raises ``JobCancelledError`` inside the handler.
+    """
+
+    db_path: str
+    job_id: str
+    min_interval: float = 0.25
+    last_write: float = field(default=0.0, repr=False)
+
+    def __call__(self, done: int, total: int) -> None:
+        now = time.monotonic()
+        if done < total and now - self.last_write < self.min_interval:
+            return
+        self.last_write = now
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE jobs SET progress_done = ?, progress_total = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (done, total, time.time(), self.job_id, JOB_RUNNING),
+            )
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (self.job_id,)).fetchone()
+        if row is None or row["status"] != JOB_RUNNING:
+            raise JobCancelledError(self.job_id)
+
+
+JobHandler = Callable[[SpooledUpload, dict[str, Any], JobProgress], dict[str, Any]]
+"""Module-level callable run on the executor; returns a JSON-serializable result."""
+
+
+class JobQueue:
+    """Persistent priority queue drained by a bounded pool of worker threads.
+
+    Any number of queue instances, in any number of processes, may share ``root``.
+    A running job's lease is renewed every quarter of ``lease_seconds``; jobs whose
+    lease expired are queued again (or, if they were being cancelled, cancelled) on
+    ``start`` and by the workers' periodic maintenance, which also purges jobs past
+    their retention. A job of a crashed process therefore resumes within about
+    ``lease_seconds``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        handlers: Mapping[str, JobHandler],
+        workers: int = 2,
+        retention_seconds: float = 3600.0,
+        executor_factory: Callable[[], Executor] = get_executor,
+        on_success: Callable[[JobRecord], None] | None = None,
+        lease_seconds: float = 60.0,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be positive")
+        if lease_seconds <= 0:
+            raise ValueError("lease_seconds must be positive")
+        self.root = root
+        self.payload_dir = root / "payloads"
+        self.payload_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(root / "jobs.sqlite3")
+        self.handlers = dict(handlers)
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._executor_factory = executor_factory
+        self._on_success = on_success
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._futures: dict[str, Future[dict[str, Any]]] = {}
+        self._maintenance_lock = threading.Lock()
+        self._next_maintenance = 0.0
+        with _connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for name, kind in _LEASE_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+
+    def start(self) -> None:
+        """Recover jobs whose lease expired and start the worker threads."""
+        if self._threads:
+            return
+        self._recover_expired_leases()
+        self._stopping.clear()
+        for idx in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"dfs-job-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Job queue started with %d workers", self.workers)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal worker threads to exit after their current job."""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        logger.info("Job queue stopped")
+
+    def submit(
+        self,
+        kind: str,
+        upload: SpooledUpload,
+        params: dict[str, Any] | None = None,
+        priority: int = 0,
+    ) -> JobRecord:
+        """Persist the payload and enqueue a job; higher ``priority`` runs first.
+
+        A spilled upload is moved into the queue's payload directory, so the caller's
+        later ``discard`` becomes a no-op.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        payload_path = self.payload_dir / f"{job_id}.bin"
+        if upload.path is not None:
+            shutil.move(upload.path, payload_path)
+        else:
+            payload_path.write_bytes(upload.data or b"")
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, priority, params, payload_path, "
+                "payload_size, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    JOB_QUEUED,
+                    priority,
+                    json.dumps(params or {}),
+                    str(payload_path),
+                    upload.size,
+                    now,
+                    now,
+                ),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        with self._wakeup:
+            self._wakeup.notify()
+        logger.info("Queued %s job %s with priority %d", kind, job_id, priority)
+        return JobRecord.from_row(row)
+
+    def record_completed(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        result: dict[str, Any],
+        priority: int = 0,
+    ) -> JobRecord:
+        """Insert an already-succeeded job, e.g. when the result came from a cache."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, priority, params, payload_size, result, "
+                "created_at, updated_at, expires_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    JOB_SUCCEEDED,
+                    priority,
+                    json.dumps(params),
+                    json.dumps(result),
+                    now,
+                    now,
+                    now + self.retention_seconds,
+                ),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return JobRecord.from_row(row)
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Return the job, or ``None`` if it is unknown or its retention expired.
+
+        Blocks on SQLite; async callers run it in a thread.
+        """
+        with _connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at >= ?)",
+                (job_id, time.time()),
+            ).fetchone()
+        return JobRecord.from_row(row) if row is not None else None
+
+    def cancel(self, job_id: str) -> JobRecord | None:
+        """Cancel a queued job immediately or ask a running job to stop.
+
+        Blocks on SQLite; async callers run it in a thread.
+        """
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            record = JobRecord.from_row(row)
+            if record.status == JOB_QUEUED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ?, expires_at = ? WHERE id = ?",
+                    (JOB_CANCELLED, now, now + self.retention_seconds, job_id),
+                )
+            elif record.status == JOB_RUNNING:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?",
+                    (JOB_CANCELLING, now, job_id),
+                )
+            conn.execute("COMMIT")
+        if record.status == JOB_QUEUED:
+            self._remove_payload(record.payload_path)
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+        logger.info("Cancellation requested for job %s (was %s)", job_id, record.status)
+        return self.get(job_id)
+
+    async def wait(self, job_id: str, max_interval: float = 0.25) -> JobRecord:
+        """Poll, off the event loop, until the job finishes and return its final record."""
+        interval = 0.01
+        while True:
+            record = await asyncio.to_thread(self.get, job_id)
+            if record is None:
+                raise KeyError(job_id)
+            if record.finished:
+                return record
+            await asyncio.sleep(interval)
+            interval = min(max_interval, interval * 2)
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            self._maintain()
+            record = self._claim()
+            if record is None:
+                with self._wakeup:
+                    self._wakeup.wait(timeout=1.0)
+                continue
+            self._run(record)
+
+    def _maintain(self) -> None:
+        """Purge expired jobs and recover lapsed leases, at most twice per lease period."""
+        now = time.monotonic()
+        with self._maintenance_lock:
+            if now < self._next_maintenance:
+                return
+            self._next_maintenance = now + self.lease_seconds / 2
+        self._purge_expired()
+        self._recover_expired_leases()
+
+    def _claim(self) -> JobRecord | None:
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1",
+                (JOB_QUEUED,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, updated_at = ?, owner = ?, lease_expires_at = ? "
+                    "WHERE id = ?",
+                    (JOB_RUNNING, now, self.owner, now + self.lease_seconds, row["id"]),
+                )
+            conn.execute("COMMIT")
+        return JobRecord.from_row(row) if row is not None else None
+
+    def _renew_lease(self, job_id: str) -> None:
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND owner = ?",
+                (time.time() + self.lease_seconds, job_id, self.owner),
+            )
+
+    def _recover_expired_leases(self) -> None:
+        """Queue again running jobs, and cancel cancelling ones, whose lease lapsed."""
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, owner = NULL, lease_expires_at = NULL "
+                "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (JOB_QUEUED, now, JOB_RUNNING, now),
+            ).rowcount
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, expires_at = ?, owner = NULL, "
+                "lease_expires_at = NULL "
+                "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (JOB_CANCELLED, now, now + self.retention_seconds, JOB_CANCELLING, now),
+            )
+        if requeued:
+            logger.warning("Re-queued %d jobs whose lease expired", requeued)
+            with self._wakeup:
+                self._wakeup.notify_all()
+
+    def _await_result(self, job_id: str, future: Future[dict[str, Any]]) -> dict[str, Any]:
+        """Wait for a job's result, renewing its lease every quarter period."""
+        while True:
+            try:
+                return future.result(timeout=self.lease_seconds / 4)
+            except TimeoutError:
+                if future.done():
+                    raise  # the handler itself raised TimeoutError
+                self._renew_lease(job_id)
+
+    def _run(self, record: JobRecord) -> None:
+        upload = SpooledUpload(size=record.payload_size, path=record.payload_path)
+        progress = JobProgress(self.db_path, record.id)
+        handler = self.handlers[record.kind]
+        try:
+            future = self._executor_factory().submit(handler, upload, record.params, progress)
+            self._futures[record.id] = future
+            result = self._await_result(record.id, future)
+        except (JobCancelledError, CancelledError):
+            self._finish(record, JOB_CANCELLED)
+        except ValueError as exc:
+            logger.warning("Job %s rejected its input: %s", record.id, exc)
+            self._finish(record, JOB_FAILED, error=str(exc), error_kind=ERROR_INVALID)
+        except Exception:
+            logger.exception("Job %s failed", record.id)
+            self._finish(record, JOB_FAILED, error="Job failed", error_kind=ERROR_INTERNAL)
+        else:
+            if self._finish(record, JOB_SUCCEEDED, result=result) and self._on_success:
+                record.result = result
+                self._on_success(record)
+        finally:
+            self._futures.pop(record.id, None)
+
+    def _finish(
+        self,
+        record: JobRecord,
+        status: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+        error_kind: str | None = None,
+    ) -> bool:
+        """Record the outcome; returns whether the requested status was applied.
+
+        Nothing is recorded, and the payload is kept, when the lease was lost to
+        another queue that re-runs the job.
+        """
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT status, owner FROM jobs WHERE id = ?", (record.id,)
+            ).fetchone()
+            if row is None or row["owner"] != self.owner:
+                conn.execute("COMMIT")
+                logger.warning("Job %s lost its lease; discarding its outcome", record.id)
+                return False
+            applied: bool = row["status"] != JOB_CANCELLING
+            if not applied:
+                status, result, error, error_kind = JOB_CANCELLED, None, None, None
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, error_kind = ?, "
+                "updated_at = ?, expires_at = ?, owner = NULL, lease_expires_at = NULL, "
+                "progress_done = CASE WHEN ? THEN progress_total ELSE progress_done END "
+                "WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    error_kind,
+                    now,
+                    now + self.retention_seconds,
+                    status == JOB_SUCCEEDED,
+                    record.id,
+                ),
+            )
+            conn.execute("COMMIT")
+        self._remove_payload(record.payload_path)
+        logger.info("Job %s finished with status %s", record.id, status)
+        return applied
+
+    def _purge_expired(self) -> None:
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+
+    @staticmethod
+    def _remove_payload(path: str | None) -> None:
+        if path is not None:
+            Path(path).unlink(missing_ok=True)
@@ -0,0 +1,191 @@
+"""Per-upload media context that decodes each representation at most once."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+
+from .exif import read_metadata
+from .logger import get_logger
+from .preprocess import (
+    ByteSource,
+    align_faces,
+    count_frames,
+    detect_faces,
+    extract_frames,
+    iter_audio_blocks,
+    iter_frames,
+    load_image,
+    pad_face_crops,
+)
+from .spool import SpooledUpload
+
+logger = get_logger(__name__)
+
+VIDEO_STILL_BYTES = 1024
+"""Prefix of a video payload decoded as its representative still."""
+
+MEDIA_KINDS = {"image", "video", "audio"}
+
+Box = tuple[int, int, int, int]
+
+
+@dataclass
+class FaceBatch:
+    """Face crops of one image at native resolution, padded into one stack for scoring.
+
+    ``pixels`` holds crop ``i`` of ``boxes`` in the top-left ``sizes[i]``
+    (width, height) corner of slot ``i``, zero-padded to the largest crop, so
+    crops are never resampled before scoring.
+    """
+
+    boxes: list[Box]
+    pixels: NDArray[np.uint8]
+    sizes: list[tuple[int, int]]
+    detected: int
+
+
+class MediaContext:
+    """Lazily decoded, memoized views of one upload shared by every engine.
+
+    Each property is computed on first access and reused afterwards; ``decodes``
+    counts how many times each representation was actually produced so tests and
+    logs can confirm nothing is decoded twice. Images larger than ``max_side`` are
+    decoded at reduced resolution. For videos, ``image`` is the
+    representative still taken from the start of the payload (a grey frame when
+    that prefix does not decode).
+
+    The context borrows ``content``; use ``MediaContext.open`` so derived views
+    are released before a memory-mapped upload is unmapped.
+    """
+
+    _MEMOIZED = (
+        "image",
+        "exif",
+        "faces",
+        "crops",
+    )
+
+    def __init__(
+        self, content: ByteSource, kind: str = "image", max_side: int | None = None
+    ) -> None:
+        if kind not in MEDIA_KINDS:
+            raise ValueError(f"Unknown media kind: {kind}")
+        self.content = content
+        self.kind = kind
+        self.max_side = max_side
+        self.decodes: Counter[str] = Counter()
+        self._frames: dict[int, list[NDArray[np.uint8]]] = {}
+        self._face_batches: dict[int, FaceBatch] = {}
+
+    @classmethod
+    @contextmanager
+    def open(
+        cls, upload: SpooledUpload, kind: str = "image", max_side: int | None = None
+    ) -> Iterator[MediaContext]:
+        """Map a spooled upload and yield a context over it."""
+        with upload.open_buffer() as content:
+            media = cls(content, kind, max_side)
+            try:
+                yield media
+            finally:
+                logger.debug("Media decodes for %s upload: %s", kind, dict(media.decodes))
+                media.release()
+
+    def release(self) -> None:
+        """Drop memoized values and the borrowed buffer."""
+        for name in self._MEMOIZED:
+            self.__dict__.pop(name, None)
+        self._frames.clear()
+        self._face_batches.clear()
+        self.content = b""
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """Decoded RGB image."""
+        self.decodes["image"] += 1
+        if self.kind != "video":
+            return load_image(self.content, self.max_side)
+        try:
+            return load_image(self.content[: min(VIDEO_STILL_BYTES, len(self.content))])
+        except ValueError:
+            return Image.new("RGB", (64, 64), color=(128, 128, 128))
+
+    @cached_property
+    def exif(self) -> dict[str, str]:
+        """EXIF and XMP tags parsed from the file headers; never decodes pixels."""
+        self.decodes["exif"] += 1
+        return read_metadata(self.content)
+
+    @cached_property
+    def faces(self) -> list[Box]:
+        """Face bounding boxes in ``image``."""
+        self.decodes["faces"] += 1
+        return detect_faces(self.image)
+
+    @cached_property
+    def crops(self) -> list[Image.Image]:
+        """Aligned face crops, the primary face first."""
+        self.decodes["crops"] += 1
+        return align_faces(self.image, self.faces)
+
+    def face_batch(self, max_faces: int) -> FaceBatch:
+        """Up to ``max_faces`` face crops padded into one stack, memoized.
+
+        When more faces are detected, the largest ones are kept (in detection
+        order). An image without faces is treated as one face covering the frame.
+        """
+        if max_faces <= 0:
+            raise ValueError("max_faces must be positive")
+        if max_faces not in self._face_batches:
+            self.decodes["face_batch"] += 1
+            faces = self.faces or [(0, 0, *self.image.size)]
+            if len(faces) > max_faces:
+                ranked = sorted(range(len(faces)), key=lambda i: _area(faces[i]), reverse=True)
+                faces = [faces[i] for i in sorted(ranked[:max_faces])]
+            crops = [self.image.crop(face) for face in faces]
+            self._face_batches[max_faces] = FaceBatch(
+                boxes=faces,
+                pixels=pad_face_crops(crops),
+                sizes=[crop.size for crop in crops],
+                detected=len(self.faces),
+            )
+        return self._face_batches[max_faces]
+
+    def frames(self, fps: int = 5) -> list[NDArray[np.uint8]]:
+        """Frames sampled at ``fps`` as uint8 views over the content, memoized per rate."""
+        if fps not in self._frames:
+            self.decodes["frames"] += 1
+            self._frames[fps] = extract_frames(self.content, fps=fps)
+        return self._frames[fps]
+
+    def iter_frames(self, fps: int = 5) -> Iterator[NDArray[np.uint8]]:
+        """Stream frames sampled at ``fps`` without keeping them.
+
+        Reuses memoized ``frames`` when present; frames are views either way.
+        """
+        if fps in self._frames:
+            return iter(self._frames[fps])
+        self.decodes["frame_streams"] += 1
+        return iter_frames(self.content, fps=fps)
+
+    def audio_blocks(self) -> Iterator[NDArray[Any]]:
+        """Stream mono audio at the analysis sample rate without keeping it."""
+        self.decodes["audio_streams"] += 1
+        return iter_audio_blocks(self.content)
+
+    def frame_count(self, fps: int = 5) -> int:
+        """Number of frames sampled at ``fps``, without decoding them."""
+        return count_frames(len(self.content), fps)
+
+
+def _area(box: Box) -> int:
+    return max(0, box[2] - box[0]) * max(0, box[3] - box[1])
@@ -5,17 +5,21 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from pathlib import Path
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
-
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
 
 def export_report(output_path: Path, summary: dict[str, str], anomalies: list[str]) -> Path:
-    """Generate a PDF report with summary and anomalies."""
+    """Generate a PDF report with summary and anomalies.
+
+    reportlab is imported on first use; it is the slowest import in the service
+    and most requests never render a report.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
     logger.info("Generating PDF report at %s", output_path)
     styles = getSampleStyleSheet()
@@ -35,3 +39,11 @@ def export_report(output_path: Path, summary: dict[str, str], anomalies: list[st
     doc.build(story)
     logger.info("Report created")
     return output_path
+
+
+def warm_up() -> None:
+    """Import reportlab and build its default style sheet ahead of the first report."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate  # noqa: F401
+
+    getSampleStyleSheet()
@@ -2,25 +2,132 @@
 
 from __future__ import annotations
 
+import heapq
 import io
+import math
 import wave
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, TypeVar
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
 from PIL import Image
 
+from .exif import read_metadata
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+ByteSource = bytes | memoryview
+"""Raw upload content: ``bytes`` or a zero-copy view over a spooled/mapped buffer."""
 
-def load_image(file_bytes: bytes) -> Image.Image:
-    """Load image from raw bytes with safety checks."""
+FrameT = TypeVar("FrameT", bound=np.generic)
+
+ANALYSIS_SAMPLE_RATE = 16000
+"""Rate every audio payload is resampled to before feature extraction."""
+AUDIO_CHUNK_FRAMES = 1 << 16
+"""Sample frames read from an audio container per chunk."""
+RESAMPLE_ZERO_CROSSINGS = 8
+"""Half-length of the resampling filter, in zero crossings of its sinc kernel."""
+RESAMPLE_KAISER_BETA = 8.6
+RESAMPLE_BATCH = 4096
+_PCM_SCALES = {1: 256.0, 2: 1.0, 3: 1 / 256, 4: 1 / 65536}
+"""Factor bringing each WAV sample width in bytes to the 16-bit range."""
+MFCC_COEFFICIENTS = 13
+STFT_FFT_SIZE = 512
+"""STFT window length in samples (32 ms at 16 kHz)."""
+STFT_HOP = 256
+MEL_BANDS = 40
+STFT_BLOCK_FRAMES = 256
+"""STFT frames transformed per batched ``rfft``; bounds working memory to about 4 MiB."""
+LOG_FLOOR = 1e-6
+VAD_ENERGY_FLOOR_DB = -50.0
+"""Frame energy, in dB relative to a 16-bit full-scale sine, below which a frame is silence."""
+VAD_LOUD_MARGIN_DB = 12.0
+VAD_MAX_ZCR = 0.35
+"""Zero crossings per sample above which a quiet frame is treated as noise."""
+VAD_HANGOVER_FRAMES = 8
+_FULL_SCALE_POWER = 32768.0**2 / 2
+"""Mean power of a full-scale 16-bit sine, the 0 dB reference for frame energy."""
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable file object over a buffer that never copies the whole payload."""
+
+    def __init__(self, buffer: ByteSource) -> None:
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, target: bytearray | memoryview) -> int:  # type: ignore[override]
+        chunk = self._view[self._pos : self._pos + len(target)]
+        target[: len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+def _reduction_factor(size: tuple[int, int], max_side: int) -> int:
+    """Smallest integer factor that brings the longer side within ``max_side``."""
+    return -(-max(size) // max_side)
+
+
+def _reduce_to(image: Image.Image, max_side: int) -> Image.Image:
+    """Shrink by the smallest integer factor that fits ``max_side`` (box filter)."""
+    factor = _reduction_factor(image.size, max_side)
+    if factor <= 1:
+        return image
+    reduced: Image.Image = image.reduce(factor)  # type: ignore[no-untyped-call]
+    return reduced
+
+
+def load_image(file_bytes: ByteSource, max_side: int | None = None) -> Image.Image:
+    """Load image from raw bytes with safety checks, optionally capped at ``max_side``.
+
+    With ``max_side``, images whose longer side exceeds it are decoded at reduced
+    resolution: JPEGs use decoder-level DCT scaling (``draft``), so decode time and
+    memory follow the analysis size, and every format is then box-reduced by an
+    integer factor until it fits.
+    """
     logger.debug("Loading image from bytes")
     if not file_bytes:
         raise ValueError("No image content provided")
     try:
-        image = Image.open(io.BytesIO(file_bytes)).convert("RGB")
+        with _BufferReader(file_bytes) as reader:
+            source = Image.open(reader)
+            limit = max_side or 0
+            oversized = 0 < limit < max(source.size)
+            if oversized and source.format == "JPEG":
+                # Ask for the size ``reduce`` would produce so power-of-two factors are
+                # handled entirely by DCT scaling.
+                factor = _reduction_factor(source.size, limit)
+                source.draft(  # type: ignore[no-untyped-call]
+                    "RGB", (-(-source.width // factor), -(-source.height // factor))
+                )
+            image = source.convert("RGB")
+        if oversized:
+            image = _reduce_to(image, limit)
         logger.info("Image loaded with size %s", image.size)
         return image
     except Exception as exc:  # pragma: no cover - defensive logging
@@ -28,23 +135,55 @@ def load_image(file_bytes: bytes) -> Image.Image:
         raise ValueError("Invalid image file") from exc
 
 
-def extract_frames(file_bytes: bytes, fps: int = 5) -> list[NDArray[np.float32]]:
+def load_image_with_exif(
+    file_bytes: ByteSource, max_side: int | None = None
+) -> tuple[Image.Image, dict[str, str]]:
+    """Decode an image and read the source file's EXIF and XMP tags from its headers.
+
+    The tags come from ``read_metadata`` on the raw bytes, so they survive the RGB
+    conversion that drops Pillow's own EXIF.
+    """
+    return load_image(file_bytes, max_side), read_metadata(file_bytes)
+
+
+def extract_frames(file_bytes: ByteSource, fps: int = 5) -> list[NDArray[np.uint8]]:
     """Mock frame extraction from a video stream."""
+    frames = list(iter_frames(file_bytes, fps))
+    logger.info("Extracted %d frames", len(frames))
+    return frames
+
+
+def count_frames(size: int, fps: int = 5) -> int:
+    """Number of frames ``iter_frames`` yields for a payload of ``size`` bytes."""
+    if size <= 0:
+        return 0
+    chunk_size = max(1, size // max(1, fps))
+    return -(-size // chunk_size)
+
+
+def iter_frames(file_bytes: ByteSource, fps: int = 5) -> Iterator[NDArray[np.uint8]]:
+    """Yield the frames of ``extract_frames`` one at a time.
+
+    Each frame is a read-only uint8 view reshaped from the leading ``side * side``
+    bytes of its chunk of ``file_bytes``, so no pixel data is copied; frames stay
+    valid only while the buffer does. Arguments are validated immediately.
+    """
     logger.debug("Extracting frames at %s fps", fps)
     if fps <= 0:
         raise ValueError("fps must be positive")
     if not file_bytes:
         raise ValueError("No video content provided")
-    chunk_size = max(1, len(file_bytes) // max(1, fps))
-    frames: list[NDArray[np.float32]] = []
-    for idx in range(0, len(file_bytes), chunk_size):
-        chunk = file_bytes[idx : idx + chunk_size]
-        arr: NDArray[np.float32] = np.frombuffer(chunk, dtype=np.uint8)
-        side = int(np.sqrt(len(arr))) or 1
-        frame: NDArray[np.float32] = np.resize(arr, (side, side)).astype(np.float32)
-        frames.append(frame)
-    logger.info("Extracted %d frames", len(frames))
-    return frames
+    return _generate_frames(file_bytes, max(1, len(file_bytes) // fps))
+
+
+def _generate_frames(file_bytes: ByteSource, chunk_size: int) -> Iterator[NDArray[np.uint8]]:
+    pixels = np.frombuffer(file_bytes, dtype=np.uint8)
+    for idx in range(0, len(pixels), chunk_size):
+        # side * side never exceeds the chunk length, so the square always fits
+        # and no wrap-around padding is needed.
+        side = math.isqrt(min(chunk_size, len(pixels) - idx))
+        frame: NDArray[np.uint8] = pixels[idx : idx + side * side].reshape(side, side)
+        yield frame
 
 
 def detect_faces(image: Image.Image) -> list[tuple[int, int, int, int]]:
@@ -70,46 +209,570 @@ def align_faces(image: Image.Image, faces: list[tuple[int, int, int, int]]) -> l
     return aligned
 
 
-def extract_mfcc(audio_bytes: bytes, sample_rate: int = 16000) -> NDArray[np.float_]:
-    """Simulate MFCC extraction using simple FFT-based features."""
+def stack_face_crops(crops: list[Image.Image], side: int) -> NDArray[np.uint8]:
+    """Resize face crops to ``side`` x ``side`` and stack them into one (N, S, S, 3) array."""
+    if side <= 0:
+        raise ValueError("side must be positive")
+    batch = np.empty((len(crops), side, side, 3), dtype=np.uint8)
+    for idx, crop in enumerate(crops):
+        resized = crop if crop.size == (side, side) else crop.resize((side, side))
+        batch[idx] = np.asarray(resized.convert("RGB"))
+    logger.debug("Stacked %d face crops at %dx%d", len(crops), side, side)
+    return batch
+
+
+def pad_face_crops(crops: list[Image.Image]) -> NDArray[np.uint8]:
+    """Stack crops at native resolution into one zero-padded (N, H, W, 3) array.
+
+    Each crop fills the top-left corner of its slot; ``H`` and ``W`` are the
+    largest crop height and width, so nothing is resampled.
+    """
+    height = max((crop.size[1] for crop in crops), default=0)
+    width = max((crop.size[0] for crop in crops), default=0)
+    batch = np.zeros((len(crops), height, width, 3), dtype=np.uint8)
+    for idx, crop in enumerate(crops):
+        batch[idx, : crop.size[1], : crop.size[0]] = np.asarray(crop.convert("RGB"))
+    logger.debug("Padded %d face crops to %dx%d", len(crops), width, height)
+    return batch
+
+
+def extract_mfcc(
+    audio_bytes: ByteSource, sample_rate: int = ANALYSIS_SAMPLE_RATE
+) -> NDArray[np.float32]:
+    """Frame-level MFCCs of a WAV or raw 16-bit PCM payload, shaped (frames, 13).
+
+    An empty payload yields a single zeroed frame.
+    """
     if sample_rate <= 0:
         raise ValueError("sample_rate must be positive")
     if not audio_bytes:
         logger.warning("Empty audio payload; returning zeroed MFCC")
-        return np.zeros((1, 13), dtype=np.float_)
-    if len(audio_bytes) % 2:
-        audio_bytes += b"\x00"
-    audio_signal: NDArray[np.int16] = np.frombuffer(audio_bytes, dtype=np.int16)
-    if audio_signal.size == 0:
-        return np.zeros((1, 13), dtype=np.float_)
-    spectrum: NDArray[np.float_] = np.abs(np.fft.rfft(audio_signal))
-    bins = np.array_split(spectrum, 13)
-    mfcc = np.array([np.mean(bin_) if bin_.size else 0.0 for bin_ in bins], dtype=np.float_)
+        return np.zeros((1, MFCC_COEFFICIENTS), dtype=np.float32)
+    blocks = iter_audio_blocks(audio_bytes, sample_rate)
+    mfcc = np.concatenate(list(iter_mfcc(blocks, sample_rate)))
     logger.debug("MFCC shape: %s", mfcc.shape)
-    return mfcc.reshape(1, -1)
+    return mfcc
+
+
+def decode_pcm16(audio_bytes: ByteSource) -> NDArray[np.int16]:
+    """View raw bytes as 16-bit PCM samples without copying (except an odd tail)."""
+    audio_signal: NDArray[np.int16] = np.frombuffer(
+        audio_bytes, dtype=np.int16, count=len(audio_bytes) // 2
+    )
+    if len(audio_bytes) % 2:
+        # A trailing odd byte is the low byte of a zero-padded final sample.
+        audio_signal = np.append(audio_signal, np.int16(audio_bytes[-1]))
+    return audio_signal
+
+
+def is_wav(audio_bytes: ByteSource) -> bool:
+    """Whether the payload starts with a RIFF/WAVE header."""
+    return bytes(audio_bytes[:4]) == b"RIFF" and bytes(audio_bytes[8:12]) == b"WAVE"
+
+
+def iter_audio_blocks(
+    audio_bytes: ByteSource,
+    target_rate: int | None = ANALYSIS_SAMPLE_RATE,
+    chunk_frames: int = AUDIO_CHUNK_FRAMES,
+) -> Iterator[NDArray[Any]]:
+    """Stream an audio payload as consecutive blocks of mono samples.
+
+    WAV payloads (8-, 16-, 24-, or 32-bit integer PCM with any channel count) are
+    decoded through ``wave`` ``chunk_frames`` sample frames at a time, downmixed by
+    averaging channels, and resampled to ``target_rate`` by a streaming
+    ``PolyphaseResampler`` (``None`` keeps the file's own rate); blocks are float32
+    scaled to the 16-bit range whatever the source width. Any other payload is raw
+    16-bit mono PCM taken to be at ``target_rate`` already and is yielded as a
+    single zero-copy int16 view.
+
+    Raises:
+        ValueError: If a WAV header is present but cannot be decoded.
+    """
+    if target_rate is not None and target_rate <= 0:
+        raise ValueError("target_rate must be positive")
+    if chunk_frames <= 0:
+        raise ValueError("chunk_frames must be positive")
+    if not is_wav(audio_bytes):
+        # Raw PCM needs no decoding: one view over the (possibly mapped) upload.
+        yield decode_pcm16(audio_bytes)
+        return
+    with _open_wav(audio_bytes) as wav_file:
+        channels, width = wav_file.getnchannels(), wav_file.getsampwidth()
+        if width not in _PCM_SCALES:
+            raise ValueError(f"Unsupported WAV sample width: {8 * width} bits")
+        source_rate = wav_file.getframerate()
+        resampler = PolyphaseResampler(source_rate, target_rate or source_rate)
+        frame_bytes = channels * width
+        while chunk := wav_file.readframes(chunk_frames):
+            usable = len(chunk) - len(chunk) % frame_bytes
+            samples = _decode_pcm(chunk[:usable], width).reshape(-1, channels).mean(axis=1)
+            yield resampler.process(samples)
+    yield resampler.flush()
+
+
+def _decode_pcm(data: bytes, width: int) -> NDArray[np.float32]:
+    if width == 1:
+        # 8-bit WAV samples are unsigned with a midpoint of 128.
+        raw = np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128
+    elif width == 3:
+        padded = np.zeros((len(data) // 3, 4), dtype=np.uint8)
+        padded[:, 1:] = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        raw = (padded.view("<i4")[:, 0] >> 8).astype(np.float32)
+    else:
+        raw = np.frombuffer(data, dtype=f"<i{width}").astype(np.float32)
+    samples: NDArray[np.float32] = raw * np.float32(_PCM_SCALES[width])
+    return samples
+
+
+@contextmanager
+def _open_wav(audio_bytes: ByteSource) -> Iterator[wave.Wave_read]:
+    """Open a WAV payload without copying it, mapping decoder errors to ``ValueError``."""
+    with _BufferReader(audio_bytes) as reader:
+        try:
+            with wave.open(reader, "rb") as wav_file:  # type: ignore[call-overload]
+                yield wav_file
+        except (wave.Error, EOFError) as exc:
+            raise ValueError(f"Invalid WAV file: {exc}") from exc
+
+
+class PolyphaseResampler:
+    """Streaming rational-ratio resampler for float32 sample blocks.
 
+    The rate ratio is reduced to ``up / down`` and a Kaiser-windowed sinc low-pass
+    filter is split into ``up`` phases. Each output sample is one phase applied to
+    the latest input samples, evaluated for a whole block at once; the inputs a
+    later output still needs are carried over, so feeding blocks one by one and
+    then calling ``flush`` matches resampling the concatenated signal.
+    """
 
-def parse_wav(audio_bytes: bytes) -> tuple[NDArray[np.int16], int]:
-    """Parse WAV bytes into numpy array and sample rate."""
+    def __init__(self, source_rate: int, target_rate: int) -> None:
+        if source_rate <= 0 or target_rate <= 0:
+            raise ValueError("sample rates must be positive")
+        common = math.gcd(source_rate, target_rate)
+        self.up = target_rate // common
+        self.down = source_rate // common
+        self._phases, self._delay = _polyphase_filter(self.up, self.down)
+        taps = self._phases.shape[1]
+        # Carried input samples, starting at input index ``_start``; the filter
+        # history before the first sample is zeros.
+        self._pending = np.zeros(taps - 1, dtype=np.float32)
+        self._start = 1 - taps
+        self._received = 0
+        self._produced = 0
+
+    def process(self, block: NDArray[np.float32]) -> NDArray[np.float32]:
+        """Resample the next block, returning every output sample it completes."""
+        self._received += len(block)
+        if self.up == self.down:
+            return block
+        self._pending = np.concatenate((self._pending, block))
+        last = self._start + len(self._pending) - 1
+        return self._emit((last * self.up + self.up - 1 - self._delay) // self.down + 1)
+
+    def flush(self) -> NDArray[np.float32]:
+        """Return the outputs that depend on samples past the end of the input."""
+        if self.up == self.down:
+            return np.zeros(0, dtype=np.float32)
+        tail = self._phases.shape[1] + self._delay // self.up + 1
+        self._pending = np.concatenate((self._pending, np.zeros(tail, dtype=np.float32)))
+        return self._emit(-(-self._received * self.up // self.down))
+
+    def _emit(self, stop: int) -> NDArray[np.float32]:
+        taps = self._phases.shape[1]
+        windows = sliding_window_view(self._pending, taps)
+        resampled = np.empty(max(0, stop - self._produced), dtype=np.float32)
+        # Gathered windows and phases take 2 * taps floats per output, so outputs
+        # are evaluated in batches to keep them cache-sized.
+        for offset in range(0, resampled.size, RESAMPLE_BATCH):
+            outputs = np.arange(offset, min(offset + RESAMPLE_BATCH, resampled.size))
+            positions = (self._produced + outputs) * self.down + self._delay
+            starts = positions // self.up - (taps - 1) - self._start
+            phases = self._phases[positions % self.up]
+            resampled[outputs] = np.einsum("mk,mk->m", windows[starts], phases)
+        self._produced += resampled.size
+        needed = (self._produced * self.down + self._delay) // self.up - (taps - 1)
+        drop = max(0, needed - self._start)
+        self._pending = self._pending[drop:]
+        self._start += drop
+        return resampled
+
+
+@lru_cache(maxsize=8)
+def _polyphase_filter(up: int, down: int) -> tuple[NDArray[np.float32], int]:
+    """Low-pass filter phases shaped (up, taps), each reversed for a forward dot
+    product with input windows, plus the filter's group delay in upsampled samples."""
+    factor = max(up, down)
+    half = RESAMPLE_ZERO_CROSSINGS * factor
+    offsets = np.arange(-half, half + 1)
+    kernel = np.sinc(offsets / factor) * np.kaiser(offsets.size, RESAMPLE_KAISER_BETA)
+    kernel *= up / kernel.sum()
+    taps = -(-kernel.size // up)
+    padded = np.zeros(taps * up)
+    padded[: kernel.size] = kernel
+    phases = padded.reshape(taps, up).T[:, ::-1].astype(np.float32)
+    phases.setflags(write=False)
+    return phases, half
+
+
+@dataclass
+class VoiceActivity:
+    """Energy and zero-crossing-rate voice activity gate over STFT frames.
+
+    A frame is speech when its energy is above ``energy_floor_db`` and either its
+    zero-crossing rate is at most ``max_zcr`` (voiced sound) or its energy clears
+    the floor by ``loud_margin_db`` (loud fricatives), so quiet broadband noise
+    such as line hiss is gated out. Speech is held for ``hangover`` frames after it
+    stops so word endings survive. ``gate`` keeps state and running counts across
+    calls, so consecutive batches are gated as one stream.
+    """
+
+    energy_floor_db: float = VAD_ENERGY_FLOOR_DB
+    loud_margin_db: float = VAD_LOUD_MARGIN_DB
+    max_zcr: float = VAD_MAX_ZCR
+    hangover: int = VAD_HANGOVER_FRAMES
+    frames: int = 0
+    speech_frames: int = 0
+    # Frames since the last active frame; starts beyond any hangover.
+    _since_speech: int = field(default=1 << 31, init=False, repr=False)
+
+    @property
+    def speech_ratio(self) -> float:
+        """Share of the gated frames kept as speech."""
+        return self.speech_frames / self.frames if self.frames else 0.0
+
+    def gate(self, frames: NDArray[Any]) -> NDArray[np.bool_]:
+        """Speech mask for a (frames, samples) batch, counted into the running totals."""
+        samples = frames.astype(np.float32)
+        power = np.einsum("ij,ij->i", samples, samples) / max(1, frames.shape[1])
+        energy_db = 10 * np.log10(power / _FULL_SCALE_POWER + 1e-12)
+        active = energy_db > self.energy_floor_db + self.loud_margin_db
+        # The zero-crossing rate only decides frames between the floor and the
+        # loud margin, so it is computed for those alone.
+        (quiet,) = np.nonzero((energy_db > self.energy_floor_db) & ~active)
+        if quiet.size:
+            crossings = np.count_nonzero(np.diff(np.signbit(samples[quiet]), axis=1), axis=1)
+            active[quiet] = crossings <= self.max_zcr * (frames.shape[1] - 1)
+        # Frames since the latest active frame, continuing the count from the
+        # previous batch; frames within the hangover are kept.
+        positions = np.arange(len(frames))
+        latest = np.maximum.accumulate(np.where(active, positions, -self._since_speech))
+        since = positions - latest
+        speech: NDArray[np.bool_] = since <= self.hangover
+        if len(frames):
+            self._since_speech = int(since[-1]) + 1
+        self.frames += len(frames)
+        self.speech_frames += int(np.count_nonzero(speech))
+        return speech
+
+
+def frame_signal(audio_signal: NDArray[FrameT], frame_length: int, hop: int) -> NDArray[FrameT]:
+    """Overlapping ``frame_length`` windows every ``hop`` samples, as a read-only view.
+
+    Samples after the last whole window are dropped; a signal shorter than one
+    window is zero-padded to a single frame (the only case that copies).
+    """
+    if frame_length <= 0 or hop <= 0:
+        raise ValueError("frame_length and hop must be positive")
+    if audio_signal.size < frame_length:
+        audio_signal = np.pad(audio_signal, (0, frame_length - audio_signal.size))
+    frames: NDArray[FrameT] = sliding_window_view(audio_signal, frame_length)[::hop]
+    return frames
+
+
+def iter_mfcc(
+    blocks: Iterable[NDArray[Any]],
+    sample_rate: int = ANALYSIS_SAMPLE_RATE,
+    n_fft: int = STFT_FFT_SIZE,
+    hop: int = STFT_HOP,
+    n_mels: int = MEL_BANDS,
+    n_mfcc: int = MFCC_COEFFICIENTS,
+    block_frames: int = STFT_BLOCK_FRAMES,
+    activity: VoiceActivity | None = None,
+) -> Iterator[NDArray[np.float32]]:
+    """Yield MFCCs of a signal delivered as consecutive sample blocks.
+
+    Frames are Hann-windowed views of the samples, transformed with one batched
+    ``rfft`` per ``block_frames`` frames, pooled by a mel filterbank and
+    decorrelated with a DCT; the filterbank and DCT matrices are built once per
+    configuration. Samples after a block's last whole frame are carried into the
+    next block, so the frames match framing the concatenated signal, and working
+    memory is bounded by the block sizes regardless of the signal length. With
+    ``activity``, frames it gates as silence are dropped before the ``rfft``.
+
+    Yields:
+        float32 arrays shaped (frames, ``n_mfcc``) in playback order.
+    """
+    if block_frames <= 0:
+        raise ValueError("block_frames must be positive")
+    window = _hann_window(n_fft)
+    filterbank = _mel_filterbank(sample_rate, n_fft, n_mels)
+    dct = _dct_matrix(n_mfcc, n_mels)
+
+    def transform(frames: NDArray[Any]) -> Iterator[NDArray[np.float32]]:
+        for start in range(0, len(frames), block_frames):
+            batch = frames[start : start + block_frames]
+            if activity is not None:
+                speech = activity.gate(batch)
+                if not speech.all():
+                    batch = batch[speech]
+                if not len(batch):
+                    continue
+            spectrum = np.fft.rfft(batch * window)
+            power = (spectrum.real**2 + spectrum.imag**2).astype(np.float32)
+            mfcc: NDArray[np.float32] = np.log(power @ filterbank.T + LOG_FLOOR) @ dct.T
+            yield mfcc
+
+    carry: NDArray[Any] = np.zeros(0, dtype=np.float32)
+    framed = False
+    for block in blocks:
+        stream = np.concatenate((carry, block)) if carry.size else block
+        if stream.size < n_fft:
+            carry = stream
+            continue
+        frames = frame_signal(stream, n_fft, hop)
+        yield from transform(frames)
+        framed = True
+        carry = stream[len(frames) * hop :]
+    if not framed:
+        yield from transform(frame_signal(carry, n_fft, hop))
+
+
+@lru_cache(maxsize=8)
+def _hann_window(n_fft: int) -> NDArray[np.float32]:
+    window = np.hanning(n_fft).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> NDArray[np.float32]:
+    """Triangular filters on the HTK mel scale, shaped (n_mels, n_fft // 2 + 1)."""
+    if sample_rate <= 0 or n_fft <= 0 or n_mels <= 0:
+        raise ValueError("sample_rate, n_fft, and n_mels must be positive")
+    top = 2595 * math.log10(1 + sample_rate / 2 / 700)
+    edges = 700 * (10 ** (np.linspace(0, top, n_mels + 2) / 2595) - 1)
+    freqs = np.linspace(0, sample_rate / 2, n_fft // 2 + 1)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    filterbank = np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+    filterbank.setflags(write=False)
+    return filterbank
+
+
+@lru_cache(maxsize=8)
+def _dct_matrix(n_mfcc: int, n_mels: int) -> NDArray[np.float32]:
+    """Orthonormal DCT-II basis, shaped (n_mfcc, n_mels)."""
+    if not 0 < n_mfcc <= n_mels:
+        raise ValueError("n_mfcc must be positive and at most n_mels")
+    basis = np.cos(np.pi * np.arange(n_mfcc)[:, None] * (2 * np.arange(n_mels) + 1) / (2 * n_mels))
+    basis *= math.sqrt(2 / n_mels)
+    basis[0] /= math.sqrt(2)
+    matrix: NDArray[np.float32] = basis.astype(np.float32)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def parse_wav(audio_bytes: ByteSource) -> tuple[NDArray[np.float32], int]:
+    """Decode a whole WAV file into mono samples at its own sample rate.
+
+    Use ``iter_audio_blocks`` for long recordings; this concatenates every chunk.
+    """
     if not audio_bytes:
         raise ValueError("No audio content provided")
-    with wave.open(io.BytesIO(audio_bytes), "rb") as wav_file:
+    if not is_wav(audio_bytes):
+        raise ValueError("Invalid WAV file: missing RIFF/WAVE header")
+    with _open_wav(audio_bytes) as wav_file:
         sample_rate = wav_file.getframerate()
-        frames = wav_file.readframes(wav_file.getnframes())
-    audio_array: NDArray[np.int16] = np.frombuffer(frames, dtype=np.int16)
+    audio_array = np.concatenate([np.zeros(0, np.float32), *iter_audio_blocks(audio_bytes, None)])
     logger.info("Parsed WAV with %d samples at %d Hz", audio_array.size, sample_rate)
     return audio_array, sample_rate
 
 
 def batch_frames(
-    frames: list[NDArray[np.float32]], batch_size: int = 8
-) -> list[list[NDArray[np.float32]]]:
-    """Group frames into temporal batches for analysis."""
+    frames: Iterable[NDArray[FrameT]],
+    batch_size: int = 8,
+    max_batch_bytes: int | None = None,
+) -> Iterator[NDArray[FrameT]]:
+    """Stack consecutive equal-shaped frames into (B, H, W) temporal batches.
+
+    A batch ends after ``batch_size`` frames, before a frame of a different shape
+    or dtype, or when another frame would exceed ``max_batch_bytes`` (every batch
+    holds at least one frame). Frames are copied into the batch as they arrive, so only the
+    batch being filled is buffered; frames too large to pair within the budget are
+    yielded alone as zero-copy views.
+    """
     if batch_size <= 0:
         raise ValueError("batch_size must be positive")
-    batches = [frames[i : i + batch_size] for i in range(0, len(frames), batch_size)]
-    logger.debug("Created %d frame batches", len(batches))
-    return batches
+    batch: NDArray[FrameT] | None = None
+    filled = 0
+    for frame in frames:
+        if batch is not None and (
+            filled == len(batch) or frame.shape != batch.shape[1:] or frame.dtype != batch.dtype
+        ):
+            yield batch[:filled]
+            batch = None
+        if batch is None:
+            capacity = batch_size
+            if max_batch_bytes is not None:
+                capacity = max(1, min(batch_size, max_batch_bytes // max(1, frame.nbytes)))
+            if capacity == 1:
+                yield frame[np.newaxis]
+                continue
+            batch = np.empty((capacity, *frame.shape), dtype=frame.dtype)
+            filled = 0
+        batch[filled] = frame
+        filled += 1
+    if batch is not None:
+        yield batch[:filled]
+
+
+def block_average(frames: NDArray[np.uint8], factor: int) -> NDArray[np.float32]:
+    """Average non-overlapping ``factor`` x ``factor`` blocks of ``(..., H, W)`` frames.
+
+    This is one level of a box-filter pyramid per power of two. Trailing rows and
+    columns that do not fill a whole block are dropped.
+    """
+    if factor <= 0:
+        raise ValueError("factor must be positive")
+    height = frames.shape[-2] // factor
+    width = frames.shape[-1] // factor
+    lead = frames.shape[:-2]
+    cropped = frames[..., : height * factor, : width * factor]
+    # Block sums of up to 16 x 16 pixels fit in uint16. Rows are summed first, as
+    # whole contiguous rows, so the columns are only reduced over 1 / factor of the
+    # data.
+    dtype = np.uint16 if factor <= 16 else np.uint32
+    blocks = cropped.reshape(*lead, height, factor, width * factor).sum(axis=-2, dtype=dtype)
+    if factor & (factor - 1):
+        blocks = blocks.reshape(*lead, height, width, factor).sum(axis=-1, dtype=dtype)
+    # For powers of two, adding the columns pairwise reads whole rows instead of
+    # reducing many short runs, as in ``block_spread``.
+    while blocks.shape[-1] > width:
+        blocks = blocks[..., ::2] + blocks[..., 1::2]
+    averaged: NDArray[np.float32] = blocks.astype(np.float32) / (factor * factor)
+    return averaged
+
+
+def block_spread(frames: NDArray[np.uint8], factor: int) -> NDArray[np.float32]:
+    """Half the value range of each block ``block_average`` averages.
+
+    It bounds the mean absolute deviation of a block's pixels from their average.
+    """
+    if factor <= 0:
+        raise ValueError("factor must be positive")
+    height = frames.shape[-2] // factor
+    width = frames.shape[-1] // factor
+    lead = frames.shape[:-2]
+    rows = frames[..., : height * factor, : width * factor].reshape(
+        *lead, height, factor, width * factor
+    )
+    high = rows.max(axis=-2)
+    low = rows.min(axis=-2)
+    if factor & (factor - 1):
+        high = high.reshape(*lead, height, width, factor).max(axis=-1)
+        low = low.reshape(*lead, height, width, factor).min(axis=-1)
+    # For powers of two, halving the columns pairwise reads whole rows instead of
+    # reducing many short runs.
+    while high.shape[-1] > width:
+        high = np.maximum(high[..., ::2], high[..., 1::2])
+        low = np.minimum(low[..., ::2], low[..., 1::2])
+    spread: NDArray[np.float32] = np.subtract(high, low).astype(np.float32) / 2
+    return spread
+
+
+def probe_frame(frame: NDArray[np.uint8], side: int = 32) -> NDArray[np.uint8]:
+    """Nearest-neighbour ``side`` x ``side`` luminance thumbnail of a frame.
+
+    Only ``side * side`` pixels are read, so probing costs the same for any frame
+    size; frames of different shapes yield comparable thumbnails.
+    """
+    rows, cols = _probe_grid(frame.shape[0], frame.shape[1], side)
+    thumbnail: NDArray[np.uint8] = frame[rows, cols]
+    return thumbnail
+
+
+@lru_cache(maxsize=32)
+def _probe_grid(height: int, width: int, side: int) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    if side <= 0:
+        raise ValueError("side must be positive")
+    rows = np.linspace(0, height - 1, side).astype(np.intp)[:, np.newaxis]
+    cols = np.linspace(0, width - 1, side).astype(np.intp)
+    return rows, cols
+
+
+def plan_frame_samples(
+    frames: Iterable[NDArray[np.uint8]],
+    budget: int,
+    keep_above: float | None = None,
+    probe_side: int = 32,
+) -> list[int]:
+    """Choose up to ``budget`` frame positions, dense around scene changes.
+
+    Every candidate frame is reduced to a ``probe_frame`` thumbnail, and each gap
+    between neighbours is scored by the thumbnails' mean absolute difference, an
+    estimate of the full frames' difference. Gaps scoring above ``keep_above``
+    keep both of their frames first, strongest first, so cuts and glitches are
+    never stepped over. The remaining budget goes to splitting the segment with the
+    most weight (gap scores plus a uniform floor of their average) at its weighted
+    midpoint, so busy stretches are sampled densely and static ones sparsely.
+
+    Returns:
+        Sorted candidate positions, always including the first and last; every
+        position when ``budget`` covers them all.
+    """
+    if budget <= 0:
+        raise ValueError("budget must be positive")
+    probes = np.array([probe_frame(frame, probe_side) for frame in frames], dtype=np.int16)
+    count = len(probes)
+    if count <= budget:
+        return list(range(count))
+    if budget == 1:
+        return [0]
+    change = np.abs(np.diff(probes, axis=0)).mean(axis=(1, 2))
+    selected = {0, count - 1}
+    if keep_above is not None:
+        for gap in np.argsort(change, kind="stable")[::-1].tolist():
+            if change[gap] <= keep_above:
+                break
+            pair = {gap, gap + 1}
+            if len(selected | pair) <= budget:
+                selected |= pair
+    weights = change + max(float(change.mean()), 1e-9)
+    cumulative = np.concatenate(([0.0], np.cumsum(weights)))
+    bounds = sorted(selected)
+    heap = [
+        (-(cumulative[stop] - cumulative[start]), start, stop)
+        for start, stop in zip(bounds, bounds[1:], strict=False)
+        if stop - start > 1
+    ]
+    heapq.heapify(heap)
+    while heap and len(selected) < budget:
+        _, start, stop = heapq.heappop(heap)
+        middle = (cumulative[start] + cumulative[stop]) / 2
+        split = int(np.searchsorted(cumulative, middle))
+        if middle - cumulative[split - 1] < cumulative[split] - middle:
+            split -= 1
+        split = min(max(split, start + 1), stop - 1)
+        selected.add(split)
+        for left, right in ((start, split), (split, stop)):
+            if right - left > 1:
+                heapq.heappush(heap, (-(cumulative[right] - cumulative[left]), left, right))
+    return sorted(selected)
+
+
+def select_frames(
+    frames: Iterable[NDArray[FrameT]], positions: Iterable[int]
+) -> Iterator[NDArray[FrameT]]:
+    """Yield the frames at sorted ``positions``, skipping the others."""
+    wanted = iter(positions)
+    target = next(wanted, None)
+    for index, frame in enumerate(frames):
+        if target is None:
+            return
+        if index == target:
+            yield frame
+            target = next(wanted, None)
 
 
 def normalize_image(image: Image.Image) -> NDArray[np.float32]:
@@ -119,6 +782,39 @@ def normalize_image(image: Image.Image) -> NDArray[np.float32]:
     return array
 
 
+def load_score_matrix(file_bytes: ByteSource, columns: int) -> NDArray[Any]:
+    """View an N x ``columns`` numeric ``.npy`` payload in place, without copying.
+
+    Only the header is parsed; the returned array borrows ``file_bytes``, so it
+    must not outlive the buffer.
+
+    Raises:
+        ValueError: If the payload is not a finite numeric ``.npy`` matrix of that width.
+    """
+    header_readers = {
+        (1, 0): np.lib.format.read_array_header_1_0,
+        (2, 0): np.lib.format.read_array_header_2_0,
+    }
+    try:
+        with _BufferReader(file_bytes) as reader:
+            version = np.lib.format.read_magic(reader)  # type: ignore[no-untyped-call]
+            shape, fortran_order, dtype = header_readers[version](reader)  # type: ignore[no-untyped-call]
+            offset = reader.tell()
+    except (ValueError, KeyError, SyntaxError) as exc:
+        raise ValueError("Score matrix must be a .npy file") from exc
+    if dtype.kind not in "fiu" or len(shape) != 2 or shape[1] != columns:
+        raise ValueError(f"Score matrix must be a numeric N x {columns} array")
+    count = shape[0] * shape[1]
+    if len(file_bytes) - offset < count * dtype.itemsize:
+        raise ValueError("Score matrix is truncated")
+    matrix = np.frombuffer(file_bytes, dtype, count, offset).reshape(
+        shape, order="F" if fortran_order else "C"
+    )
+    if dtype.kind == "f" and not np.isfinite(matrix).all():
+        raise ValueError("Score matrix must not contain NaN or infinite values")
+    return matrix
+
+
 def validate_upload(filename: str | None) -> None:
     """Basic validation to prevent suspicious uploads."""
     if not filename:
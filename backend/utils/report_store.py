@@ -0,0 +1,124 @@
+"""Content-addressed store for deferred PDF reports.
+
+Analysis endpoints only register a report specification (summary plus anomalies)
+and return its ID; the PDF is rendered on first download or in a background task.
+Identical specifications share one ID, so repeated analyses of the same content
+render at most once. Specifications and PDFs expire after a retention period that
+is refreshed each time the report is registered again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from .config import get_settings
+from .file_store import CONTENT_ID_PATTERN, FileStore
+from .logger import get_logger
+from .pdf_export import export_report
+
+logger = get_logger(__name__)
+
+REPORT_ID_PATTERN = CONTENT_ID_PATTERN
+
+
+class ReportNotFoundError(LookupError):
+    """Raised when a report ID is malformed, unknown, or expired."""
+
+
+class ReportStore(FileStore):
+    """Report specifications and rendered PDFs keyed by content hash."""
+
+    not_found = ReportNotFoundError
+    sidecar_suffixes = (".pdf",)
+    entry_noun = "reports"
+
+    @staticmethod
+    def report_id(summary: dict[str, str], anomalies: list[str]) -> str:
+        """Derive the content-addressed ID of a report specification."""
+        material = json.dumps({"summary": summary, "anomalies": anomalies}, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def register(self, summary: dict[str, str], anomalies: list[str]) -> str:
+        """Record a report specification without rendering it; returns its ID."""
+        report_id = self.report_id(summary, anomalies)
+        self._refresh_or_write(
+            self._spec_path(report_id),
+            json.dumps({"summary": summary, "anomalies": anomalies}).encode(),
+        )
+        self.count_write()
+        return report_id
+
+    def render(self, report_id: str) -> Path:
+        """Return the PDF for ``report_id``, rendering it on first request.
+
+        An expired specification is deleted along with its PDF; a PDF older than
+        the retention period is rendered again. Concurrent renders of the same
+        report race benignly: each writes a private temporary file and the last
+        rename wins.
+
+        Raises:
+            ReportNotFoundError: If the ID is malformed, unknown, or expired.
+        """
+        spec_path = self._spec_path(report_id)
+        pdf_path = spec_path.with_suffix(".pdf")
+        cutoff = self._cutoff()
+        try:
+            if self._expired(spec_path, cutoff):
+                self._delete(spec_path)
+                raise ReportNotFoundError(report_id)
+            spec: dict[str, Any] = json.loads(spec_path.read_text())
+        except FileNotFoundError as exc:
+            raise ReportNotFoundError(report_id) from exc
+        try:
+            if not self._expired(pdf_path, cutoff):
+                return pdf_path
+        except FileNotFoundError:
+            pass
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            export_report(Path(tmp_name), spec["summary"], spec["anomalies"])
+            os.replace(tmp_name, pdf_path)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+        return pdf_path
+
+
+_store: ReportStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_report_store() -> ReportStore:
+    """Return the process-wide report store configured from settings."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            settings = get_settings()
+            _store = ReportStore(
+                Path(settings.report_dir), retention_seconds=settings.report_retention_seconds
+            )
+        return _store
+
+
+def register_report(summary: dict[str, str], anomalies: list[str]) -> str:
+    """Register a report with the process-wide store and return its ID.
+
+    Blocks on the filesystem; async callers run it in a thread.
+    """
+    return get_report_store().register(summary, anomalies)
+
+
+def render_report(report_id: str) -> Path:
+    """Render (or reuse) a report; picklable entry point for executor workers."""
+    return get_report_store().render(report_id)
+
+
+def report_url(report_id: str) -> str:
+    """Return the download path of a report."""
+    return f"/reports/{report_id}"
@@ -0,0 +1,130 @@
+"""Size-bounded upload spooling with memory-mapped hand-off to the engines."""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, BinaryIO
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds its modality size limit."""
+
+
+@dataclass(frozen=True)
+class SpooledUpload:
+    """Upload payload kept in memory when small or spilled to a temp file when large.
+
+    Instances are cheap to pickle: large payloads travel to executor workers as a
+    file path and are memory-mapped there instead of being copied.
+    """
+
+    size: int
+    data: bytes | None = None
+    path: str | None = None
+    sha256: str = ""
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SpooledUpload:
+        """Wrap an in-memory payload."""
+        return cls(size=len(data), data=data, sha256=hashlib.sha256(data).hexdigest())
+
+    @contextmanager
+    def open_buffer(self) -> Iterator[memoryview]:
+        """Yield a read-only, zero-copy view of the payload.
+
+        Engines must not keep arrays derived from the view past the ``with`` block.
+        """
+        if self.path is None or self.size == 0:
+            view = memoryview(self.data or b"")
+            try:
+                yield view
+            finally:
+                view.release()
+            return
+        with open(self.path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:  # pragma: no cover - a caller leaked a derived array
+                logger.warning("Upload buffer still referenced; leaving unmap to GC")
+
+    def discard(self) -> None:
+        """Delete the spill file, if any."""
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def spool_stream(
+    stream: BinaryIO,
+    limit: int,
+    threshold: int,
+    chunk_size: int,
+    spool_dir: str | None = None,
+) -> SpooledUpload:
+    """Copy ``stream`` chunk by chunk, enforcing ``limit`` while reading.
+
+    Payloads up to ``threshold`` bytes stay in memory; larger ones are written to a
+    temporary file so peak memory is one chunk regardless of upload size. The
+    SHA-256 of the content is computed in the same pass.
+
+    Args:
+        stream: Readable binary stream positioned at the start of the payload.
+        limit: Maximum number of bytes accepted.
+        threshold: Largest payload kept in memory.
+        chunk_size: Bytes read per iteration.
+        spool_dir: Directory for spill files; defaults to the system temp dir.
+
+    Returns:
+        Spooled payload; the caller owns it and must call ``discard``.
+
+    Raises:
+        UploadTooLargeError: If the stream holds more than ``limit`` bytes.
+    """
+    buffer = bytearray()
+    spill: IO[bytes] | None = None
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        while chunk := stream.read(chunk_size):
+            size += len(chunk)
+            digest.update(chunk)
+            if size > limit:
+                raise UploadTooLargeError(f"Upload exceeds limit of {limit} bytes")
+            if spill is None and size > threshold:
+                spill = tempfile.NamedTemporaryFile(
+                    prefix="dfs-upload-", dir=spool_dir, delete=False
+                )
+                spill.write(buffer)
+                buffer = bytearray()
+            if spill is not None:
+                spill.write(chunk)
+            else:
+                buffer += chunk
+    except BaseException:
+        if spill is not None:
+            spill.close()
+            os.unlink(spill.name)
+        raise
+    if spill is None:
+        return SpooledUpload(size=size, data=bytes(buffer), sha256=digest.hexdigest())
+    spill.close()
+    logger.info("Spooled %d byte upload to disk", size)
+    return SpooledUpload(size=size, path=spill.name, sha256=digest.hexdigest())
@@ -0,0 +1,75 @@
+"""Compare full and adaptive frame sampling on a synthetic scene-cut corpus.
+
+Each synthetic video holds a few static scenes (one image plus mild noise per
+frame) with hard cuts between them and isolated glitch frames. The full path
+analyzes every candidate frame; the adaptive path analyzes ``--budget`` frames
+chosen by ``plan_frame_samples``. Recall is the share of the full path's
+flagged frames that the adaptive path also flags.
+
+Usage:
+    python -m benchmarks.bench_adaptive_sampling --budget 16 --side 128
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from backend.engines.temporal_detector import analyze_frames, analyze_media_frames
+from backend.utils.media import MediaContext
+
+CANDIDATE_COUNTS = (64, 256, 1024)
+
+
+def _synthetic_video(count: int, side: int, seed: int) -> bytes:
+    """Frames of ``side`` x ``side`` bytes with cuts every ~count/4 frames and glitches."""
+    rng = np.random.default_rng(seed)
+    cuts = sorted(rng.choice(np.arange(1, count), size=3, replace=False).tolist())
+    glitches = set(rng.choice(np.arange(1, count - 1), size=2, replace=False).tolist())
+    scene = rng.integers(0, 256, (side, side))
+    frames = []
+    for index in range(count):
+        if index in cuts:
+            scene = rng.integers(0, 256, (side, side))
+        if index in glitches:
+            frames.append(rng.integers(0, 256, (side, side), dtype=np.uint8))
+            continue
+        noise = rng.integers(-3, 4, (side, side))
+        frames.append(np.clip(scene + noise, 0, 255).astype(np.uint8))
+    return b"".join(frame.tobytes() for frame in frames)
+
+
+def main() -> None:
+    """Run the benchmark and print time, frames analyzed, and recall per video length."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=16)
+    parser.add_argument("--side", type=int, default=128, help="frame side length in pixels")
+    parser.add_argument("--videos", type=int, default=5, help="synthetic videos per length")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for count in CANDIDATE_COUNTS:
+        full_time = adaptive_time = 0.0
+        expected = found = 0
+        for seed in range(args.videos):
+            media = MediaContext(_synthetic_video(count, args.side, seed), "video")
+            started = time.perf_counter()
+            full = analyze_frames(media.iter_frames(count))
+            full_time += time.perf_counter() - started
+            started = time.perf_counter()
+            adaptive = analyze_media_frames(media, fps=count, frame_budget=args.budget)
+            adaptive_time += time.perf_counter() - started
+            expected += len(full.flagged_frames)
+            found += len(set(full.flagged_frames) & set(adaptive.flagged_frames))
+        print(
+            f"{count:>5} candidates: full {full_time / args.videos * 1000:7.1f} ms"
+            f" ({count} frames) | adaptive {adaptive_time / args.videos * 1000:7.1f} ms"
+            f" ({min(count, args.budget)} frames) | recall {found}/{expected}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare whole-signal and framed STFT/MFCC audio analysis on long clips.
+
+The legacy path reproduces the previous feature extractor: one ``rfft`` over the
+whole signal pooled into 13 band means. The framed path is ``analyze_audio``,
+which streams blocks of STFT frames through memoized mel and DCT matrices. Peak
+memory is measured with ``tracemalloc`` and excludes the PCM payload itself.
+Clips longer than ``--legacy-max-seconds`` skip the legacy path, whose rfft needs
+about 16 bytes per sample. With ``--wav-rate``, clips are also wrapped as 16-bit
+stereo WAV at that rate and timed through chunked decoding, downmixing, and
+resampling.
+
+Usage:
+    python -m benchmarks.bench_audio_mfcc --durations 10 600 7200 --wav-rate 44100
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import time
+import tracemalloc
+import wave
+from collections.abc import Callable
+
+import numpy as np
+
+from backend.engines.audio_detector import analyze_audio
+from backend.utils.preprocess import decode_pcm16
+
+SAMPLE_RATE = 16000
+
+
+def _legacy_features(payload: bytes) -> None:
+    spectrum = np.abs(np.fft.rfft(decode_pcm16(payload)))
+    np.array([np.mean(band) for band in np.array_split(spectrum, 13)])
+
+
+def _stereo_wav(seconds: int, rate: int, rng: np.random.Generator) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        for _ in range(seconds):
+            wav_file.writeframes(rng.integers(-3000, 3000, 2 * rate, dtype=np.int16).tobytes())
+    return buffer.getvalue()
+
+
+def _measure(run: Callable[[bytes], object], payload: bytes) -> tuple[float, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    run(payload)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1 << 20)
+
+
+def main() -> None:
+    """Run the benchmark and print time and peak memory per clip length."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--durations", type=int, nargs="+", default=[10, 600, 7200])
+    parser.add_argument("--legacy-max-seconds", type=int, default=600)
+    parser.add_argument("--wav-rate", type=int, default=44100, help="0 skips the WAV runs")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(20)
+    analyze_audio(rng.integers(-3000, 3000, SAMPLE_RATE, dtype=np.int16).tobytes())
+    for seconds in args.durations:
+        payload = rng.integers(-3000, 3000, seconds * SAMPLE_RATE, dtype=np.int16).tobytes()
+        framed_time, framed_peak = _measure(analyze_audio, payload)
+        line = (
+            f"{seconds:>6} s ({len(payload) >> 20:>4} MiB): framed {framed_time:7.2f} s"
+            f" peak {framed_peak:7.1f} MiB"
+        )
+        if seconds <= args.legacy_max_seconds:
+            legacy_time, legacy_peak = _measure(_legacy_features, payload)
+            line += f" | whole-signal {legacy_time:7.2f} s peak {legacy_peak:7.1f} MiB"
+        else:
+            line += " | whole-signal skipped"
+        print(line)
+        del payload
+        if args.wav_rate:
+            payload = _stereo_wav(seconds, args.wav_rate, rng)
+            wav_time, wav_peak = _measure(analyze_audio, payload)
+            print(
+                f"{seconds:>6} s ({len(payload) >> 20:>4} MiB): stereo WAV at {args.wav_rate} Hz"
+                f" {wav_time:7.2f} s peak {wav_peak:7.1f} MiB"
+            )
+            del payload
+
+
+if __name__ == "__main__":
+    main()
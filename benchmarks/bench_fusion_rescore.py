@@ -0,0 +1,64 @@
+"""Compare scalar and vectorized fusion when re-scoring stored component scores.
+
+The scalar path calls ``fuse_scores`` once per row, as re-scoring did before;
+it runs on at most ``--scalar-rows`` rows and is extrapolated to the full
+count. The vectorized path is ``fuse_score_matrix`` over the whole N x 4
+matrix. The end-to-end path is ``run_rescore_pipeline`` on the matrix saved as
+``.npy``, which is what ``/fusion/rescore`` executes.
+
+Usage:
+    python -m benchmarks.bench_fusion_rescore --rows 10000 1000000 5000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import time
+
+import numpy as np
+
+from backend.engines.fusion_engine import FusionWeights, fuse_score_matrix, fuse_scores
+from backend.engines.pipelines import run_rescore_pipeline
+from backend.utils.spool import SpooledUpload
+
+RETUNED = FusionWeights(vision=0.5, temporal=0.15, audio=0.15, metadata=0.2)
+
+
+def main() -> None:
+    """Run the benchmark and print re-scoring time per row count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--scalar-rows", type=int, default=20_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(24)
+    for count in args.rows:
+        components = rng.uniform(0, 100, (count, 4)).astype(np.float32)
+        sample = components[: args.scalar_rows].tolist()
+        started = time.perf_counter()
+        for row in sample:
+            fuse_scores(*row, weights=RETUNED)
+        scalar = (time.perf_counter() - started) * count / len(sample)
+
+        started = time.perf_counter()
+        fuse_score_matrix(components, RETUNED)
+        vectorized = time.perf_counter() - started
+
+        buffer = io.BytesIO()
+        np.save(buffer, components)
+        upload = SpooledUpload.from_bytes(buffer.getvalue())
+        started = time.perf_counter()
+        result = run_rescore_pipeline(upload, RETUNED, (40.0, 65.0), FusionWeights())
+        end_to_end = time.perf_counter() - started
+        print(
+            f"{count:>9} rows: scalar ~{scalar:8.2f} s | vectorized {vectorized * 1000:8.1f} ms"
+            f" ({scalar / vectorized:6.0f}x) | .npy end-to-end {end_to_end * 1000:8.1f} ms"
+            f" ({result.reclassified} reclassified)"
+        )
+
+
+if __name__ == "__main__":
+    main()
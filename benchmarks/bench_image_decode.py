@@ -0,0 +1,67 @@
+"""Compare native and capped-resolution image decoding at 1, 12, and 48 MP.
+
+Usage:
+    python -m benchmarks.bench_image_decode --max-side 2048 --format JPEG
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from backend.utils.preprocess import load_image
+
+SIZES_MP = {"1 MP": (1000, 1000), "12 MP": (3000, 4000), "48 MP": (6000, 8000)}
+
+
+def _encode(height: int, width: int, fmt: str) -> bytes:
+    """Encode a smooth synthetic photo-like gradient with mild noise."""
+    rng = np.random.default_rng(5)
+    rows = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    cols = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    base = (rows * 0.6 + cols * 0.4)[..., None] * np.array([1.0, 0.8, 0.6], dtype=np.float32)
+    noise = rng.integers(0, 8, (height, width, 1), dtype=np.uint8)
+    pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _best_of(repeats: int, data: bytes, max_side: int | None) -> tuple[float, Image.Image]:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        image = load_image(data, max_side)
+        timings.append(time.perf_counter() - started)
+    return min(timings), image
+
+
+def main() -> None:
+    """Run the benchmark and print decode time and decoded size per input."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-side", type=int, default=2048)
+    parser.add_argument("--format", default="JPEG", choices=["JPEG", "PNG"])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for label, (height, width) in SIZES_MP.items():
+        data = _encode(height, width, args.format)
+        native_time, native = _best_of(args.repeats, data, None)
+        capped_time, capped = _best_of(args.repeats, data, args.max_side)
+        print(
+            f"{label:>6} {args.format}: native {native_time * 1000:7.1f} ms"
+            f" ({native.width * native.height * 3 / 2**20:6.1f} MiB decoded)"
+            f" | max_side={args.max_side} {capped_time * 1000:7.1f} ms"
+            f" ({capped.width * capped.height * 3 / 2**20:5.1f} MiB,"
+            f" {capped.width}x{capped.height})"
+        )
+
+
+if __name__ == "__main__":
+    main()
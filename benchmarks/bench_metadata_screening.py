@@ -0,0 +1,88 @@
+"""Compare decode-based and header-only metadata analysis per image.
+
+The decode path reproduces the previous flow: open the upload with Pillow, read
+its EXIF, and decode the pixels at ``--max-side`` before scoring metadata. The
+header path is metadata screening: ``read_metadata`` on the raw bytes followed by
+``analyze_metadata``, with no pixel decoding at all.
+
+Usage:
+    python -m benchmarks.bench_metadata_screening --max-side 2048 --format JPEG
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+from functools import partial
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from backend.engines.metadata_analyzer import analyze_metadata
+from backend.utils.exif import extract_exif, read_metadata
+from backend.utils.preprocess import load_image
+
+SIZES_MP = {"1 MP": (1000, 1000), "12 MP": (3000, 4000), "48 MP": (6000, 8000)}
+
+
+def _encode(height: int, width: int, fmt: str) -> bytes:
+    """Encode a noisy gradient carrying camera EXIF tags."""
+    rng = np.random.default_rng(23)
+    rows = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    cols = np.linspace(0, 255, width, dtype=np.float32)[None, :]
+    noise = rng.integers(0, 8, (height, width), dtype=np.uint8)
+    pixels = np.clip(rows * 0.6 + cols * 0.4 + noise, 0, 255).astype(np.uint8)
+    exif = Image.Exif()
+    exif[0x010F] = "Acme"
+    exif[0x0110] = "Model 7"
+    exif[0x0132] = "2024:05:01 10:00:00"
+    exif[0x8769] = {0x9003: "2024:05:01 10:00:00", 0x829A: 1 / 125}
+    buffer = BytesIO()
+    Image.fromarray(pixels).convert("RGB").save(buffer, format=fmt, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def _decode_path(data: bytes, max_side: int) -> None:
+    metadata = extract_exif(Image.open(BytesIO(data)))
+    load_image(data, max_side)
+    analyze_metadata(metadata)
+
+
+def _header_path(data: bytes) -> None:
+    analyze_metadata(read_metadata(data))
+
+
+def _best_of(repeats: int, run: Callable[[bytes], None], data: bytes) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print per-image time for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-side", type=int, default=2048)
+    parser.add_argument("--format", default="JPEG", choices=["JPEG", "PNG", "WEBP"])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    for label, (height, width) in SIZES_MP.items():
+        data = _encode(height, width, args.format)
+        decode = _best_of(args.repeats, partial(_decode_path, max_side=args.max_side), data)
+        header = _best_of(args.repeats, _header_path, data)
+        print(
+            f"{label:>5} {args.format} ({len(data) >> 10:>6} KiB): decode path"
+            f" {decode * 1000:8.2f} ms | header-only {header * 1000:7.3f} ms"
+            f" | {decode / header:8.0f}x cheaper"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare per-face and batched vision scoring for group photos of 1-32 faces.
+
+The per-face path calls ``analyze_image`` once for each native-size crop; the
+batched path zero-pads every crop to the largest one with ``pad_face_crops`` and
+scores the stack with one ``analyze_image_batch`` call, as ``analyze_media_vision``
+does. The padding is taken back out of the statistics, so both paths produce
+identical scores, but padded pixels are still histogrammed: with ``--jitter``,
+crop sides vary by up to that fraction and the ``padding`` column shows the extra
+pixels read.
+
+Usage:
+    python -m benchmarks.bench_multi_face --face-size 160 --jitter 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+
+import numpy as np
+from PIL import Image
+
+from backend.engines.vision_detector import analyze_image, analyze_image_batch
+from backend.utils.preprocess import pad_face_crops
+
+FACE_COUNTS = (1, 4, 8, 16, 32)
+
+
+def _faces(count: int, size: int, jitter: float) -> list[Image.Image]:
+    rng = np.random.default_rng(9)
+    faces = []
+    for _ in range(count):
+        height, width = (size * (1 + rng.uniform(-jitter, jitter, 2))).astype(int)
+        faces.append(Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8)))
+    return faces
+
+
+def _best_of(repeats: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _score_padded(crops: list[Image.Image]) -> object:
+    return analyze_image_batch(pad_face_crops(crops), [crop.size for crop in crops], padded=True)
+
+
+def main() -> None:
+    """Run the benchmark and print per-request scoring time for each face count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--face-size", type=int, default=160, help="side of each native crop")
+    parser.add_argument("--jitter", type=float, default=0.0, help="relative spread of crop sides")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"face_size={args.face_size} jitter={args.jitter:g}")
+    for count in FACE_COUNTS:
+        crops = _faces(count, args.face_size, args.jitter)
+        per_face = _best_of(args.repeats, lambda c=crops: [analyze_image(crop) for crop in c])
+        batched = _best_of(args.repeats, lambda c=crops: _score_padded(c))
+        stack = pad_face_crops(crops)
+        real = sum(width * height for width, height in (crop.size for crop in crops))
+        padding = stack.shape[0] * stack.shape[1] * stack.shape[2] / real - 1
+        print(
+            f"{count:>3} faces: per-face {per_face * 1000:7.2f} ms"
+            f" | batched {batched * 1000:7.2f} ms | speedup {per_face / batched:5.2f}x"
+            f" | padding {padding:6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
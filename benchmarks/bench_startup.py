@@ -0,0 +1,100 @@
+"""Measure cold-start cost: import time, warm-up time, and time to first request.
+
+Each run starts a fresh interpreter so imports are not shared between runs. With
+warm-up enabled the first request is sent once ``/ready`` reports 200; without it
+the request is sent straight after startup and pays for worker spawn and first
+calls itself.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 3 --executor process
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+
+def _child(warm_up: bool) -> None:
+    started = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    imported = time.perf_counter()
+    import numpy as np
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.fromarray(np.full((256, 256, 3), 90, dtype=np.uint8)).save(buffer, format="JPEG")
+    files = {"file": ("startup.jpg", buffer.getvalue(), "image/jpeg")}
+    with TestClient(app) as client:
+        lifespan_started = time.perf_counter()
+        while warm_up and client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        ready = time.perf_counter()
+        client.post("/analyze_image/", files=files).raise_for_status()
+        answered = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                "ready_ms": (ready - lifespan_started) * 1000,
+                "first_request_ms": (answered - ready) * 1000,
+                "time_to_first_response_ms": (answered - started) * 1000,
+            }
+        )
+    )
+
+
+def _run(warm_up: bool, executor: str) -> dict[str, float]:
+    env = {
+        **os.environ,
+        "DFS_WARMUP_ENABLED": "1" if warm_up else "0",
+        "DFS_EXECUTOR_KIND": executor,
+        "DFS_CACHE_ENABLED": "0",
+    }
+    flag = "--child-warm" if warm_up else "--child-cold"
+    output = subprocess.run(  # noqa: S603 - fixed argv
+        [sys.executable, "-m", "benchmarks.bench_startup", flag],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    result: dict[str, float] = json.loads(output.strip().splitlines()[-1])
+    return result
+
+
+def main() -> None:
+    """Run the benchmark and print median startup timings with and without warm-up."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--executor", default="process", choices=["process", "thread"])
+    parser.add_argument("--child-warm", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--child-cold", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child_warm or args.child_cold:
+        _child(warm_up=args.child_warm)
+        return
+
+    print(f"runs={args.runs} executor={args.executor}")
+    for warm_up in (False, True):
+        runs = [_run(warm_up, args.executor) for _ in range(args.runs)]
+        medians = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(
+            f"warm-up {'on ' if warm_up else 'off'}: import {medians['import_ms']:7.1f} ms"
+            f" | ready {medians['ready_ms']:7.1f} ms"
+            f" | first request {medians['first_request_ms']:7.1f} ms"
+            f" | time to first response {medians['time_to_first_response_ms']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the per-pair temporal loop with batched vectorized differencing.
+
+The loop is the per-pair form of ``analyze_frames``: one widened int16 difference
+and exact mean per frame pair. The batched path is the current ``analyze_frames``.
+Both consume the same frame generator, cycling through a pool of random uint8
+frames, so memory does not grow with the frame count.
+
+Usage:
+    python -m benchmarks.bench_temporal_batch --side 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from collections.abc import Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+from backend.engines.temporal_detector import analyze_frames
+
+FRAME_COUNTS = (1_000, 10_000, 100_000)
+POOL_SIZE = 256
+
+
+def _frames(pool: NDArray[np.uint8], count: int) -> Iterator[NDArray[np.uint8]]:
+    for idx in range(count):
+        yield pool[idx % len(pool)]
+
+
+def _loop_reference(frames: Iterator[NDArray[np.uint8]]) -> list[float]:
+    anomalies: list[float] = []
+    prev = next(frames, None)
+    for curr in frames:
+        assert prev is not None  # noqa: S101 - narrowed for the type checker
+        rows = min(prev.shape[0], curr.shape[0])
+        cols = min(prev.shape[1], curr.shape[1])
+        diff = np.subtract(prev[:rows, :cols], curr[:rows, :cols], dtype=np.int16)
+        anomalies.append(float(np.abs(diff).sum(dtype=np.int64) / max(1, diff.size)))
+        prev = curr
+    return anomalies
+
+
+def main() -> None:
+    """Run the benchmark and print throughput of both paths per frame count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--side", type=int, default=64, help="frame side length in pixels")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(4)
+    pool = rng.integers(0, 256, (POOL_SIZE, args.side, args.side), dtype=np.uint8)
+    print(f"frame={args.side}x{args.side} uint8")
+    for count in FRAME_COUNTS:
+        started = time.perf_counter()
+        reference = _loop_reference(_frames(pool, count))
+        loop_time = time.perf_counter() - started
+        started = time.perf_counter()
+        result = analyze_frames(_frames(pool, count))
+        batch_time = time.perf_counter() - started
+        if result.anomaly_map != reference:
+            raise RuntimeError("batched differences disagree with the per-pair loop")
+        print(
+            f"{count:>7} frames: loop {loop_time * 1000:8.1f} ms"
+            f" ({count / loop_time:9.0f} frames/s) | batched {batch_time * 1000:8.1f} ms"
+            f" ({count / batch_time:9.0f} frames/s) | speedup {loop_time / batch_time:4.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
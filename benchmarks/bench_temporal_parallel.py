@@ -0,0 +1,68 @@
+"""Measure how shared-memory parallel temporal analysis scales with worker count.
+
+Frames are streamed from a synthetic payload with ``iter_frames`` and analyzed
+by ``analyze_frames_parallel`` at 1, 2, 4, and 8 workers; one worker is the
+serial ``analyze_frames`` path. Each pool is started and warmed before timing,
+and every result is checked against the serial one. Speedup is bounded by the
+number of cores reported on the first line.
+
+Usage:
+    python -m benchmarks.bench_temporal_parallel --payload-mib 64 --frame-kib 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+
+from backend.engines.temporal_detector import analyze_frames_parallel
+from backend.utils.executor import shutdown_executor
+from backend.utils.preprocess import iter_frames
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def main() -> None:
+    """Run the benchmark and print throughput and speedup per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payload-mib", type=int, default=64)
+    parser.add_argument("--frame-kib", type=int, default=16, help="approximate frame size")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    payload = np.random.default_rng(6).integers(0, 256, args.payload_mib << 20, dtype=np.uint8)
+    data = payload.tobytes()
+    fps = max(1, len(data) // (args.frame_kib << 10))
+    frame_count = sum(1 for _ in iter_frames(data, fps))
+    print(f"cores={os.cpu_count()} payload={args.payload_mib} MiB frames={frame_count}")
+
+    baseline = None
+    serial_time = 0.0
+    try:
+        for workers in WORKER_COUNTS:
+            analyze_frames_parallel(iter_frames(data[: 1 << 20], fps), workers)  # start the pool
+            timings = []
+            for _ in range(args.repeats):
+                started = time.perf_counter()
+                result = analyze_frames_parallel(iter_frames(data, fps), workers)
+                timings.append(time.perf_counter() - started)
+            elapsed = min(timings)
+            if baseline is None:
+                baseline, serial_time = result, elapsed
+            elif result != baseline:
+                raise RuntimeError(f"{workers} workers disagree with the serial result")
+            print(
+                f"{workers} worker(s): {elapsed * 1000:8.1f} ms"
+                f" ({frame_count / elapsed:9.0f} frames/s) | speedup {serial_time / elapsed:4.2f}x"
+            )
+    finally:
+        shutdown_executor()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare peak memory of list-based and streamed temporal analysis as videos grow.
+
+Frames have a fixed size and the payload grows with the frame count, which models
+longer videos. The list path materializes ``extract_frames`` first; the streamed
+path feeds ``iter_frames`` straight into ``analyze_frames``.
+
+Usage:
+    python -m benchmarks.bench_temporal_stream --frame-kib 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+
+from backend.engines.temporal_detector import TemporalResult, analyze_frames
+from backend.utils.preprocess import extract_frames, iter_frames
+
+FRAME_COUNTS = (16, 64, 256)
+
+
+def _measure(func: Callable[[], TemporalResult]) -> tuple[float, float, TemporalResult]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, result
+
+
+def main() -> None:
+    """Run the benchmark and print time and peak traced memory for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frame-kib", type=int, default=256, help="bytes per frame / 1024")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(2)
+    frame_bytes = args.frame_kib * 1024
+    print(f"frame={args.frame_kib} KiB (peak memory excludes the payload itself)")
+    for count in FRAME_COUNTS:
+        payload = rng.integers(0, 256, count * frame_bytes, dtype=np.uint8).tobytes()
+        list_time, list_peak, listed = _measure(
+            lambda p=payload, n=count: analyze_frames(extract_frames(p, fps=n))
+        )
+        stream_time, stream_peak, streamed = _measure(
+            lambda p=payload, n=count: analyze_frames(iter_frames(p, fps=n))
+        )
+        if streamed != listed:
+            raise RuntimeError("streamed result differs from the list-based result")
+        print(
+            f"{count:>4} frames: list {list_time * 1000:7.1f} ms peak {list_peak:7.1f} MiB"
+            f" | streamed {stream_time * 1000:7.1f} ms peak {stream_peak:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
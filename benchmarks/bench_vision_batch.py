@@ -0,0 +1,72 @@
+"""Compare single-image and batched vision scoring throughput (images/sec).
+
+Usage:
+    python -m benchmarks.bench_vision_batch --images 256 --size 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from backend.engines.pipelines import prepare_image, run_image_pipeline, score_prepared_images
+from backend.utils.spool import SpooledUpload
+
+
+def _synthetic_uploads(count: int, size: int) -> list[SpooledUpload]:
+    rng = np.random.default_rng(42)
+    uploads = []
+    for _ in range(count):
+        pixels = rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+        buffer = BytesIO()
+        Image.fromarray(pixels).save(buffer, format="PNG")
+        uploads.append(SpooledUpload.from_bytes(buffer.getvalue()))
+    return uploads
+
+
+def _rate(count: int, elapsed: float) -> str:
+    return f"{count / elapsed:8.1f} images/sec ({elapsed * 1000:.1f} ms total)"
+
+
+def main() -> None:
+    """Run the benchmark and print throughput for both paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=128)
+    parser.add_argument("--size", type=int, default=256, help="side length of each image")
+    parser.add_argument("--crop-side", type=int, default=128)
+    parser.add_argument("--workers", type=int, default=4, help="parallel decode processes")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    uploads = _synthetic_uploads(args.images, args.size)
+
+    started = time.perf_counter()
+    for upload in uploads:
+        run_image_pipeline(upload)
+    single = time.perf_counter() - started
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(abs, range(args.workers)))  # spawn workers outside the timed region
+        started = time.perf_counter()
+        prepare = functools.partial(prepare_image, side=args.crop_side)
+        prepared = list(pool.map(prepare, uploads))
+        decoded = time.perf_counter() - started
+        score_prepared_images(prepared)
+        batched = time.perf_counter() - started
+
+    print(f"images={args.images} size={args.size}x{args.size} crop_side={args.crop_side}")
+    print(f"single-image path : {_rate(args.images, single)}")
+    print(f"batched path      : {_rate(args.images, batched)}")
+    print(f"  decode+crop     : {decoded * 1000:.1f} ms on {args.workers} workers")
+    print(f"  vectorized score: {(batched - decoded) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
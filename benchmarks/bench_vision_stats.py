@@ -0,0 +1,66 @@
+"""Compare float and fused integer vision statistics at 1, 12, and 48 MP.
+
+The float path is the previous implementation (normalize to float32, then separate
+variance, channel-mean, and mean passes); the fused path is ``compute_pixel_stats``.
+
+Usage:
+    python -m benchmarks.bench_vision_stats --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from backend.engines.vision_detector import compute_pixel_stats
+
+SIZES_MP = {"1 MP": (1000, 1000), "12 MP": (3000, 4000), "48 MP": (6000, 8000)}
+
+
+def _float_stats(pixels: NDArray[np.uint8]) -> tuple[float, float, NDArray[np.float32]]:
+    array = pixels.astype(np.float32) / 255.0
+    return float(np.var(array)), float(np.mean(array)), np.mean(array, axis=(0, 1))
+
+
+def _fused_stats(pixels: NDArray[np.uint8]) -> tuple[float, float, NDArray[np.float64]]:
+    stats = compute_pixel_stats(pixels[np.newaxis])
+    return float(stats.variances[0]), float(stats.means[0]), stats.channel_means[0]
+
+
+def _best_of(repeats: int, func: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print timings and the largest score deviation."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    rng = np.random.default_rng(11)
+    for label, (height, width) in SIZES_MP.items():
+        pixels = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        float_time = _best_of(args.repeats, lambda p=pixels: _float_stats(p))
+        fused_time = _best_of(args.repeats, lambda p=pixels: _fused_stats(p))
+        float_var, float_mean, _ = _float_stats(pixels)
+        fused_var, fused_mean, _ = _fused_stats(pixels)
+        print(
+            f"{label:>6}: float {float_time * 1000:8.1f} ms | fused {fused_time * 1000:8.1f} ms"
+            f" | extra memory float {pixels.nbytes * 4 / 2**20:7.1f} MiB"
+            f" | |dvar| {abs(float_var - fused_var):.2e} |dmean| {abs(float_mean - fused_mean):.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
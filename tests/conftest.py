@@ -0,0 +1,27 @@
+"""Shared pytest configuration."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_state_dirs(tmp_path_factory: pytest.TempPathFactory) -> Iterator[None]:
+    """Keep job, cache, report, and heatmap state out of ``logs/`` and fresh for every test run."""
+    root: Path = tmp_path_factory.mktemp("state")
+    names = ("DFS_JOB_DIR", "DFS_CACHE_DIR", "DFS_REPORT_DIR", "DFS_HEATMAP_DIR")
+    previous = {name: os.environ.get(name) for name in names}
+    os.environ["DFS_JOB_DIR"] = str(root / "jobs")
+    os.environ["DFS_CACHE_DIR"] = str(root / "cache")
+    os.environ["DFS_REPORT_DIR"] = str(root / "reports")
+    os.environ["DFS_HEATMAP_DIR"] = str(root / "heatmaps")
+    yield
+    for name, value in previous.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
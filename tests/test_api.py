@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
+import subprocess
 import sys
+import threading
+import time
+import wave
 from io import BytesIO
 from pathlib import Path
 
+import httpx
 import numpy as np
+import pytest
 from fastapi.testclient import TestClient
 from PIL import Image
 
@@ -14,7 +21,26 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
+from backend.api import audio as audio_api  # noqa: E402
+from backend.api import image as image_api  # noqa: E402
+from backend.api import multimodal as multimodal_api  # noqa: E402
+from backend.engines.audio_detector import AudioResult  # noqa: E402
+from backend.engines.metadata_analyzer import MetadataResult  # noqa: E402
+from backend.engines.pipelines import (  # noqa: E402
+    ImageAnalysis,
+    VideoAnalysis,
+    run_image_pipeline,
+)
+from backend.engines.registry import registered_engines  # noqa: E402
+from backend.engines.temporal_detector import TemporalResult  # noqa: E402
 from backend.main import app  # noqa: E402
+from backend.utils.cache import get_result_cache  # noqa: E402
+from backend.utils.config import get_settings  # noqa: E402
+from backend.utils.executor import shutdown_executor  # noqa: E402
+from backend.utils.heatmap import HeatmapHandle  # noqa: E402
+from backend.utils.heatmap_store import HeatmapStore  # noqa: E402
+from backend.utils.preprocess import count_frames  # noqa: E402
+from backend.utils.spool import SpooledUpload  # noqa: E402
 
 client = TestClient(app)
 
@@ -32,6 +58,37 @@ def test_health_endpoint() -> None:
     assert response.json()["status"] == "ok"
 
 
+def test_ready_after_engine_warm_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert client.get("/ready").status_code == 503  # lifespan not started
+    monkeypatch.setenv("DFS_EXECUTOR_KIND", "thread")
+    get_settings.cache_clear()
+    shutdown_executor()
+    try:
+        with TestClient(app) as live_client:
+            deadline = time.monotonic() + 10
+            readiness = live_client.get("/ready")
+            while readiness.status_code == 503 and time.monotonic() < deadline:
+                time.sleep(0.02)
+                readiness = live_client.get("/ready")
+    finally:
+        get_settings.cache_clear()
+    assert readiness.status_code == 200
+    assert set(readiness.json()["engines_ms"]) == set(registered_engines())
+
+
+def test_importing_the_app_leaves_engines_to_warm_up() -> None:
+    heavy = ("numpy", "PIL", "backend.engines.pipelines")
+    probe = f"import sys, backend.main; print(sorted(m for m in {heavy} if m in sys.modules))"
+    loaded = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", probe],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert loaded.stdout.strip() == "[]"
+
+
 def test_image_analysis() -> None:
     files = {"file": ("test.png", _sample_image_bytes(), "image/png")}
     response = client.post("/analyze_image/", files=files)
@@ -39,6 +96,138 @@ def test_image_analysis() -> None:
     payload = response.json()
     assert "vision_score" in payload
     assert "metadata_score" in payload
+    assert payload["faces_detected"] == 1
+    assert payload["faces"][0]["vision_score"] == payload["vision_score"]
+
+
+def test_image_report_is_rendered_on_download_with_ranges() -> None:
+    files = {"file": ("report.png", _sample_image_bytes(), "image/png")}
+    analysis = client.post("/analyze_image/", files=files).json()
+    assert analysis["report_url"] == f"/reports/{analysis['report_id']}"
+
+    full = client.get(analysis["report_url"])
+    assert full.status_code == 200
+    assert full.headers["content-type"] == "application/pdf"
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.content.startswith(b"%PDF")
+
+    partial = client.get(analysis["report_url"], headers={"Range": "bytes=1-3"})
+    assert partial.status_code == 206
+    assert partial.content == full.content[1:4]
+    assert partial.headers["content-range"] == f"bytes 1-3/{len(full.content)}"
+
+    beyond = client.get(analysis["report_url"], headers={"Range": "bytes=999999999-"})
+    assert beyond.status_code == 416
+    assert client.get("/reports/" + "0" * 64).status_code == 404
+
+
+def test_image_heatmap_is_served_on_demand() -> None:
+    files = {"file": ("heatmap.png", _sample_image_bytes(), "image/png")}
+    analysis = client.post("/analyze_image/", params={"cache_heatmap": "true"}, files=files).json()
+    assert analysis["heatmap_url"] == f"/heatmaps/{analysis['heatmap_id']}"
+    height, width = analysis["artifact_heatmap_shape"]
+
+    png = client.get(analysis["heatmap_url"])
+    assert png.status_code == 200
+    assert png.headers["content-type"] == "image/png"
+    assert Image.open(BytesIO(png.content)).size == (width, height)
+
+    raw = client.get(analysis["heatmap_url"], params={"format": "raw", "dtype": "float16"})
+    assert raw.headers["x-heatmap-shape"] == f"{height},{width}"
+    assert len(raw.content) == height * width * 2
+    assert client.get(analysis["heatmap_url"], params={"max_side": 0}).status_code == 422
+    assert client.get("/heatmaps/missing").status_code == 404
+
+
+def test_image_heatmap_is_shared_across_workers_and_cache_hits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def upload(fill: int) -> dict[str, tuple[str, bytes, str]]:
+        buffer = BytesIO()
+        Image.fromarray(np.full((24, 20, 3), fill, dtype=np.uint8)).save(buffer, format="PNG")
+        return {"file": ("shared.png", buffer.getvalue(), "image/png")}
+
+    # A fresh store over the same directory stands in for another Uvicorn worker.
+    other_worker = HeatmapStore(Path(get_settings().heatmap_dir), retention_seconds=60)
+    files = upload(77)
+    first = client.post("/analyze_image/", files=files).json()
+    handle, png = other_worker.load(first["heatmap_id"])
+    assert handle.shape == tuple(first["artifact_heatmap_shape"])
+    assert png is None
+
+    hits = get_result_cache().stats.memory_hits
+    cached = client.post("/analyze_image/", params={"cache_heatmap": "true"}, files=files)
+    assert get_result_cache().stats.memory_hits == hits + 1
+    assert cached.json() == first
+    _, png = other_worker.load(first["heatmap_id"])
+    assert png is not None and png == client.get(first["heatmap_url"]).content
+
+    monkeypatch.setenv("DFS_CACHE_ENABLED", "0")
+    get_settings.cache_clear()
+    try:
+        uncached = client.post("/analyze_image/", files=upload(78)).json()
+    finally:
+        get_settings.cache_clear()
+    handle, _ = other_worker.load(uncached["heatmap_id"])
+    assert handle.shape == tuple(uncached["artifact_heatmap_shape"])
+    assert client.get(uncached["heatmap_url"]).status_code == 200
+
+
+def test_image_batch_isolates_item_errors() -> None:
+    files = [
+        ("files", ("a.png", _sample_image_bytes(), "image/png")),
+        ("files", ("broken.png", b"not an image", "image/png")),
+        ("files", ("b.png", _sample_image_bytes(), "image/png")),
+    ]
+    response = client.post("/analyze_image/batch", files=files)
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["processed"] == 2
+    assert payload["failed"] == 1
+    names = [item["filename"] for item in payload["results"]]
+    assert names == ["a.png", "broken.png", "b.png"]
+    assert payload["results"][1]["error"] == "Invalid image file"
+    assert payload["results"][0]["vision_score"] is not None
+
+
+def test_metadata_screening_reads_headers_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    exif = Image.Exif()
+    exif[0x0110] = "MockCam"  # Model
+    buffer = BytesIO()
+    Image.new("RGB", (16, 16)).save(buffer, "JPEG", exif=exif.tobytes())
+
+    def no_decode(*args: object, **kwargs: object) -> None:
+        raise AssertionError("metadata screening decoded pixels")
+
+    monkeypatch.setattr("backend.utils.media.load_image", no_decode)
+    files = {"file": ("camera.jpg", buffer.getvalue(), "image/jpeg")}
+    response = client.post("/analyze_image/metadata", files=files)
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["metadata"] == {"Model": "MockCam"}
+    assert payload["metadata_anomalies"] == ["Camera model spoofing detected"]
+    assert payload["metadata_score"] == 80.0
+
+    files = {"file": ("broken.png", b"not an image", "image/png")}
+    response = client.post("/analyze_image/metadata", files=files)
+    assert response.status_code == 400
+
+
+def test_repeated_upload_is_served_from_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    files = {"file": ("again.wav", b"\x10\x20\x30\x40\x50", "audio/wav")}
+    first = client.post("/analyze_audio/", files=files)
+
+    def fail_pipeline(payload: SpooledUpload) -> None:
+        raise AssertionError("cache hit must not run the pipeline")
+
+    monkeypatch.setattr(audio_api, "run_audio_pipeline", fail_pipeline)
+    before = client.get("/cache/stats").json()
+    second = client.post("/analyze_audio/", files=files)
+    after = client.get("/cache/stats").json()
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert after["memory_hits"] == before["memory_hits"] + 1
 
 
 def test_audio_analysis_defaults() -> None:
@@ -46,6 +235,40 @@ def test_audio_analysis_defaults() -> None:
     response = client.post("/analyze_audio/", files=files)
     assert response.status_code == 200
     assert "audio_score" in response.json()
+    assert 0 <= response.json()["speech_ratio"] <= 1
+
+
+def test_audio_analysis_decodes_wav_uploads() -> None:
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(8000)
+        wav_file.writeframes(np.arange(-8000, 8000, dtype="<i2").tobytes())
+    files = {"file": ("stereo.wav", buffer.getvalue(), "audio/wav")}
+    assert client.post("/analyze_audio/", files=files).status_code == 200
+
+    files = {"file": ("broken.wav", b"RIFF\x04\x00\x00\x00WAVEjunk", "audio/wav")}
+    response = client.post("/analyze_audio/", files=files)
+    assert response.status_code == 400
+    assert "Invalid WAV" in response.json()["detail"]
+
+
+def test_oversized_upload_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DFS_MAX_AUDIO_BYTES", "16")
+    get_settings.cache_clear()
+    try:
+        files = {"file": ("test.wav", b"\x00" * 64, "audio/wav")}
+        response = client.post("/analyze_audio/", files=files)
+    finally:
+        get_settings.cache_clear()
+    assert response.status_code == 413
+
+
+def test_empty_upload_is_rejected() -> None:
+    files = {"file": ("test.wav", b"", "audio/wav")}
+    response = client.post("/analyze_audio/", files=files)
+    assert response.status_code == 400
 
 
 def test_video_analysis() -> None:
@@ -58,6 +281,55 @@ def test_video_analysis() -> None:
     assert isinstance(payload["flagged_frames"], list)
 
 
+def test_video_analysis_samples_adaptively_only_over_budget() -> None:
+    video_bytes = bytes([i % 256 for i in range(2048)])
+    files = {"file": ("test.mp4", video_bytes, "video/mp4")}
+    uniform = client.post("/analyze_video/", files=files).json()
+    assert uniform["sampled_frames"] is None
+    assert len(uniform["anomaly_map"]) == count_frames(len(video_bytes), fps=6) - 1
+
+    params = {"fps": 64, "frame_budget": 8}
+    payload = client.post("/analyze_video/", files=files, params=params).json()
+    assert len(payload["sampled_frames"]) == 8
+    assert len(payload["anomaly_map"]) == 7
+    assert set(payload["flagged_frames"]) <= set(payload["sampled_frames"])
+
+    # Opt-in under default settings: only ``fps`` is raised above the budget.
+    opted_in = client.post("/analyze_video/", files=files, params={"fps": 64}).json()
+    assert len(opted_in["sampled_frames"]) == get_settings().video_frame_budget
+
+
+def test_video_job_lifecycle() -> None:
+    video_bytes = bytes([i % 256 for i in range(4096)])
+    files = {"file": ("clip.mp4", video_bytes, "video/mp4")}
+    response = client.post("/jobs", files=files, data={"priority": "3", "fps": "4"})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] in {"queued", "running", "succeeded"}
+
+    deadline = time.monotonic() + 30
+    while job["status"] not in {"succeeded", "failed", "cancelled"}:
+        assert time.monotonic() < deadline, "job did not finish in time"
+        time.sleep(0.05)
+        job = client.get(f"/jobs/{job['id']}").json()
+
+    assert job["status"] == "succeeded"
+    assert job["progress"]["done"] == job["progress"]["total"] > 0
+    assert job["result"]["temporal_score"] >= 0
+    assert job["expires_at"] is not None
+
+
+def test_unknown_job_returns_404() -> None:
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.delete("/jobs/missing").status_code == 404
+
+
+def test_job_rejects_unknown_kind() -> None:
+    files = {"file": ("clip.mp4", b"abc", "video/mp4")}
+    response = client.post("/jobs", files=files, data={"kind": "hologram"})
+    assert response.status_code == 400
+
+
 def test_multimodal_success_with_image_only() -> None:
     files = {"image": ("test.png", _sample_image_bytes(), "image/png")}
     response = client.post("/analyze_multimodal/", files=files)
@@ -70,8 +342,218 @@ def test_multimodal_success_with_image_only() -> None:
         "audio_score",
         "metadata_score",
     }
+    assert payload["degraded_modalities"] == {}
+
+
+@pytest.mark.parametrize(
+    ("files", "score", "classification"),
+    [
+        ({"image": ("test.png", _sample_image_bytes(), "image/png")}, 32.0, "REAL"),
+        ({"video": ("clip.mp4", bytes(i % 256 for i in range(2048)), "video/mp4")}, 32.0, "REAL"),
+    ],
+    ids=["image-only", "video-only"],
+)
+def test_multimodal_single_modality_fuses_baseline_placeholders(
+    files: dict[str, tuple[str, bytes, str]], score: float, classification: str
+) -> None:
+    payload = client.post("/analyze_multimodal/", files=files).json()
+    assert payload["deepfake_score"] == pytest.approx(score)
+    assert payload["classification"] == classification
+    assert payload["components"]["temporal_score"] == 0.0
+    assert payload["components"]["audio_score"] == 0.0
+    assert payload["components"]["metadata_score"] == 80.0
+
+
+def test_multimodal_slow_branch_degrades_instead_of_blocking(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def slow_audio(payload: SpooledUpload) -> AudioResult:
+        time.sleep(1.0)
+        raise AssertionError("timed-out branch result must not be used")
+
+    monkeypatch.setattr(multimodal_api, "run_audio_pipeline", slow_audio)
+    monkeypatch.setenv("DFS_EXECUTOR_KIND", "thread")
+    monkeypatch.setenv("DFS_EXECUTOR_WORKERS", "3")
+    monkeypatch.setenv("DFS_AUDIO_BRANCH_TIMEOUT_SECONDS", "0.2")
+    monkeypatch.setenv("DFS_CACHE_ENABLED", "0")
+    get_settings.cache_clear()
+    shutdown_executor()
+    files = {
+        "image": ("test.png", _sample_image_bytes(), "image/png"),
+        "audio": ("test.wav", b"\x00\x01" * 64, "audio/wav"),
+    }
+    try:
+        started = time.perf_counter()
+        response = client.post("/analyze_multimodal/", files=files)
+        elapsed = time.perf_counter() - started
+    finally:
+        shutdown_executor()
+        get_settings.cache_clear()
+
+    assert response.status_code == 200
+    assert elapsed < 0.9
+    payload = response.json()
+    assert set(payload["degraded_modalities"]) == {"audio"}
+    assert "timed out" in payload["degraded_modalities"]["audio"]
+
+
+def test_multimodal_cascade_holds_temporal_back_until_vision_and_audio_settle(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Vision and audio each wait until the other is running too.
+    fanned_out = threading.Barrier(2, timeout=5)
+    video_runs: list[SpooledUpload] = []
+
+    def clear_fake(payload: SpooledUpload, **kwargs: int) -> ImageAnalysis:
+        fanned_out.wait()
+        metadata = MetadataResult(metadata_score=100, metadata={}, anomalies=[])
+        return ImageAnalysis(90, {}, HeatmapHandle(2, 2), metadata)
+
+    def synthetic_voice(payload: SpooledUpload) -> AudioResult:
+        fanned_out.wait()
+        return AudioResult(audio_score=100, anomalies=[])
+
+    def video(payload: SpooledUpload, fps: int) -> VideoAnalysis:
+        video_runs.append(payload)
+        return VideoAnalysis(0, TemporalResult(temporal_score=0, flagged_frames=[], anomaly_map=[]))
+
+    monkeypatch.setattr(multimodal_api, "run_image_pipeline", clear_fake)
+    monkeypatch.setattr(multimodal_api, "run_audio_pipeline", synthetic_voice)
+    monkeypatch.setattr(multimodal_api, "run_video_pipeline", video)
+    monkeypatch.setenv("DFS_EXECUTOR_KIND", "thread")
+    monkeypatch.setenv("DFS_EXECUTOR_WORKERS", "3")
+    monkeypatch.setenv("DFS_CACHE_ENABLED", "0")
+    get_settings.cache_clear()
+    shutdown_executor()
+    files = {
+        "image": ("test.png", _sample_image_bytes(), "image/png"),
+        "audio": ("test.wav", b"\x00\x01" * 64, "audio/wav"),
+        "video": ("clip.mp4", b"\x01" * 4096, "video/mp4"),
+    }
+    try:
+        cascaded = client.post("/analyze_multimodal/", files=files).json()
+        assert not video_runs
+        full = client.post(
+            "/analyze_multimodal/", files=files, params={"full_evaluation": "true"}
+        ).json()
+        assert len(video_runs) == 1
+    finally:
+        shutdown_executor()
+        get_settings.cache_clear()
+
+    assert cascaded["skipped_stages"] == ["temporal"]
+    assert full["skipped_stages"] == []
+    assert cascaded["classification"] == full["classification"] == "FAKE"
+    assert cascaded["degraded_modalities"] == full["degraded_modalities"] == {}
+
+
+def test_multimodal_cascade_settles_on_metadata_alone(monkeypatch: pytest.MonkeyPatch) -> None:
+    detector_runs: list[str] = []
+
+    def spoofed_metadata(payload: SpooledUpload) -> MetadataResult:
+        return MetadataResult(metadata_score=100, metadata={}, anomalies=[])
+
+    def vision(payload: SpooledUpload, **kwargs: int) -> ImageAnalysis:
+        detector_runs.append("vision")
+        return ImageAnalysis(0, {}, HeatmapHandle(2, 2), spoofed_metadata(payload))
+
+    def voice(payload: SpooledUpload) -> AudioResult:
+        detector_runs.append("audio")
+        return AudioResult(audio_score=0, anomalies=[])
+
+    monkeypatch.setattr(multimodal_api, "run_metadata_pipeline", spoofed_metadata)
+    monkeypatch.setattr(multimodal_api, "run_image_pipeline", vision)
+    monkeypatch.setattr(multimodal_api, "run_audio_pipeline", voice)
+    monkeypatch.setenv("DFS_FUSION_WEIGHTS", "0.1,0.1,0.1,0.7")
+    monkeypatch.setenv("DFS_EXECUTOR_KIND", "thread")
+    monkeypatch.setenv("DFS_CACHE_ENABLED", "0")
+    get_settings.cache_clear()
+    shutdown_executor()
+    files = {
+        "image": ("test.png", _sample_image_bytes(), "image/png"),
+        "audio": ("test.wav", b"\x00\x01" * 64, "audio/wav"),
+    }
+    try:
+        cascaded = client.post("/analyze_multimodal/", files=files).json()
+        assert detector_runs == []
+        full = client.post(
+            "/analyze_multimodal/", files=files, params={"full_evaluation": "true"}
+        ).json()
+    finally:
+        shutdown_executor()
+        get_settings.cache_clear()
+
+    assert sorted(detector_runs) == ["audio", "vision"]
+    assert cascaded["skipped_stages"] == ["vision", "audio"]
+    assert cascaded["classification"] == full["classification"] == "FAKE"
+    assert cascaded["degraded_modalities"] == {}
 
 
 def test_multimodal_requires_modality() -> None:
     response = client.post("/analyze_multimodal/")
     assert response.status_code == 400
+
+
+def test_fusion_rescore_reuses_stored_component_scores() -> None:
+    components = np.array([[90, 90, 90, 90], [50, 50, 50, 50], [10, 10, 10, 10], [90, 0, 0, 0]])
+    buffer = BytesIO()
+    np.save(buffer, components.astype(np.float32))
+    files = {"file": ("scores.npy", buffer.getvalue(), "application/octet-stream")}
+
+    response = client.post("/fusion/rescore", files=files)
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["count"] == 4
+    assert payload["classifications"] == {"REAL": 2, "UNCERTAIN": 1, "FAKE": 1}
+    assert payload["reclassified"] == 0
+
+    response = client.post("/fusion/rescore", files=files, params={"vision_weight": 0.8})
+    assert response.json()["classifications"] == {"REAL": 1, "UNCERTAIN": 0, "FAKE": 3}
+    assert response.json()["reclassified"] == 2
+
+    response = client.post("/fusion/rescore", files=files, params={"rows": "true"})
+    assert response.status_code == 200
+    archive = np.load(BytesIO(response.content))
+    labels = archive["classification_labels"][archive["classification"]].tolist()
+    assert labels == ["FAKE", "UNCERTAIN", "REAL", "REAL"]
+    assert np.allclose(archive["deepfake_score"], [90, 50, 10, 36])
+
+    bad = {"file": ("scores.npy", b"not a matrix", "application/octet-stream")}
+    assert client.post("/fusion/rescore", files=bad).status_code == 400
+    assert client.post("/fusion/rescore", files=files, params={"fake_from": 10}).status_code == 400
+
+
+def test_health_stays_responsive_during_heavy_analysis(monkeypatch: pytest.MonkeyPatch) -> None:
+    def slow_pipeline(payload: SpooledUpload, *args: int | None) -> ImageAnalysis:
+        time.sleep(0.6)
+        return run_image_pipeline(payload, *args)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(image_api, "run_image_pipeline", slow_pipeline)
+    monkeypatch.setenv("DFS_EXECUTOR_KIND", "thread")
+    monkeypatch.setenv("DFS_CACHE_ENABLED", "0")
+    get_settings.cache_clear()
+    shutdown_executor()
+
+    async def scenario() -> tuple[httpx.Response, list[float]]:
+        async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
+            files = {"file": ("test.png", _sample_image_bytes(), "image/png")}
+            analysis = asyncio.create_task(async_client.post("/analyze_image/", files=files))
+            await asyncio.sleep(0.05)
+            latencies: list[float] = []
+            while not analysis.done():
+                started = time.perf_counter()
+                health = await async_client.get("/health")
+                latencies.append(time.perf_counter() - started)
+                assert health.status_code == 200
+                await asyncio.sleep(0.05)
+            return await analysis, latencies
+
+    try:
+        response, latencies = asyncio.run(scenario())
+    finally:
+        shutdown_executor()
+        get_settings.cache_clear()
+
+    assert response.status_code == 200
+    assert len(latencies) >= 3
+    assert max(latencies) < 0.2
@@ -2,14 +2,73 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import threading
+import time
+import tracemalloc
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any
+
 import numpy as np
+import pytest
+from PIL import Image
 
-from backend.engines.audio_detector import analyze_audio
-from backend.engines.fusion_engine import fuse_results
-from backend.engines.metadata_analyzer import MetadataResult
-from backend.engines.temporal_detector import TemporalResult
-from backend.engines.vision_detector import VisionResult
-from backend.utils.preprocess import extract_frames, extract_mfcc, validate_upload
+from backend.engines.audio_detector import analyze_audio, analyze_media_audio
+from backend.engines.fusion_engine import (
+    FusionWeights,
+    fuse_results,
+    fuse_score_matrix,
+    fuse_scores,
+    settled_classification,
+)
+from backend.engines.metadata_analyzer import MetadataResult, analyze_media_metadata
+from backend.engines.pipelines import run_video_job
+from backend.engines.registry import register_engine, registered_engines, warm_up_engines
+from backend.engines.temporal_detector import (
+    PyramidConfig,
+    TemporalResult,
+    analyze_frames,
+    analyze_frames_parallel,
+    analyze_media_frames,
+)
+from backend.engines.vision_detector import (
+    VisionResult,
+    analyze_image,
+    analyze_image_batch,
+    analyze_media_vision,
+    compute_pixel_stats,
+)
+from backend.utils.cache import ResultCache
+from backend.utils.config import Settings, get_settings
+from backend.utils.executor import shutdown_executor, warm_up_workers
+from backend.utils.exif import read_metadata
+from backend.utils.heatmap import HeatmapHandle
+from backend.utils.heatmap_store import HeatmapNotFoundError, HeatmapStore
+from backend.utils.job_queue import JobProgress, JobQueue
+from backend.utils.media import MediaContext
+from backend.utils.preprocess import (
+    PolyphaseResampler,
+    VoiceActivity,
+    batch_frames,
+    block_spread,
+    decode_pcm16,
+    extract_frames,
+    extract_mfcc,
+    iter_audio_blocks,
+    iter_frames,
+    iter_mfcc,
+    load_image,
+    parse_wav,
+    plan_frame_samples,
+    stack_face_crops,
+    validate_upload,
+)
+from backend.utils.report_store import ReportNotFoundError, ReportStore
+from backend.utils.spool import SpooledUpload, UploadTooLargeError, spool_stream
 
 
 def test_extract_frames_requires_content() -> None:
@@ -32,7 +91,7 @@ def test_validate_upload_blocks_executables() -> None:
 
 def test_fusion_risk_levels() -> None:
     fusion = fuse_results(
-        VisionResult(vision_score=80, artifact_heatmap=np.zeros((2, 2)), details={}),
+        VisionResult(vision_score=80, artifact_heatmap=HeatmapHandle(2, 2), details={}),
         TemporalResult(temporal_score=60, flagged_frames=[], anomaly_map=[]),
         analyze_audio(b"1234"),
         MetadataResult(metadata_score=90, metadata={}, anomalies=[]),
@@ -42,12 +101,623 @@ def test_fusion_risk_levels() -> None:
     assert fusion.risk_level in {"Low", "Medium", "High", "Critical"}
 
 
+def test_fused_score_matrix_matches_scalar_fusion() -> None:
+    rng = np.random.default_rng(24)
+    edges = np.repeat([[0, 25, 40, 50, 65, 75, 100, 120]], 4, axis=0).T
+    components = np.vstack([rng.uniform(-10, 110, (200, 4)), edges])
+    weights = FusionWeights(vision=0.5, temporal=0.1, audio=0.3, metadata=0.1)
+
+    batch = fuse_score_matrix(components, weights)
+    expected = [fuse_scores(*row, weights=weights) for row in components.tolist()]
+    assert batch.scores.tolist() == [result.deepfake_score for result in expected]
+    assert batch.confidences.tolist() == [result.confidence for result in expected]
+    assert batch.classification_labels() == [result.classification for result in expected]
+    assert batch.risk_labels() == [result.risk_level for result in expected]
+    assert fuse_score_matrix(components[-8:], thresholds=(20, 90)).classification_labels() == [
+        "REAL", "UNCERTAIN", "UNCERTAIN", "UNCERTAIN", "UNCERTAIN", "UNCERTAIN", "FAKE", "FAKE"
+    ]  # fmt: skip
+    with pytest.raises(ValueError):
+        fuse_score_matrix(components[:, :3])
+    with pytest.raises(ValueError):
+        FusionWeights(vision=-1)
+    assert FusionWeights(*Settings().fusion_weights) == FusionWeights()
+
+
+def test_settled_classification_only_when_pending_scores_cannot_flip_it() -> None:
+    known = {"vision": 95.0, "temporal": None, "audio": 100.0, "metadata": 100.0}
+    assert settled_classification(known) == "FAKE"  # 78 with temporal 0, 98 with 100
+    assert settled_classification({**known, "vision": 50.0}) is None  # 60 to 80
+    assert settled_classification({**known, "vision": 50.0, "temporal": 30.0}) == "FAKE"
+    low = {"vision": 5.0, "temporal": None, "audio": 0.0, "metadata": 40.0}
+    assert settled_classification(low) == "REAL"  # 10 to 30
+    assert settled_classification(low, FusionWeights(temporal=0.5)) is None
+
+
 def test_extract_mfcc_handles_empty() -> None:
     mfcc = extract_mfcc(b"")
     assert mfcc.shape == (1, 13)
 
 
+def test_framed_mfcc_streams_long_audio_in_bounded_memory() -> None:
+    rate = 16000
+    times = np.arange(rate * 600) / rate
+    envelope = (0.5 + 0.5 * np.sin(2 * np.pi * 3 * times)) ** 2
+    noise = np.random.default_rng(20).normal(0, 3000, times.size)
+    payload = (noise * envelope).astype(np.int16).tobytes()
+
+    head = payload[: rate * 20]
+    mfcc = extract_mfcc(head)
+    assert mfcc.shape == ((rate * 10 - 512) // 256 + 1, 13)
+    blocks = np.array_split(decode_pcm16(head), 7)
+    reblocked = np.concatenate(list(iter_mfcc(blocks, block_frames=100)))
+    assert np.allclose(reblocked, mfcc, atol=1e-3)
+
+    tracemalloc.start()
+    speech = analyze_audio(payload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 8 << 20  # a 10-minute clip; one whole-signal rfft would need ~150 MiB
+    assert speech == analyze_media_audio(MediaContext(payload, "audio"))
+    assert "Flat MFCC distribution suggests synthetic speech" not in speech.anomalies
+
+    tone = (8000 * np.sin(2 * np.pi * 440 * times[: rate * 5])).astype(np.int16)
+    assert (
+        "Flat MFCC distribution suggests synthetic speech"
+        in analyze_audio(tone.tobytes()).anomalies
+    )
+
+
+def test_wav_audio_is_decoded_downmixed_and_resampled_in_chunks() -> None:
+    rate, seconds = 44100, 3
+    tone = 8000 * np.sin(2 * np.pi * 440 * np.arange(rate * seconds) / rate)
+    stereo = np.stack([tone, -tone / 2], axis=1).reshape(-1) * 256  # 24-bit full scale
+    buffer = BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(3)
+        wav_file.setframerate(rate)
+        packed = np.rint(stereo).astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3]
+        wav_file.writeframes(packed.tobytes())
+    payload = buffer.getvalue()
+
+    blocks = list(iter_audio_blocks(payload, chunk_frames=1000))
+    assert len(blocks) > 100 and all(block.dtype == np.float32 for block in blocks)
+    mono = np.concatenate(blocks)
+    assert mono.size == 16000 * seconds
+    expected = 2000 * np.sin(2 * np.pi * 440 * np.arange(mono.size) / 16000)
+    assert np.abs(mono - expected)[100:-100].max() < 1.0
+
+    samples, native_rate = parse_wav(payload)
+    assert native_rate == rate and np.allclose(samples, tone / 4, atol=0.01)
+
+    signal = np.random.default_rng(21).normal(0, 1000, 10007).astype(np.float32)
+    whole = PolyphaseResampler(22050, 16000)
+    streamed = PolyphaseResampler(22050, 16000)
+    pieces = [streamed.process(signal[start : start + 333]) for start in range(0, 10007, 333)]
+    expected_resampled = np.concatenate([whole.process(signal), whole.flush()])
+    assert np.array_equal(np.concatenate([*pieces, streamed.flush()]), expected_resampled)
+
+    with pytest.raises(ValueError, match="Invalid WAV"):
+        analyze_audio(b"RIFF\x04\x00\x00\x00WAVEjunk")
+
+
+def test_voice_activity_gates_silence_and_hiss_before_feature_extraction() -> None:
+    rate = 16000
+    rng = np.random.default_rng(22)
+    times = np.arange(rate) / rate
+    voiced = sum(np.sin(2 * np.pi * 140 * k * times) / k for k in range(1, 8)) * 2000
+    hiss = rng.normal(0, 150, rate)  # about -47 dBFS of broadband noise
+    silence = rng.normal(0, 10, 2 * rate)
+    signal = np.concatenate([silence, voiced, hiss, voiced, silence]).astype(np.int16)
+
+    activity = VoiceActivity()
+    blocks = np.array_split(signal, 9)
+    mfcc = np.concatenate(list(iter_mfcc(blocks, block_frames=50, activity=activity)))
+    assert activity.frames == (signal.size - 512) // 256 + 1
+    assert len(mfcc) == activity.speech_frames
+    # Two one-second words (62 frames each) plus their hangovers; hiss is dropped.
+    assert 124 <= activity.speech_frames <= 124 + 2 * (VoiceActivity.hangover + 4)
+    whole = VoiceActivity()
+    assert np.allclose(np.concatenate(list(iter_mfcc([signal], activity=whole))), mfcc, atol=1e-3)
+    assert whole.speech_frames == activity.speech_frames
+
+    result = analyze_audio(signal.tobytes())
+    assert result.speech_ratio == pytest.approx(activity.speech_ratio)
+    assert analyze_audio(signal.tobytes(), gate_silence=False).speech_ratio == 1.0
+    quiet = analyze_audio(silence.astype(np.int16).tobytes())
+    assert (quiet.audio_score, quiet.anomalies) == (0.0, ["No speech detected"])
+    assert analyze_audio(b"").audio_score == 0.0
+
+
 def test_vision_result_dataclass() -> None:
-    vision = VisionResult(vision_score=10, artifact_heatmap=np.zeros((2, 2)), details={"a": 1})
+    vision = VisionResult(vision_score=10, artifact_heatmap=HeatmapHandle(2, 2), details={"a": 1})
     assert vision.details["a"] == 1
     assert vision.artifact_heatmap.shape == (2, 2)
+
+
+def test_spool_stream_spills_large_payload_to_mapped_buffer(tmp_path: Path) -> None:
+    data = bytes(range(256)) * 4
+    payload = spool_stream(
+        BytesIO(data), limit=4096, threshold=64, chunk_size=100, spool_dir=str(tmp_path)
+    )
+    assert payload.path is not None and payload.data is None
+    assert payload.size == len(data)
+    with payload.open_buffer() as buffer:
+        assert isinstance(buffer, memoryview)
+        assert buffer == data
+        assert len(extract_frames(buffer, fps=4)) == 4
+    payload.discard()
+    assert not list(tmp_path.iterdir())
+
+
+def test_spool_stream_keeps_small_payload_in_memory(tmp_path: Path) -> None:
+    payload = spool_stream(
+        BytesIO(b"abc"), limit=16, threshold=64, chunk_size=2, spool_dir=str(tmp_path)
+    )
+    assert payload.path is None
+    assert payload.data == b"abc"
+
+
+def test_spool_stream_enforces_limit_while_reading(tmp_path: Path) -> None:
+    try:
+        spool_stream(
+            BytesIO(b"x" * 100), limit=50, threshold=10, chunk_size=8, spool_dir=str(tmp_path)
+        )
+    except UploadTooLargeError as exc:
+        assert "exceeds" in str(exc)
+    else:  # pragma: no cover - defensive
+        raise AssertionError("Expected UploadTooLargeError for oversized payload")
+    assert not list(tmp_path.iterdir())
+
+
+def test_batch_vision_scores_match_single_image_path() -> None:
+    rng = np.random.default_rng(0)
+    crops = [Image.fromarray(rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)) for _ in range(3)]
+    batch = stack_face_crops(crops, side=32)
+    assert batch.shape == (3, 32, 32, 3)
+    for crop, batched in zip(crops, analyze_image_batch(batch), strict=True):
+        single = analyze_image(crop)
+        assert np.isclose(batched.vision_score, single.vision_score, atol=1e-4)
+        assert batched.artifact_heatmap.shape == single.artifact_heatmap.shape
+
+
+def test_job_queue_survives_restart_and_honours_priority(tmp_path: Path) -> None:
+    video = SpooledUpload.from_bytes(bytes(range(256)) * 8)
+    first = JobQueue(tmp_path, {"video": run_video_job}, workers=1)
+    cancelled = first.submit("video", video, {"fps": 4})
+    low = first.submit("video", video, {"fps": 4}, priority=0)
+    high = first.submit("video", video, {"fps": 4}, priority=5)
+    cancel_record = first.cancel(cancelled.id)
+    assert cancel_record is not None and cancel_record.status == "cancelled"
+
+    restarted = JobQueue(tmp_path, {"video": run_video_job}, workers=1)
+    restarted.start()
+    try:
+        low_done = asyncio.run(restarted.wait(low.id))
+        high_done = asyncio.run(restarted.wait(high.id))
+    finally:
+        restarted.stop()
+
+    assert low_done.status == high_done.status == "succeeded"
+    assert high_done.updated_at <= low_done.updated_at
+    assert low_done.result is not None and "temporal_score" in low_done.result
+    assert not list((tmp_path / "payloads").iterdir())
+
+
+_lease_runs: list[str] = []
+_lease_gate = threading.Event()
+
+
+def _leased_job(
+    upload: SpooledUpload, params: dict[str, Any], progress: JobProgress
+) -> dict[str, Any]:
+    _lease_runs.append(params["name"])
+    if params.get("block"):
+        _lease_gate.wait(10)
+    return {"name": params["name"]}
+
+
+def test_job_queues_sharing_a_directory_only_recover_lapsed_leases(tmp_path: Path) -> None:
+    _lease_runs.clear()
+    _lease_gate.clear()
+    video = SpooledUpload.from_bytes(b"payload")
+    handlers = {"video": _leased_job}
+    pool = ThreadPoolExecutor(max_workers=4)
+    crashed = JobQueue(tmp_path, handlers, lease_seconds=0.2)
+    orphan = crashed.submit("video", video, {"name": "orphan"})
+    claimed = crashed._claim()  # claimed by a process that dies before renewing
+    assert claimed is not None and claimed.id == orphan.id
+
+    queues = [
+        JobQueue(tmp_path, handlers, workers=1, lease_seconds=0.2, executor_factory=lambda: pool)
+        for _ in range(2)
+    ]
+    for queue in queues:
+        queue.start()
+    try:
+        blocker = queues[0].submit("video", video, {"name": "blocker", "block": True})
+        orphan_done = asyncio.run(queues[1].wait(orphan.id))
+        while "blocker" not in _lease_runs:
+            time.sleep(0.01)
+        time.sleep(0.6)  # several lease periods, renewed by the owning queue
+        running = queues[1].get(blocker.id)
+        _lease_gate.set()
+        blocker_done = asyncio.run(queues[1].wait(blocker.id))
+    finally:
+        _lease_gate.set()
+        for queue in queues:
+            queue.stop()
+        pool.shutdown()
+
+    assert orphan_done.status == "succeeded" and orphan_done.result == {"name": "orphan"}
+    assert running is not None and running.status == "running"
+    assert blocker_done.status == "succeeded"
+    assert sorted(_lease_runs) == ["blocker", "orphan"]
+    assert not list((tmp_path / "payloads").iterdir())
+
+
+def test_result_cache_tiers_budget_and_ttl(tmp_path: Path) -> None:
+    directory = tmp_path / "cache"
+    cache = ResultCache(directory, memory_budget_bytes=64, ttl_seconds=60)
+    assert not directory.exists()
+    key = cache.key("image", ["abc"], {"fps": 6})
+    assert key != cache.key("image", ["abc"], {"fps": 5})
+    cache.put(key, {"score": 1.0})
+    assert directory.is_dir()
+    cache.put(cache.key("image", ["def"], {}), {"score": 2.0, "padding": "x" * 30})
+    assert cache.stats.evictions == 1
+
+    shared = ResultCache(directory, memory_budget_bytes=64, ttl_seconds=60)
+    assert shared.get(key) == {"score": 1.0}
+    assert shared.get(key) == {"score": 1.0}
+    assert (shared.stats.disk_hits, shared.stats.memory_hits) == (1, 1)
+
+    expired = ResultCache(directory, memory_budget_bytes=64, ttl_seconds=0)
+    assert expired.get(key) is None
+    assert expired.stats.expirations == 1
+
+
+def test_report_store_deduplicates_and_renders_lazily(tmp_path: Path) -> None:
+    store = ReportStore(tmp_path, retention_seconds=60)
+    report_id = store.register({"vision_score": "12.00"}, ["EXIF missing"])
+    assert store.register({"vision_score": "12.00"}, ["EXIF missing"]) == report_id
+    assert store.register({"vision_score": "13.00"}, []) != report_id
+    assert not list(tmp_path.glob("*.pdf"))
+
+    pdf = store.render(report_id)
+    assert pdf.read_bytes().startswith(b"%PDF")
+    assert store.render(report_id) == pdf
+    with pytest.raises(ReportNotFoundError):
+        store.render("../" + report_id[3:])
+
+    stale = time.time() - 120
+    os.utime(pdf, (stale, stale))
+    assert store.render(report_id) == pdf
+    assert pdf.stat().st_mtime > stale
+
+    expired = ReportStore(tmp_path, retention_seconds=0)
+    with pytest.raises(ReportNotFoundError):
+        expired.render(report_id)
+    assert not pdf.exists()
+    assert expired.sweep() == 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_heatmap_store_touches_known_entries_instead_of_rewriting(tmp_path: Path) -> None:
+    store = HeatmapStore(tmp_path, retention_seconds=60)
+    heatmap_id = store.heatmap_id("abc", {"max_side": 0})
+    store.register(heatmap_id, HeatmapHandle(width=4, height=3))
+    spec_path = tmp_path / f"{heatmap_id}.json"
+    stale = time.time() - 30
+    os.utime(spec_path, (stale, stale))
+    inode = spec_path.stat().st_ino
+
+    store.register(heatmap_id, HeatmapHandle(width=4, height=3), png=b"png")
+    assert spec_path.stat().st_ino == inode and spec_path.stat().st_mtime > stale
+    assert store.load(heatmap_id) == (HeatmapHandle(width=4, height=3), b"png")
+
+    os.utime(spec_path, (stale, stale))
+    assert HeatmapStore(tmp_path, retention_seconds=10).sweep() == 1
+    assert not list(tmp_path.iterdir())
+    with pytest.raises(HeatmapNotFoundError):
+        store.load(heatmap_id)
+
+
+def test_media_context_decodes_each_representation_once() -> None:
+    buffer = BytesIO()
+    exif = Image.Exif()
+    exif[0x0110] = "MockCam"  # Model
+    Image.fromarray(np.full((32, 32, 3), 90, dtype=np.uint8)).save(buffer, "JPEG", exif=exif)
+    media = MediaContext(buffer.getvalue())
+
+    vision = analyze_media_vision(media)
+    metadata = analyze_media_metadata(media)
+    assert analyze_media_vision(media).vision_score == vision.vision_score
+    assert media.frames(5) is media.frames(5)
+
+    assert metadata.metadata["Model"] == "MockCam"
+    assert "Camera model spoofing detected" in metadata.anomalies
+    assert np.isclose(vision.vision_score, analyze_image(media.crops[0]).vision_score)
+    assert media.decodes == {
+        "image": 1,
+        "exif": 1,
+        "faces": 1,
+        "face_batch": 1,
+        "crops": 1,
+        "frames": 1,
+    }
+
+
+def test_header_metadata_is_read_without_decoding_pixels() -> None:
+    exif = Image.Exif()
+    exif[0x0110] = "MockCam"  # Model
+    exif[0x8769] = {0x9003: "2024:01:02 03:04:05", 0x829A: 1 / 125}  # Exif IFD
+    exif[0x8825] = {1: "N"}  # GPS IFD
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48)).save(buffer, "JPEG", exif=exif.tobytes())
+    xmp = b"http://ns.adobe.com/xap/1.0/\x00" + b'<rdf:Description xmp:CreatorTool="Editor"/>'
+    app1 = b"\xff\xe1" + (len(xmp) + 2).to_bytes(2, "big") + xmp
+    jpeg = buffer.getvalue()
+    headers_only = jpeg[:2] + app1 + jpeg[2 : jpeg.index(b"\xff\xda")]  # no scan data
+
+    media = MediaContext(headers_only)
+    metadata = analyze_media_metadata(media)
+    assert metadata.metadata == {
+        "Model": "MockCam",
+        "ExposureTime": "0.008",
+        "DateTimeOriginal": "2024:01:02 03:04:05",
+        "GPSLatitudeRef": "N",
+        "xmp:CreatorTool": "Editor",
+    }
+    assert "Camera model spoofing detected" in metadata.anomalies
+    assert media.decodes == {"exif": 1}
+    with pytest.raises(ValueError):
+        load_image(headers_only)
+
+    for fmt in ("PNG", "TIFF", "WEBP"):
+        buffer = BytesIO()
+        Image.new("RGB", (8, 8)).save(buffer, fmt, exif=exif.tobytes())
+        assert read_metadata(buffer.getvalue())["Model"] == "MockCam"
+    big_endian = b"MM\x00*\x00\x00\x00\x08\x00\x01\x01\x10\x00\x02\x00\x00\x00\x04Cam\x00"
+    assert read_metadata(big_endian) == {"Model": "Cam"}
+    looping = b"II*\x00\x08\x00\x00\x00\x01\x00\x69\x87\x04\x00\x01\x00\x00\x00\x08\x00\x00\x00"
+    assert read_metadata(looping) == {}
+    assert read_metadata(headers_only[:40]) == {}
+    assert read_metadata(b"not an image") == {}
+
+
+def test_media_vision_scores_every_face_up_to_the_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    pixels = np.full((60, 90, 3), 120, dtype=np.uint8)
+    pixels[:, 30:60] = np.random.default_rng(4).integers(0, 256, (60, 30, 3), dtype=np.uint8)
+    boxes = [(0, 0, 20, 20), (30, 0, 60, 40), (60, 0, 90, 30)]
+    monkeypatch.setattr("backend.utils.media.detect_faces", lambda image: boxes)
+    media = MediaContext(b"")
+    media.__dict__["image"] = Image.fromarray(pixels)
+
+    vision = analyze_media_vision(media, max_faces=2)
+    assert vision.faces_detected == 3
+    assert [face.box for face in vision.faces] == [boxes[1], boxes[2]]  # largest two
+    assert media.face_batch(2).pixels.shape == (2, 40, 30, 3)  # one padded stack
+    crops = [Image.fromarray(pixels).crop(box) for box in boxes[1:]]
+    expected = [analyze_image(crop).vision_score for crop in crops]
+    assert [face.vision_score for face in vision.faces] == expected
+    assert vision.vision_score == max(face.vision_score for face in vision.faces)
+    assert vision.artifact_heatmap.shape == (40, 30)  # the noisy middle face scores highest
+
+
+def test_single_face_scores_its_crop_at_native_resolution(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pixels = np.random.default_rng(12).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+    image = Image.fromarray(pixels)
+    for boxes in ([(160, 120, 480, 360)], [(0, 0, 50, 70), (60, 0, 110, 70)]):
+        monkeypatch.setattr("backend.utils.media.detect_faces", lambda image, b=boxes: b)
+        media = MediaContext(b"")
+        media.__dict__["image"] = image
+        vision = analyze_media_vision(media)
+        for face in vision.faces:
+            crop = image.crop(face.box)
+            assert face.vision_score == analyze_image(crop).vision_score
+            assert face.details == analyze_image(crop).details
+    assert vision.artifact_heatmap.shape == (70, 50)
+
+
+def test_fused_pixel_stats_match_float_reference() -> None:
+    rng = np.random.default_rng(3)
+    # 320x320x3 spans several accumulation blocks; the stack exercises item blocking.
+    for batch in (
+        rng.integers(0, 256, (1, 320, 320, 3), dtype=np.uint8),
+        rng.integers(40, 90, (6, 24, 24, 3), dtype=np.uint8),
+    ):
+        stats = compute_pixel_stats(batch)
+        reference = batch.astype(np.float32) / 255.0
+        assert np.allclose(stats.variances, np.var(reference, axis=(1, 2, 3)), atol=1e-6)
+        assert np.allclose(stats.means, np.mean(reference, axis=(1, 2, 3)), atol=1e-6)
+        assert np.allclose(stats.channel_means, np.mean(reference, axis=(1, 2)), atol=1e-6)
+    empty = compute_pixel_stats(np.zeros((1, 0, 0, 3), dtype=np.uint8))
+    assert empty.variances[0] == empty.means[0] == 0.0
+
+
+def test_load_image_caps_analysis_resolution() -> None:
+    pixels = np.random.default_rng(5).integers(0, 256, (1200, 1600, 3), dtype=np.uint8)
+    encoded = {}
+    for fmt in ("JPEG", "PNG"):
+        buffer = BytesIO()
+        Image.fromarray(pixels).save(buffer, format=fmt)
+        encoded[fmt] = buffer.getvalue()
+
+    assert load_image(encoded["JPEG"], max_side=400).size == (400, 300)  # DCT scaling 1/4
+    assert load_image(encoded["PNG"], max_side=500).size == (400, 300)  # reduce by 4
+    assert load_image(encoded["PNG"], max_side=2048).size == (1600, 1200)
+    assert load_image(encoded["PNG"]).size == (1600, 1200)
+
+
+def test_heatmap_handle_renders_lazily_at_bounded_resolution() -> None:
+    handle = HeatmapHandle(width=4000, height=3000)
+    assert handle.shape == (3000, 4000)
+    tile = handle.render(max_side=200)
+    assert tile.shape == (150, 200) and tile.dtype == np.uint8
+    assert tile[0, 0] == 0 and tile[-1, -1] == 255
+    assert handle.render(max_side=200, dtype="float16").dtype == np.float16
+    assert HeatmapHandle(20, 10).render().shape == (10, 20)
+    assert Image.open(BytesIO(handle.to_png(64))).size == (64, 48)
+
+
+def test_engine_warm_up_runs_each_hook_once_per_process() -> None:
+    first = warm_up_engines()
+    assert list(first) == registered_engines()
+    assert set(warm_up_engines().values()) == {0.0}
+    with pytest.raises(ValueError):
+        register_engine("broken", "backend.engines.vision_detector")
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_warm_up_workers_reaches_every_worker(monkeypatch: pytest.MonkeyPatch, kind: str) -> None:
+    monkeypatch.setenv("DFS_EXECUTOR_KIND", kind)
+    monkeypatch.setenv("DFS_EXECUTOR_WORKERS", "3")
+    get_settings.cache_clear()
+    shutdown_executor()
+    try:
+        per_worker = asyncio.run(warm_up_workers())
+    finally:
+        shutdown_executor()
+        get_settings.cache_clear()
+    assert len(per_worker) == 3
+    assert all(list(timings) == registered_engines() for timings in per_worker.values())
+    if kind == "process":  # each process warms up on its own, before its first task
+        assert all(min(timings.values()) > 0 for timings in per_worker.values())
+
+
+def test_streamed_temporal_analysis_matches_list_with_bounded_memory() -> None:
+    payload = np.random.default_rng(8).integers(0, 256, 1 << 22, dtype=np.uint8).tobytes()
+    fps = 16
+
+    frames = extract_frames(payload, fps=fps)
+    source = np.frombuffer(payload, dtype=np.uint8)
+    assert all(frame.dtype == np.uint8 and np.shares_memory(frame, source) for frame in frames)
+    listed = analyze_frames(frames)
+
+    tracemalloc.start()
+    streamed = analyze_frames(iter_frames(payload, fps=fps))
+    stream_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert streamed == listed
+    assert stream_peak < len(payload) / 4  # int16 temporaries for one pair, no frame copies
+    decimated = analyze_frames(iter_frames(payload, fps=fps), max_map_points=4)
+    assert len(decimated.anomaly_map) <= 4
+    assert max(decimated.anomaly_map) == max(listed.anomaly_map)
+    assert decimated.temporal_score == listed.temporal_score
+
+
+def test_batched_temporal_diffs_match_per_pair_reference() -> None:
+    rng = np.random.default_rng(12)
+    shapes = [(8, 8)] * 150 + [(6, 9)] * 3 + [(8, 8)] * 2 + [(300, 300)] * 3
+    frames = [rng.integers(0, 60, shape, dtype=np.uint8) for shape in shapes]
+    frames[100] += 100  # a spike flags frames 100 and 101
+    batches = list(batch_frames(iter(frames), batch_size=64, max_batch_bytes=8 * 8 * 100))
+    assert [len(batch) for batch in batches] == [64, 64, 22, 3, 2, 1, 1, 1]
+    assert np.shares_memory(batches[-1], frames[-1])  # oversized frames are not copied
+
+    reference = []
+    for prev, curr in zip(frames, frames[1:], strict=False):
+        rows, cols = min(prev.shape[0], curr.shape[0]), min(prev.shape[1], curr.shape[1])
+        diff = prev[:rows, :cols].astype(np.float64) - curr[:rows, :cols]
+        reference.append(float(np.mean(np.abs(diff))))
+    result = analyze_frames(iter(frames))
+    assert result.anomaly_map == reference
+    assert result.flagged_frames == [i + 1 for i, diff in enumerate(reference) if diff > 25]
+    assert {100, 101} <= set(result.flagged_frames)
+    assert result.temporal_score == pytest.approx(100 - float(np.mean(reference)))
+
+
+def test_parallel_temporal_analysis_matches_serial() -> None:
+    rng = np.random.default_rng(17)
+    shapes = [(32, 32)] * 90 + [(20, 24)] * 5 + [(64, 64)] * 30
+    frames = [rng.integers(0, 80, shape, dtype=np.uint8) for shape in shapes]
+    frames[40] += 100
+    serial = analyze_frames(iter(frames), max_map_points=16)
+    progress: list[tuple[int, int]] = []
+    try:
+        parallel = analyze_frames_parallel(
+            iter(frames),
+            workers=2,
+            progress=lambda done, total: progress.append((done, total)),
+            total=len(frames),
+            max_map_points=16,
+            shard_bytes=32 * 32 * 10,  # many rounds, shard edges inside shape runs
+        )
+        single = analyze_frames_parallel(iter(frames[:1]), workers=2)
+    finally:
+        shutdown_executor()
+    assert parallel == serial
+    assert {40, 41} <= set(parallel.flagged_frames)
+    assert progress[-1] == (len(frames), len(frames))
+    assert single == analyze_frames(frames[:1])
+
+
+def test_adaptive_sampling_keeps_scene_cuts_and_glitches_within_budget() -> None:
+    rng = np.random.default_rng(18)
+    scenes = [rng.integers(0, 256, (64, 64)) for _ in range(3)]
+    frames = []
+    for index in range(64):
+        scene = scenes[(index >= 21) + (index >= 41)]
+        frames.append(np.clip(scene + rng.integers(-3, 4, scene.shape), 0, 255).astype(np.uint8))
+    for glitch in (10, 50):
+        frames[glitch] = rng.integers(0, 256, (64, 64), dtype=np.uint8)
+    media = MediaContext(b"".join(frame.tobytes() for frame in frames), "video")
+
+    full = analyze_frames(media.iter_frames(fps=64))
+    assert full.flagged_frames == [10, 11, 21, 41, 50, 51]
+    sampled = analyze_media_frames(media, fps=64, frame_budget=16)
+    assert sampled.flagged_frames == full.flagged_frames
+    assert sampled.sampled_frames is not None and len(sampled.sampled_frames) == 16
+    assert len(sampled.anomaly_map) == 15
+    assert plan_frame_samples(iter(frames[:5]), budget=16) == [0, 1, 2, 3, 4]
+    assert analyze_media_frames(media, fps=64, frame_budget=64).sampled_frames is None
+
+
+def test_pyramid_temporal_analysis_flags_like_full_resolution() -> None:
+    rng = np.random.default_rng(19)
+    ramp = np.add.outer(np.arange(96), np.arange(128)) // 4 + 60
+    checker = np.indices((96, 128)).sum(axis=0) % 2 * 60 - 30
+    frames = [(ramp + rng.integers(0, 3, ramp.shape)).astype(np.uint8) for _ in range(40)]
+    frames[10] = frames[10] + 26  # flagged on the coarse level alone
+    frames[20] = frames[20] + 24  # near the threshold: refined, not flagged
+    frames[30] = (frames[30] + 20 + checker).astype(np.uint8)  # coarse 20, full 30
+
+    full = analyze_frames(frames)
+    coarse = analyze_frames(frames, pyramid=PyramidConfig(level=3))
+    assert coarse.flagged_frames == full.flagged_frames == [10, 11, 30, 31]
+    assert all(c <= f + 1e-9 for c, f in zip(coarse.anomaly_map, full.anomaly_map, strict=True))
+    for pair in (19, 20, 29, 30):  # pairs entering and leaving frames 20 and 30
+        assert coarse.anomaly_map[pair] == full.anomaly_map[pair]
+    approximate = analyze_frames(frames, pyramid=PyramidConfig(level=3, refine_margin=10))
+    assert approximate.flagged_frames == full.flagged_frames
+    with pytest.raises(ValueError):
+        PyramidConfig(level=0)
+    with pytest.raises(ValueError):
+        PyramidConfig(level=1, refine_margin=-1)
+
+
+def test_pyramid_flags_match_full_resolution_on_noise_frames() -> None:
+    # Raw bytes viewed as frames: block averages of noise barely differ, while
+    # the full-resolution difference is about 85, so every pair must be refined.
+    rng = np.random.default_rng(19)
+    payload = bytearray(rng.integers(0, 256, 45 * 45 * 40, dtype=np.uint8).tobytes())
+    payload[45 * 45 * 10 : 45 * 45 * 20] = payload[45 * 45 * 9 : 45 * 45 * 10] * 10  # repeats
+    frames = list(iter_frames(bytes(payload), fps=40))
+    smooth = np.add.outer(np.arange(48), np.arange(48)).astype(np.uint8)
+    frames += [smooth, smooth + 1, smooth + 30, smooth + 30]
+
+    full = analyze_frames(frames)
+    assert 0 < len(full.flagged_frames) < len(frames)
+    for level in (1, 2, 3, 4):
+        coarse = analyze_frames(frames, pyramid=PyramidConfig(level))
+        assert coarse.flagged_frames == full.flagged_frames
+    # The approximate mode trusts coarse differences far below the threshold.
+    approximate = analyze_frames(frames, pyramid=PyramidConfig(4, refine_margin=10))
+    assert approximate.flagged_frames != full.flagged_frames
+    assert block_spread(np.array([[0, 8, 4, 4], [2, 2, 4, 4]], dtype=np.uint8), 2).tolist() == [
+        [4.0, 0.0]
+    ]